@@ -0,0 +1,103 @@
+"""FastAPI dependencies that hand the route handlers their services.
+
+Each provider returns the process-wide instance (built on first use), so a
+handler only constructs what it asks for, and tests replace a service with
+`app.dependency_overrides[get_x] = lambda: fake` instead of patching module
+globals. The providers are `async def` on purpose: FastAPI runs plain `def`
+dependencies in the thread pool, one hop per dependency per request.
+"""
+from typing import Union
+
+from app.core.config import Settings, settings
+from app.core.rate_limit import RateLimitManager, rate_limits
+from app.services.alerts_feed import AlertsFeed, alerts_feed
+from app.services.email_outbox import EmailOutbox, email_outbox
+from app.services.email_service import EmailService, email_service
+from app.services.influencer_engine import InfluencerEngine, influencer_engine
+from app.services.market_data_service import MarketDataService, market_data_service
+from app.services.ohlcv_store import OhlcvStore, ohlcv_store
+from app.services.otp_store import InMemoryOtpStore, RedisOtpStore, otp_store
+from app.services.quote_cache import QuoteCache, quote_cache
+from app.services.recommendation_service import RecommendationService, recommendation_service
+from app.services.reddit_ingestor import RedditIngestor, reddit_ingestor
+from app.services.sentiment_aggregates import SentimentAggregates, sentiment_aggregates
+from app.services.sentiment_engine import SentimentEngine, sentiment_engine
+from app.services.symbol_registry import SymbolRegistry, symbol_registry
+from app.services.tweet_store import TweetStore, tweet_store
+from app.services.twitter_ingestor import TwitterIngestor, twitter_ingestor
+from app.services.twitter_service import TwitterService, twitter_service
+
+
+OtpStore = Union[InMemoryOtpStore, RedisOtpStore]
+
+
+async def get_settings() -> Settings:
+	return settings
+
+
+async def get_market_data_service() -> MarketDataService:
+	return market_data_service
+
+
+async def get_symbol_registry() -> SymbolRegistry:
+	return symbol_registry
+
+
+async def get_quote_cache() -> QuoteCache:
+	return quote_cache
+
+
+async def get_rate_limits() -> RateLimitManager:
+	return rate_limits
+
+
+async def get_ohlcv_store() -> OhlcvStore:
+	return ohlcv_store
+
+
+async def get_otp_store() -> OtpStore:
+	return otp_store
+
+
+async def get_email_service() -> EmailService:
+	return email_service
+
+
+async def get_email_outbox() -> EmailOutbox:
+	return email_outbox
+
+
+async def get_twitter_service() -> TwitterService:
+	return twitter_service
+
+
+async def get_tweet_store() -> TweetStore:
+	return tweet_store
+
+
+async def get_twitter_ingestor() -> TwitterIngestor:
+	return twitter_ingestor
+
+
+async def get_reddit_ingestor() -> RedditIngestor:
+	return reddit_ingestor
+
+
+async def get_influencer_engine() -> InfluencerEngine:
+	return influencer_engine
+
+
+async def get_sentiment_engine() -> SentimentEngine:
+	return sentiment_engine
+
+
+async def get_sentiment_aggregates() -> SentimentAggregates:
+	return sentiment_aggregates
+
+
+async def get_recommendation_service() -> RecommendationService:
+	return recommendation_service
+
+
+async def get_alerts_feed() -> AlertsFeed:
+	return alerts_feed
@@ -1,28 +1,45 @@
-from fastapi import APIRouter, HTTPException
-from typing import Optional
+import asyncio
+import itertools
+import json
+from collections import deque
+from fastapi import APIRouter, HTTPException, Header, Request
+from fastapi.responses import StreamingResponse
+from typing import Deque, Dict, List, Optional, Tuple
 from pydantic import BaseModel, EmailStr
-from app.services.market_data_service import market_data_service
-from app.services.email_service import email_service
-from app.services.otp_store import otp_store
-from app.services.twitter_service import twitter_service
-from app.db import get_db, Base, engine
+from app.api import deps
+from app.api.deps import OtpStore
+from app.services.market_data_service import MarketDataService
+from app.services.symbol_registry import SymbolRegistry
+from app.core.config import Settings
+from app.core.rate_limit import RateLimited, RateLimitManager
+from app.services.quote_cache import QuoteCache
+from app.services.ohlcv_store import OhlcvStore
+from app.services.email_outbox import EmailOutbox
+from app.services.email_service import EmailService
+from app.services.influencer_engine import PLATFORMS, SORTS, InfluencerEngine
+from app.services.twitter_service import TwitterService
+from app.services.twitter_ingestor import TwitterIngestor
+from app.services.reddit_ingestor import RedditIngestor
+from app.services.tweet_store import TweetStore
+from app.services.weighted_sentiment import tweet_posts
+from app.db import get_async_db
 from app.services.auth_service import (
-	create_user,
-	get_user_by_email,
-	verify_password,
+	create_user_async,
+	get_user_by_email_async,
+	hash_password_async,
+	verify_password_async,
 	create_access_token,
 )
-from sqlalchemy.orm import Session
-from app.services.recommendation_service import recommendation_service
-from app.services.alerts_service import alerts_service
+from app.services.recommendation_service import RecommendationService
+from app.services.sentiment_engine import SentimentEngine, prepare_text, score_labels
+from app.services.sentiment_aggregates import SentimentAggregates
+from app.services.alerts_feed import AlertsFeed
 from fastapi import Depends
-from sqlalchemy.orm import Session
-from app.db import get_db
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 api_router = APIRouter()
-# Initialize tables
-Base.metadata.create_all(bind=engine)
 
 
 class RegisterRequest(BaseModel):
@@ -33,19 +50,36 @@ class RegisterRequest(BaseModel):
 
 
 @api_router.post("/auth/register")
-def register_user(payload: RegisterRequest, db: Session = Depends(get_db)):
-    if get_user_by_email(db, payload.email):
+async def register_user(
+    payload: RegisterRequest,
+    db: AsyncSession = Depends(get_async_db),
+    otp_store: OtpStore = Depends(deps.get_otp_store),
+    email_service: EmailService = Depends(deps.get_email_service),
+    email_outbox: EmailOutbox = Depends(deps.get_email_outbox),
+    settings: Settings = Depends(deps.get_settings),
+):
+    # Queries run on the async engine, bcrypt on its bounded pool and the email goes to the outbox
+    if await get_user_by_email_async(db, payload.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
+    try:
+        user = await create_user_async(
+            db,
+            email=payload.email,
+            password_hash=await hash_password_async(payload.password),
+            first_name=payload.firstName or "",
+            last_name=payload.lastName or "",
+        )
+    except IntegrityError:
+        # A concurrent registration for the same email won the insert
         raise HTTPException(status_code=400, detail="Email already registered")
-    user = create_user(
-        db,
-        email=payload.email,
-        password=payload.password,
-        first_name=payload.firstName or "",
-        last_name=payload.lastName or "",
-    )
     otp = email_service.generate_otp()
-    otp_store.set_code(payload.email, otp)
-    email_service.send_otp_email(payload.email, otp, (payload.firstName or "User"))
+    await otp_store.set_code(payload.email, otp, settings.otp_ttl_seconds)
+    if not email_outbox.send_otp(payload.email, otp, (payload.firstName or "User")):
+        # The account exists; the client can ask for a new code through /auth/send-otp
+        raise HTTPException(
+            status_code=503,
+            detail="Account created, but the verification email could not be queued; request a new code",
+        )
     return {"id": user.id, "email": user.email}
 
 
@@ -55,9 +89,11 @@ class LoginRequest(BaseModel):
 
 
 @api_router.post("/auth/login")
-def login_user(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = get_user_by_email(db, payload.email)
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login_user(payload: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await get_user_by_email_async(db, payload.email)
+    # Hand the connection back to the pool before the slow bcrypt check
+    await db.close()
+    if not user or not await verify_password_async(payload.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     token = create_access_token({"sub": user.email, "uid": user.id})
     return {"access_token": token, "token_type": "bearer"}
@@ -65,26 +101,53 @@ def login_user(payload: LoginRequest, db: Session = Depends(get_db)):
 
 # Market Data Endpoints
 @api_router.get("/market/prices")
-async def get_market_prices(symbol: str):
-	"""Get real-time market prices for stocks and crypto"""
+async def get_market_prices(
+	symbol: str,
+	market_data_service: MarketDataService = Depends(deps.get_market_data_service),
+	symbol_registry: SymbolRegistry = Depends(deps.get_symbol_registry),
+):
+	"""Get real-time market prices for stocks and crypto (`TSLA`, `$TSLA` or `bitcoin`)"""
+	resolved = symbol_registry.resolve(symbol) or symbol.strip().lstrip("$").upper()
+	# The symbol registry decides which provider serves the symbol
+	asset_type = symbol_registry.asset_type(resolved)
 	try:
-		# Try stock first
-		stock_data = await market_data_service.get_stock_quote(symbol)
-		if stock_data:
-			return {"type": "stock", "data": stock_data}
-		
-		# Try crypto
-		crypto_data = await market_data_service.get_crypto_quote(symbol)
-		if crypto_data:
-			return {"type": "crypto", "data": crypto_data}
-		
+		if asset_type == "crypto":
+			data = await market_data_service.get_crypto_quote(resolved)
+		else:
+			data = await market_data_service.get_stock_quote(resolved)
+	except RateLimited as e:
+		headers = {"Retry-After": str(max(1, round(e.retry_after)))} if e.retry_after is not None else None
+		raise HTTPException(status_code=503, detail=str(e), headers=headers)
+	except Exception as e:
+		raise HTTPException(status_code=500, detail=str(e))
+	if not data:
 		raise HTTPException(status_code=404, detail=f"Symbol {symbol} not found")
+	return {"type": asset_type, "data": data}
+
+
+@api_router.get("/market/prices/batch")
+async def get_market_prices_batch(
+	symbols: str,
+	market_data_service: MarketDataService = Depends(deps.get_market_data_service),
+	symbol_registry: SymbolRegistry = Depends(deps.get_symbol_registry),
+):
+	"""Get quotes for a comma-separated symbol list (`TSLA`, `$TSLA` or `bitcoin`) with one upstream call per provider"""
+	requested = list(dict.fromkeys(
+		symbol_registry.resolve(s) or s.strip().lstrip("$").upper() for s in symbols.split(",") if s.strip().lstrip("$")
+	))
+	if not requested:
+		raise HTTPException(status_code=400, detail="symbols is required")
+	try:
+		quotes = await market_data_service.get_quotes(requested)
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=str(e))
+	items = [{"symbol": s, "type": symbol_registry.asset_type(s), "data": quotes[s]} for s in requested if quotes.get(s)]
+	missing = [s for s in requested if not quotes.get(s)]
+	return {"items": items, "missing": missing}
 
 
 @api_router.get("/market/overview")
-async def get_market_overview():
+async def get_market_overview(market_data_service: MarketDataService = Depends(deps.get_market_data_service)):
 	"""Get comprehensive market overview"""
 	try:
 		overview = await market_data_service.get_market_overview()
@@ -93,8 +156,26 @@ async def get_market_overview():
 		raise HTTPException(status_code=500, detail=str(e))
 
 
+@api_router.get("/market/cache/stats")
+async def get_quote_cache_stats(quote_cache: QuoteCache = Depends(deps.get_quote_cache)):
+	"""Quote cache hit/miss/stale counters"""
+	return quote_cache.stats()
+
+
+@api_router.get("/market/rate-limits")
+async def get_rate_limits(rate_limits: RateLimitManager = Depends(deps.get_rate_limits)):
+	"""Provider token buckets: current rate, queue, pause and throttle counters"""
+	return rate_limits.stats()
+
+
+@api_router.get("/market/providers")
+async def get_quote_providers(market_data_service: MarketDataService = Depends(deps.get_market_data_service)):
+	"""Quote provider health (latency percentiles, error rate) and hedge/failover counters"""
+	return market_data_service.quote_router.stats()
+
+
 @api_router.get("/market/trending/stocks")
-async def get_trending_stocks():
+async def get_trending_stocks(market_data_service: MarketDataService = Depends(deps.get_market_data_service)):
 	"""Get trending stocks"""
 	try:
 		trending = await market_data_service.get_trending_stocks()
@@ -104,7 +185,7 @@ async def get_trending_stocks():
 
 
 @api_router.get("/market/trending/crypto")
-async def get_trending_crypto():
+async def get_trending_crypto(market_data_service: MarketDataService = Depends(deps.get_market_data_service)):
 	"""Get trending cryptocurrencies"""
 	try:
 		trending = await market_data_service.get_trending_crypto()
@@ -113,17 +194,42 @@ async def get_trending_crypto():
 		raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/market/stocks")
-async def list_stocks(q: Optional[str] = None, page: int = 1, page_size: int = 20):
+async def list_stocks(
+	q: Optional[str] = None, page: int = 1, page_size: int = 20,
+	market_data_service: MarketDataService = Depends(deps.get_market_data_service),
+):
 	return await market_data_service.get_stocks(q=q, page=page, page_size=page_size)
 
 
 @api_router.get("/market/crypto")
-async def list_crypto(q: Optional[str] = None, page: int = 1, page_size: int = 20):
+async def list_crypto(
+	q: Optional[str] = None, page: int = 1, page_size: int = 20,
+	market_data_service: MarketDataService = Depends(deps.get_market_data_service),
+):
 	return await market_data_service.get_crypto(q=q, page=page, page_size=page_size)
 
 
+@api_router.get("/market/history/{symbol}")
+async def get_price_history(
+	symbol: str, start: Optional[int] = None, end: Optional[int] = None,
+	ohlcv_store: OhlcvStore = Depends(deps.get_ohlcv_store),
+):
+	"""Stored daily OHLCV bars (columnar, `ts` in epoch seconds) plus multi-day features"""
+	bars = await asyncio.to_thread(ohlcv_store.range, symbol, start, end)
+	features = await asyncio.to_thread(ohlcv_store.features, symbol)
+	return {
+		"symbol": symbol.upper(),
+		# NaN (e.g. crypto volume) becomes null in JSON
+		**{name: [None if v != v else v for v in column.tolist()] for name, column in bars.items()},
+		"features": features,
+	}
+
+
 @api_router.get("/market/profile/{symbol}")
-async def get_company_profile(symbol: str):
+async def get_company_profile(
+	symbol: str,
+	market_data_service: MarketDataService = Depends(deps.get_market_data_service),
+):
 	"""Get company profile information"""
 	try:
 		profile = await market_data_service.get_company_profile(symbol)
@@ -141,19 +247,21 @@ class SendOtpRequest(BaseModel):
 
 
 @api_router.post("/auth/send-otp")
-async def send_otp(payload: SendOtpRequest):
-	"""Send OTP verification email"""
-	try:
-		otp = email_service.generate_otp()
-		otp_store.set_code(payload.email, otp)
-		success = email_service.send_otp_email(payload.email, otp, payload.name or "User")
-		
-		if success:
-			return {"message": "OTP sent successfully", "email": payload.email}
-		else:
-			raise HTTPException(status_code=500, detail="Failed to send OTP email")
-	except Exception as e:
-		raise HTTPException(status_code=500, detail=str(e))
+async def send_otp(
+	payload: SendOtpRequest, request: Request,
+	otp_store: OtpStore = Depends(deps.get_otp_store),
+	email_service: EmailService = Depends(deps.get_email_service),
+	email_outbox: EmailOutbox = Depends(deps.get_email_outbox),
+	settings: Settings = Depends(deps.get_settings),
+):
+	"""Send OTP verification email (queued on the email outbox)"""
+	if not await otp_store.allow_issue(payload.email, request.client.host if request.client else None):
+		raise HTTPException(status_code=429, detail="Too many codes requested, try again later")
+	otp = email_service.generate_otp()
+	await otp_store.set_code(payload.email, otp, settings.otp_ttl_seconds)
+	if not email_outbox.send_otp(payload.email, otp, payload.name or "User"):
+		raise HTTPException(status_code=503, detail="Email outbox is full, try again later")
+	return {"message": "OTP sent successfully", "email": payload.email}
 
 
 class VerifyOtpRequest(BaseModel):
@@ -162,15 +270,11 @@ class VerifyOtpRequest(BaseModel):
 
 
 @api_router.post("/auth/verify-otp")
-async def verify_otp(payload: VerifyOtpRequest):
-	"""Verify OTP code"""
-	try:
-		ok = otp_store.verify_code(payload.email, payload.code)
-		if not ok:
-			raise HTTPException(status_code=400, detail="Invalid or expired code")
-		return {"message": "Email verified"}
-	except Exception as e:
-		raise HTTPException(status_code=500, detail=str(e))
+async def verify_otp(payload: VerifyOtpRequest, otp_store: OtpStore = Depends(deps.get_otp_store)):
+	"""Verify OTP code (one-shot; the code is burned after too many wrong attempts)"""
+	if not await otp_store.verify_code(payload.email, payload.code):
+		raise HTTPException(status_code=400, detail="Invalid or expired code")
+	return {"message": "Email verified"}
 
 
 class SendPasswordResetRequest(BaseModel):
@@ -179,24 +283,30 @@ class SendPasswordResetRequest(BaseModel):
 
 
 @api_router.post("/auth/send-password-reset")
-async def send_password_reset(payload: SendPasswordResetRequest):
-	"""Send password reset email"""
-	try:
-		# In a real app, you'd generate a secure reset token
-		reset_link = f"https://oryntal-ai.com/reset-password?token=secure_token_here"
-		success = email_service.send_password_reset_email(payload.email, reset_link, payload.name or "User")
-		
-		if success:
-			return {"message": "Password reset email sent successfully", "email": payload.email}
-		else:
-			raise HTTPException(status_code=500, detail="Failed to send password reset email")
-	except Exception as e:
-		raise HTTPException(status_code=500, detail=str(e))
+async def send_password_reset(
+	payload: SendPasswordResetRequest,
+	email_outbox: EmailOutbox = Depends(deps.get_email_outbox),
+):
+	"""Send password reset email (queued on the email outbox)"""
+	# In a real app, you'd generate a secure reset token
+	reset_link = f"https://oryntal-ai.com/reset-password?token=secure_token_here"
+	if not email_outbox.send_password_reset(payload.email, reset_link, payload.name or "User"):
+		raise HTTPException(status_code=503, detail="Email outbox is full, try again later")
+	return {"message": "Password reset email sent successfully", "email": payload.email}
+
+
+@api_router.get("/auth/email-outbox")
+async def get_email_outbox_stats(email_outbox: EmailOutbox = Depends(deps.get_email_outbox)):
+	"""Email outbox counters (pending, sent, failed, retries)"""
+	return email_outbox.stats()
 
 
 # Twitter search endpoint (basic)
 @api_router.get("/social/twitter/search")
-async def twitter_search(query: str, max_results: int = 10):
+async def twitter_search(
+	query: str, max_results: int = 10,
+	twitter_service: TwitterService = Depends(deps.get_twitter_service),
+):
 	try:
 		result = await twitter_service.search_recent(query=query, max_results=max_results)
 		return result
@@ -204,44 +314,238 @@ async def twitter_search(query: str, max_results: int = 10):
 		raise HTTPException(status_code=500, detail=str(e))
 
 
-# Placeholder endpoints for future implementation
 @api_router.get("/scrapers/reddit")
-async def scrape_reddit():
-	return {"message": "Reddit scraper not implemented yet"}
+async def scrape_reddit(reddit_ingestor: RedditIngestor = Depends(deps.get_reddit_ingestor)):
+	"""Reddit ingestion worker status and per-listing cursors"""
+	return await reddit_ingestor.stats()
+
+
+@api_router.post("/scrapers/reddit/run")
+async def run_reddit_scraper(reddit_ingestor: RedditIngestor = Depends(deps.get_reddit_ingestor)):
+	"""Poll every subreddit listing once now; returns items stored per listing"""
+	return {"ingested": await reddit_ingestor.run_once()}
 
 
 @api_router.get("/scrapers/twitter")
-async def scrape_twitter():
-	return {"message": "Twitter scraper not implemented yet"}
+async def scrape_twitter(twitter_ingestor: TwitterIngestor = Depends(deps.get_twitter_ingestor)):
+	"""Twitter ingestion worker status and per-symbol cursors"""
+	return await twitter_ingestor.stats()
+
+
+@api_router.post("/scrapers/twitter/run")
+async def run_twitter_scraper(twitter_ingestor: TwitterIngestor = Depends(deps.get_twitter_ingestor)):
+	"""Run one ingestion sweep now; returns tweets stored per symbol"""
+	return {"ingested": await twitter_ingestor.run_once()}
+
+
+@api_router.get("/influencers")
+async def list_influencers(
+	sort: str = "credibility", platform: Optional[str] = None, page: int = 1, page_size: int = 20,
+	influencer_engine: InfluencerEngine = Depends(deps.get_influencer_engine),
+):
+	"""Influencer leaderboard as of the last batch rescore"""
+	if sort not in SORTS:
+		raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(SORTS)}")
+	if platform is not None and platform not in PLATFORMS:
+		raise HTTPException(status_code=400, detail=f"platform must be one of: {', '.join(PLATFORMS)}")
+	return influencer_engine.leaderboard(sort, platform, max(1, page), max(1, min(page_size, 100)))
+
+
+@api_router.get("/influencers/stats")
+async def get_influencer_stats(influencer_engine: InfluencerEngine = Depends(deps.get_influencer_engine)):
+	return influencer_engine.stats()
+
+
+@api_router.get("/analyzer/stats")
+async def get_analyzer_stats(sentiment_engine: SentimentEngine = Depends(deps.get_sentiment_engine)):
+	"""Sentiment engine backend and micro-batching counters"""
+	return sentiment_engine.stats()
+
+
+@api_router.get("/analyzer/aggregates/{symbol}")
+async def get_sentiment_aggregates(
+	symbol: str,
+	sentiment_aggregates: SentimentAggregates = Depends(deps.get_sentiment_aggregates),
+):
+	"""Rolling sentiment windows (count, mean, EWMA, variance) and the current spike z-score"""
+	spike = sentiment_aggregates.zscore(symbol)
+	return {
+		"symbol": symbol.upper(),
+		"windows": sentiment_aggregates.snapshot(symbol),
+		"zscore": spike["z"] if spike else None,
+	}
+
+
+class SentimentBatchRequest(BaseModel):
+	texts: List[str]
 
 
 @api_router.post("/analyzer/sentiment")
-async def analyze_sentiment(payload: dict):
-	return {"message": "Sentiment analysis not implemented yet", "input": payload}
+async def analyze_sentiment(
+	payload: SentimentBatchRequest,
+	sentiment_engine: SentimentEngine = Depends(deps.get_sentiment_engine),
+	settings: Settings = Depends(deps.get_settings),
+):
+	"""Batch FinBERT scoring, streamed back as NDJSON (one line per input text, in input order).
+
+	Identical texts inside the batch are scored once. Chunks of unique texts are
+	scored through the same engine, cache and pre-filtering as /recommendations,
+	with a small window of chunks in flight so the micro-batcher stays busy.
+	Finished rows are held back until every earlier input has been sent.
+	"""
+	if len(payload.texts) > settings.sentiment_batch_max_texts:
+		raise HTTPException(status_code=413, detail=f"At most {settings.sentiment_batch_max_texts} texts per request")
+
+	# Dedupe on the pre-filtered text: prepared text -> input indexes
+	positions: Dict[str, List[int]] = {}
+	skipped: List[int] = []
+	for index, text in enumerate(payload.texts):
+		prepared = prepare_text(text)
+		if prepared:
+			positions.setdefault(prepared, []).append(index)
+		else:
+			skipped.append(index)
+	unique = list(positions)
+	size = max(1, settings.sentiment_stream_chunk)
+	chunks = [unique[i:i + size] for i in range(0, len(unique), size)]
+
+	# Lines ready to send, by input index; `sent` is the first index not yet streamed
+	ready: List[Optional[str]] = [None] * len(payload.texts)
+	for index in skipped:
+		ready[index] = json.dumps({"index": index, "skipped": True})
+
+	def flush(sent: int) -> Tuple[int, List[str]]:
+		lines = []
+		while sent < len(ready) and ready[sent] is not None:
+			lines.append(ready[sent])
+			ready[sent] = None
+			sent += 1
+		return sent, lines
+
+	async def rows():
+		sent, lines = flush(0)
+		if lines:
+			yield "\n".join(lines) + "\n"
+		window: Deque[asyncio.Task] = deque()
+		pending = iter(chunks)
+		try:
+			for chunk in itertools.islice(pending, settings.sentiment_stream_window):
+				window.append(asyncio.create_task(sentiment_engine.analyze(chunk)))
+			for chunk in chunks:
+				labels_list = await window.popleft()
+				following = next(pending, None)
+				if following is not None:
+					window.append(asyncio.create_task(sentiment_engine.analyze(following)))
+				for text, labels in zip(chunk, labels_list):
+					best = max(labels, key=lambda x: x.get("score", 0)) if labels else {}
+					row = {
+						"label": best.get("label"),
+						"score": best.get("score"),
+						"sentiment": round(score_labels(labels), 4),
+						"labels": labels,
+					}
+					for index in positions[text]:
+						ready[index] = json.dumps({"index": index, **row})
+				sent, lines = flush(sent)
+				if lines:
+					yield "\n".join(lines) + "\n"
+		except Exception as e:
+			yield json.dumps({"error": str(e)}) + "\n"
+		finally:
+			for task in window:
+				task.cancel()
+
+	return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@api_router.get("/recommendations/batch")
+async def recommendations_batch(
+	symbols: Optional[str] = None,
+	recommendation_service: RecommendationService = Depends(deps.get_recommendation_service),
+	settings: Settings = Depends(deps.get_settings),
+):
+	"""Ranked recommendations for a comma-separated watchlist (default: the alerts watchlist)"""
+	requested = [s.strip() for s in symbols.split(",") if s.strip()] if symbols else settings.alerts_watchlist
+	if len(requested) > settings.recommendations_batch_max_symbols:
+		raise HTTPException(status_code=413, detail=f"At most {settings.recommendations_batch_max_symbols} symbols per request")
+	return {"items": await recommendation_service.recommend_batch(requested)}
 
 
 @api_router.get("/recommendations")
-async def recommendations(symbol: Optional[str] = None, q: Optional[str] = None):
+async def recommendations(
+	symbol: Optional[str] = None, q: Optional[str] = None,
+	twitter_service: TwitterService = Depends(deps.get_twitter_service),
+	tweet_store: TweetStore = Depends(deps.get_tweet_store),
+	recommendation_service: RecommendationService = Depends(deps.get_recommendation_service),
+	settings: Settings = Depends(deps.get_settings),
+):
 	if not symbol:
 		raise HTTPException(status_code=400, detail="symbol is required")
-	texts = []
-	# Optionally seed with twitter recent posts about the symbol
+	posts = []
+	# Recent posts about the symbol: the ingested tweet store, or a live search for a custom query
 	try:
-		query = q or f"${symbol} lang:en -is:retweet"
-		tweets = await twitter_service.search_recent(query=query, max_results=10)
-		for t in tweets.get("data", [])[:5]:
-			text = t.get("text")
-			if text:
-				texts.append(text)
+		if q:
+			page = await twitter_service.search_recent(query=q, max_results=100)
+			posts = tweet_posts(page)
+		else:
+			stored = await tweet_store.recent_posts(
+				[symbol], limit=settings.recommendations_sentiment_posts, window_hours=settings.social_window_hours
+			)
+			posts = stored[symbol.upper()]
 	except Exception:
 		pass
-	result = await recommendation_service.recommend(symbol, texts)
+	result = await recommendation_service.recommend(symbol, posts)
 	return result
 
 
 @api_router.get("/alerts")
-async def get_alerts():
-	alerts = await alerts_service.generate()
-	return {"alerts": alerts}
+async def get_alerts(alerts_feed: AlertsFeed = Depends(deps.get_alerts_feed)):
+	"""Latest precomputed alert snapshot"""
+	return await alerts_feed.latest()
+
+
+@api_router.get("/alerts/history")
+async def get_alerts_history(alerts_feed: AlertsFeed = Depends(deps.get_alerts_feed)):
+	return {"version": alerts_feed.version, "deltas": list(alerts_feed.history)}
+
+
+def _sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+	head = f"id: {event_id}\n" if event_id is not None else ""
+	return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@api_router.get("/alerts/stream")
+async def stream_alerts(
+	request: Request, last_event_id: Optional[str] = Header(default=None),
+	alerts_feed: AlertsFeed = Depends(deps.get_alerts_feed),
+	settings: Settings = Depends(deps.get_settings),
+):
+	"""Server-Sent Events: a snapshot (or missed deltas on reconnect), then live deltas"""
+	async def events():
+		# Subscribed only once the body is streamed, so a client gone before then leaves no queue behind
+		queue = alerts_feed.subscribe()
+		try:
+			replay = alerts_feed.deltas_since(int(last_event_id)) if last_event_id and last_event_id.isdigit() else None
+			if replay is None:
+				snapshot = await alerts_feed.latest()
+				yield _sse("snapshot", snapshot, snapshot["version"])
+			else:
+				for delta in replay:
+					yield _sse("delta", delta, delta["version"])
+			while not await request.is_disconnected():
+				try:
+					event, data = await asyncio.wait_for(queue.get(), timeout=settings.alerts_stream_heartbeat)
+				except asyncio.TimeoutError:
+					yield ": keep-alive\n\n"
+					continue
+				yield _sse(event, data, data["version"])
+		finally:
+			alerts_feed.unsubscribe(queue)
+
+	return StreamingResponse(
+		events(),
+		media_type="text/event-stream",
+		headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+	)
 
 
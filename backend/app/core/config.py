@@ -1,5 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.core.lazy import Lazy
+
 
 class Settings(BaseSettings):
     api_v1_prefix: str = ""
@@ -14,6 +16,15 @@ class Settings(BaseSettings):
 
     # Database and cache
     database_url: str
+    # Connection pools of the sync and async engines (server databases only)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_recycle: int = 1800
+    db_pool_timeout: float = 10.0
+    # The schema is created out-of-band (`python -m app.migrate`); auto-migrate runs it at startup instead
+    database_auto_migrate: bool = False
+    # GET /health/ready: time allowed per dependency check
+    readiness_check_timeout: float = 2.0
     redis_url: str
 
     # API Keys
@@ -29,13 +40,183 @@ class Settings(BaseSettings):
     email_host_user: str
     email_host_password: str
     email_use_tls: bool = True
+    email_smtp_timeout: float = 20.0
+
+    # Email outbox: SMTP worker pool with one reused connection per worker, closed after idling,
+    # and retries with exponential backoff for temporary failures
+    email_outbox_workers: int = 2
+    email_outbox_max_queue: int = 1000
+    email_outbox_max_attempts: int = 4
+    email_outbox_backoff: float = 2.0
+    email_smtp_idle_seconds: float = 30.0
 
     # JWT Settings
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # bcrypt hashes and verifications run on a pool of this many threads
+    password_hash_workers: int = 2
+
+    # Email OTP codes ("memory" per process, or "redis" via redis_url when running several workers);
+    # issuance is limited per email and per client IP within a window, and a code burns after max attempts.
+    # In memory, codes and issuance counters are capped separately.
+    otp_store_backend: str = "memory"
+    otp_ttl_seconds: int = 600
+    otp_max_entries: int = 100000
+    otp_max_counters: int = 100000
+    otp_max_attempts: int = 5
+    otp_issue_limit_per_email: int = 5
+    otp_issue_limit_per_ip: int = 20
+    otp_issue_window_seconds: int = 3600
+
+    # Symbol universe: seed lists extended at startup with the FMP stock list and CoinGecko top coins
+    symbol_registry_remote: bool = True
+    symbol_registry_exchanges: list[str] = ["NASDAQ", "NYSE", "AMEX"]
+    symbol_registry_crypto_limit: int = 250
+    symbol_registry_load_timeout: float = 15.0
+
+    # Outbound HTTP client pool (shared by all provider calls)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_timeout: float = 20.0
+    http2_hosts: list[str] = [
+        "api.coingecko.com",
+        "financialmodelingprep.com",
+        "api.twitter.com",
+        "api-inference.huggingface.co",
+    ]
+
+    # Quote cache ("memory" per process, or "redis" via redis_url when running several workers)
+    quote_cache_backend: str = "memory"
+    quote_cache_max_entries: int = 5000
+    quote_cache_stock_ttl: float = 60.0
+    quote_cache_crypto_ttl: float = 30.0
+    quote_cache_stale_ttl: float = 300.0
+    quote_cache_negative_ttl: float = 600.0
+
+    # Quote fan-out: symbols per upstream batch call, concurrent calls per provider,
+    # and how long list endpoints wait before returning partial results
+    quote_batch_size: int = 50
+    provider_concurrency: dict[str, int] = {"alpha_vantage": 2, "fmp": 4, "coingecko": 4}
+    provider_concurrency_default: int = 4
+    quote_deadline_seconds: float = 3.0
+
+    # Quote providers per asset type (in tie-break order), health tracking and hedging:
+    # a second provider is asked once the first has not answered within its p95 latency
+    quote_providers: dict[str, list[str]] = {"stock": ["fmp", "alpha_vantage"], "crypto": ["coingecko", "fmp"]}
+    quote_provider_window: int = 50
+    quote_provider_failure_threshold: int = 3
+    quote_provider_cooldown: float = 30.0
+    quote_hedge_min_samples: int = 10
+    quote_hedge_default_delay: float = 1.0
+    quote_hedge_min_delay: float = 0.05
+    quote_hedge_max_delay: float = 3.0
+
+    # Provider request budgets as [requests per second, burst], one token bucket per provider and API key.
+    # Throttle responses (429, Retry-After, Alpha Vantage "Note") halve the rate, which recovers over
+    # rate_limit_recovery_seconds. "redis" shares the buckets between workers via redis_url.
+    provider_rate_limits: dict[str, list[float]] = {
+        "alpha_vantage": [5 / 60, 5],
+        "fmp": [5.0, 10],
+        "coingecko": [0.5, 5],
+        "twitter": [0.5, 10],
+    }
+    rate_limit_backend: str = "memory"
+    rate_limit_recovery_seconds: float = 60.0
+
+    # Alerts engine: watch universe and quote deadline
+    alerts_watchlist: list[str] = ["AAPL", "TSLA", "NVDA", "MSFT", "BTC", "ETH"]
+    alerts_quote_timeout: float = 5.0
+
+    # GET /recommendations/batch
+    recommendations_batch_max_symbols: int = 500
+    # GET /recommendations: recent posts per symbol behind the engagement-weighted sentiment
+    recommendations_sentiment_posts: int = 500
+
+    # Sentiment spike alerts: z-score of the recent window's mean against the baseline window
+    alerts_spike_window: str = "1h"
+    alerts_baseline_window: str = "24h"
+    alerts_spike_zscore: float = 2.5
+    alerts_spike_min_count: int = 5
+    alerts_baseline_min_count: int = 20
+    # Volume spike alerts: latest daily volume over the 20-day average
+    alerts_volume_ratio: float = 2.0
+
+    # Background alert precomputation and push delivery (/alerts/stream)
+    alerts_scheduler_enabled: bool = True
+    alerts_refresh_interval: float = 60.0
+    alerts_history_size: int = 200
+    alerts_subscriber_queue_size: int = 100
+    alerts_stream_heartbeat: float = 15.0
+
+    # FinBERT sentiment: "http" (Hugging Face Inference API) or "local" (in-process model)
+    sentiment_backend: str = "http"
+    sentiment_model: str = "ProsusAI/finbert"
+    sentiment_onnx: bool = False
+    sentiment_workers: int = 1
+    sentiment_http_concurrency: int = 4
+    sentiment_max_batch_size: int = 32
+    sentiment_max_wait_ms: float = 10.0
+    huggingface_api_key: str = ""
+    sentiment_max_chars: int = 1500
+
+    # POST /analyzer/sentiment batch scoring
+    sentiment_batch_max_texts: int = 10000
+    sentiment_stream_chunk: int = 64
+    sentiment_stream_window: int = 4
+
+    # Content-addressed sentiment result cache (optionally persisted in the database)
+    sentiment_cache_max_entries: int = 50000
+    sentiment_cache_persist: bool = False
+
+    # Rolling per-symbol sentiment windows (1m/5m/1h/24h) fed by the ingestion workers
+    sentiment_aggregate_max_symbols: int = 5000
+
+    # Daily OHLCV history: memory-mapped columnar files per symbol (empty symbol list: alerts_watchlist)
+    ohlcv_data_dir: str = "./data/ohlcv"
+    ohlcv_ingest_enabled: bool = True
+    ohlcv_ingest_symbols: list[str] = []
+    ohlcv_ingest_interval: float = 3600.0
+    ohlcv_history_days: int = 365
+
+    # Background Twitter ingestion into the local tweet store (empty symbol list: alerts_watchlist)
+    twitter_ingest_enabled: bool = True
+    twitter_ingest_symbols: list[str] = []
+    twitter_ingest_interval: float = 60.0
+    twitter_ingest_page_size: int = 100
+    twitter_ingest_max_pages: int = 3
+    twitter_ingest_concurrency: int = 4
+    social_window_hours: float = 24.0
+
+    # Reddit ingestion from the public JSON listings, paced by one shared token bucket
+    reddit_ingest_enabled: bool = True
+    reddit_base_url: str = "https://www.reddit.com"
+    reddit_user_agent: str = "oryntal-ai/0.1"
+    reddit_subreddits: list[str] = ["wallstreetbets", "stocks", "investing", "CryptoCurrency"]
+    reddit_ingest_interval: float = 120.0
+    reddit_page_size: int = 100
+    reddit_max_pages: int = 3
+    reddit_ingest_concurrency: int = 4
+    reddit_requests_per_minute: float = 30.0
+    reddit_burst: int = 5
+
+    # Influencer leaderboard: per-author rolling stats, rescored in batch against later price moves
+    influencer_engine_enabled: bool = True
+    influencer_rescore_interval: float = 300.0
+    # A post is a directional call when |sentiment| reaches the threshold; it is judged on the
+    # daily close `influencer_call_horizon_days` after it (needs OHLCV history for the symbol)
+    influencer_call_threshold: float = 0.5
+    influencer_call_horizon_days: int = 1
+    influencer_max_pending_calls: int = 50
+    # Hit rate is shrunk towards 50% as if every author started with this many calls
+    influencer_accuracy_prior: float = 10.0
+    influencer_min_posts: int = 3
+    influencer_retention_days: int = 30
+    influencer_max_authors: int = 50000
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 
-settings = Settings()
+# Read from the environment on first use, so importing the app needs no configuration
+settings = Lazy(Settings)
@@ -0,0 +1,75 @@
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+	import httpx
+
+try:
+	import h2  # noqa: F401
+	HTTP2_AVAILABLE = True
+except ImportError:
+	HTTP2_AVAILABLE = False
+
+
+class HttpClientPool:
+	"""App-lifetime pool of httpx clients, one per upstream origin.
+
+	Each origin gets its own connection pool so a slow provider cannot exhaust
+	the connections of another one, and keep-alive/HTTP2 connections are reused
+	across requests instead of paying a TCP+TLS handshake per call.
+	"""
+
+	def __init__(self, transport_factory: Optional[Callable[[str], "httpx.AsyncBaseTransport"]] = None):
+		self._clients: Dict[str, "httpx.AsyncClient"] = {}
+		self._transport_factory = transport_factory
+
+	@staticmethod
+	def _origin(url: str) -> str:
+		parts = urlsplit(url)
+		return f"{parts.scheme}://{parts.netloc}"
+
+	def _build(self, origin: str) -> "httpx.AsyncClient":
+		# httpx (with httpcore and its async backends) is imported with the first client, not the app
+		import httpx
+
+		host = urlsplit(origin).hostname or ""
+		limits = httpx.Limits(
+			max_connections=settings.http_max_connections,
+			max_keepalive_connections=settings.http_max_keepalive_connections,
+			keepalive_expiry=settings.http_keepalive_expiry,
+		)
+		kwargs = {"limits": limits, "timeout": settings.http_timeout}
+		if self._transport_factory:
+			kwargs["transport"] = self._transport_factory(origin)
+		elif HTTP2_AVAILABLE and host in settings.http2_hosts:
+			kwargs["http2"] = True
+		return httpx.AsyncClient(**kwargs)
+
+	def get(self, url: str) -> "httpx.AsyncClient":
+		"""Return the shared client for the origin of `url`, creating it on first use."""
+		origin = self._origin(url)
+		client = self._clients.get(origin)
+		if client is None or client.is_closed:
+			client = self._build(origin)
+			self._clients[origin] = client
+		return client
+
+	def set_transport_factory(self, factory: Optional[Callable[[str], "httpx.AsyncBaseTransport"]]) -> None:
+		"""Route all new clients through a custom transport (used by tests and benchmarks)."""
+		self._transport_factory = factory
+		self._clients = {}
+
+	async def startup(self) -> None:
+		# Drop clients closed by a previous app lifetime (e.g. repeated TestClient runs)
+		self._clients = {origin: c for origin, c in self._clients.items() if not c.is_closed}
+
+	async def shutdown(self) -> None:
+		clients, self._clients = self._clients, {}
+		for client in clients.values():
+			await client.aclose()
+
+
+# Global HTTP client pool instance
+http_clients = HttpClientPool()
@@ -0,0 +1,65 @@
+import threading
+from typing import Any, Callable, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+	"""Module-level singleton built by `factory` on first attribute access.
+
+	Importing a module that exposes one costs nothing; the service (and the
+	settings, clients or models it sets up) is created the first time a
+	request touches it. Attribute writes and deletes go to the instance, so
+	`monkeypatch.setattr(service, "method", fake)` patches the real object.
+	"""
+
+	__slots__ = ("_factory", "_instance", "_lock")
+
+	def __init__(self, factory: Callable[[], T]):
+		object.__setattr__(self, "_factory", factory)
+		object.__setattr__(self, "_instance", None)
+		object.__setattr__(self, "_lock", threading.Lock())
+
+	# Lookups are forwarded from __getattribute__ rather than __getattr__: the latter
+	# only runs after a failed lookup, and that AttributeError made every
+	# `settings.x` read ~20x slower than on the instance itself
+	def __getattribute__(self, name: str) -> Any:
+		return getattr(_instance(self), name)
+
+	def __setattr__(self, name: str, value: Any) -> None:
+		setattr(_instance(self), name, value)
+
+	def __delattr__(self, name: str) -> None:
+		delattr(_instance(self), name)
+
+	def __call__(self, *args: Any, **kwargs: Any) -> Any:
+		return _instance(self)(*args, **kwargs)
+
+	def __repr__(self) -> str:
+		if not is_loaded(self):
+			factory = object.__getattribute__(self, "_factory")
+			return f"<Lazy {getattr(factory, '__qualname__', 'service')} (not built)>"
+		return repr(_instance(self))
+
+
+def _instance(lazy: Lazy) -> Any:
+	instance = object.__getattribute__(lazy, "_instance")
+	if instance is None:
+		# Worker threads (ingestion stores, bcrypt pool) may race the event loop here
+		with object.__getattribute__(lazy, "_lock"):
+			instance = object.__getattribute__(lazy, "_instance")
+			if instance is None:
+				instance = object.__getattribute__(lazy, "_factory")()
+				object.__setattr__(lazy, "_instance", instance)
+	return instance
+
+
+def unwrap(service: Any) -> Any:
+	"""The instance behind a `Lazy` (built if needed), for APIs that check types, e.g. `sqlalchemy.inspect`."""
+	return _instance(service) if type(service) is Lazy else service
+
+
+def is_loaded(service: Any) -> bool:
+	"""False for a `Lazy` whose instance has not been built yet (e.g. to skip its shutdown)."""
+	return type(service) is not Lazy or object.__getattribute__(service, "_instance") is not None
@@ -0,0 +1,306 @@
+import asyncio
+import calendar
+import contextvars
+import hashlib
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_tz
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.lazy import Lazy
+
+
+# Caller priorities; lower values are served first when callers queue for tokens
+INTERACTIVE = 0
+BACKGROUND = 10
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("rate_limit_priority", default=INTERACTIVE)
+
+
+def current_priority() -> int:
+	return _priority.get()
+
+
+@contextmanager
+def priority(level: int) -> Iterator[None]:
+	"""Run the enclosed calls at `level`; background jobs wrap their loops in `priority(BACKGROUND)`."""
+	token = _priority.set(level)
+	try:
+		yield
+	finally:
+		_priority.reset(token)
+
+
+class RateLimited(Exception):
+	"""A provider refused a request for exceeding its rate limit."""
+
+	def __init__(self, provider: str, retry_after: Optional[float] = None, detail: str = ""):
+		super().__init__(f"{provider} rate limit exceeded{': ' + detail if detail else ''}")
+		self.provider = provider
+		self.retry_after = retry_after
+
+
+def retry_after(headers: Any) -> Optional[float]:
+	"""Seconds to wait from a `Retry-After` (seconds or HTTP date) or `x-rate-limit-reset` (epoch) header."""
+	value = headers.get("retry-after")
+	if value:
+		try:
+			return max(0.0, float(value))
+		except ValueError:
+			parsed = parsedate_tz(value)
+			if parsed is not None:
+				return max(0.0, calendar.timegm(parsed[:9]) - (parsed[9] or 0) - time.time())
+	reset = headers.get("x-rate-limit-reset")
+	if reset:
+		try:
+			return max(0.0, float(reset) - time.time())
+		except ValueError:
+			pass
+	return None
+
+
+class TokenBucket:
+	"""Async token bucket shared by every caller of one upstream API.
+
+	Tokens refill continuously at `rate` per second up to `capacity` (the
+	allowed burst). `acquire` waits until a token is available. Waiters are
+	served by priority (`current_priority()`), then in arrival order, so
+	interactive requests overtake queued background refreshes while concurrent
+	pollers still share the budget fairly instead of bursting past it.
+
+	The rate adapts to throttling: `throttled` halves it (down to `min_rate`)
+	and pauses the bucket for the provider's `Retry-After`, or for one token
+	at the reduced rate; the rate then climbs back to `base_rate` linearly
+	over `recovery` seconds.
+	"""
+
+	def __init__(self, rate: float, capacity: float, min_rate: Optional[float] = None, recovery: float = 60.0):
+		self.base_rate = rate
+		self.min_rate = min_rate if min_rate is not None else rate / 16
+		self.capacity = max(1.0, capacity)
+		self.recovery = recovery
+		self._tokens = self.capacity
+		self._updated = time.monotonic()
+		self._throttled_rate = rate
+		self._throttled_at: Optional[float] = None
+		self._paused_until = 0.0
+		self._waiters: List[Tuple[int, int, asyncio.Future, float]] = []
+		self._seq = itertools.count()
+		self._pump: Optional[asyncio.Task] = None
+		self._loop: Optional[asyncio.AbstractEventLoop] = None
+		self.waited = 0.0
+		self.throttles = 0
+
+	def _rate_at(self, now: float) -> float:
+		if self._throttled_at is None:
+			return self.base_rate
+		recovered = self._throttled_rate + self.base_rate * (now - self._throttled_at) / self.recovery
+		if recovered >= self.base_rate:
+			self._throttled_at = None
+			return self.base_rate
+		return recovered
+
+	@property
+	def rate(self) -> float:
+		return self._rate_at(time.monotonic())
+
+	async def _take(self, tokens: float) -> float:
+		"""Take `tokens` if available and return 0, else return the seconds to wait before trying again."""
+		now = time.monotonic()
+		rate = self._rate_at(now)
+		self._tokens = min(self.capacity, self._tokens + (now - self._updated) * rate)
+		self._updated = now
+		if now < self._paused_until:
+			return self._paused_until - now
+		if self._tokens >= tokens:
+			self._tokens -= tokens
+			return 0.0
+		return (tokens - self._tokens) / rate
+
+	async def acquire(self, tokens: float = 1.0) -> None:
+		loop = asyncio.get_running_loop()
+		if self._loop is not loop:
+			self._loop, self._waiters, self._pump = loop, [], None
+		if not self._waiters and await self._take(tokens) <= 0:
+			return
+		future = loop.create_future()
+		heapq.heappush(self._waiters, (current_priority(), next(self._seq), future, tokens))
+		if self._pump is None or self._pump.done():
+			self._pump = loop.create_task(self._serve())
+		await future
+
+	async def _serve(self) -> None:
+		# Only the head of the queue waits for tokens; a higher-priority arrival
+		# becomes the new head and is served as soon as the current wait ends
+		while self._waiters:
+			_, _, future, tokens = self._waiters[0]
+			if future.done():
+				heapq.heappop(self._waiters)
+				continue
+			delay = await self._take(tokens)
+			if delay <= 0:
+				heapq.heappop(self._waiters)
+				future.set_result(None)
+				continue
+			self.waited += delay
+			await asyncio.sleep(delay)
+
+	async def throttled(self, retry_after: Optional[float] = None) -> None:
+		"""Record a throttle response from the provider: halve the rate and pause."""
+		now = time.monotonic()
+		rate = max(self.min_rate, self._rate_at(now) / 2)
+		self._throttled_rate, self._throttled_at = rate, now
+		self._tokens = 0.0
+		self._paused_until = max(self._paused_until, now + (retry_after if retry_after is not None else 1 / rate))
+		self.throttles += 1
+
+	def stats(self) -> Dict[str, Any]:
+		now = time.monotonic()
+		return {
+			"rate": round(self._rate_at(now), 4),
+			"base_rate": self.base_rate,
+			"capacity": self.capacity,
+			"queued": sum(1 for *_, future, _ in self._waiters if not future.done()),
+			"paused_for": round(max(0.0, self._paused_until - now), 2),
+			"throttles": self.throttles,
+			"waited_seconds": round(self.waited, 2),
+		}
+
+
+# Refill, pause and recovery done atomically on the Redis server clock, so every worker draws from one budget.
+# KEYS[1] = bucket hash; ARGV = base rate, min rate, capacity, recovery seconds, tokens, throttle flag, retry_after
+_REDIS_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local base, min_rate, capacity, recovery = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated', 'rate', 'throttled_at', 'paused_until')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+local rate = base
+local throttled_at = tonumber(state[4])
+if throttled_at then
+	rate = math.min(base, tonumber(state[3]) + base * (now - throttled_at) / recovery)
+end
+local paused_until = tonumber(state[5]) or 0
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if ARGV[6] == '1' then
+	rate = math.max(min_rate, rate / 2)
+	throttled_at = now
+	tokens = 0
+	local pause = tonumber(ARGV[7]) or (1 / rate)
+	paused_until = math.max(paused_until, now + pause)
+elseif now < paused_until then
+	wait = paused_until - now
+elseif tokens >= tonumber(ARGV[5]) then
+	tokens = tokens - tonumber(ARGV[5])
+else
+	wait = (tonumber(ARGV[5]) - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now, 'rate', rate, 'paused_until', paused_until)
+if throttled_at and rate < base then
+	redis.call('HSET', KEYS[1], 'throttled_at', throttled_at)
+else
+	redis.call('HDEL', KEYS[1], 'throttled_at')
+end
+redis.call('EXPIRE', KEYS[1], math.ceil(math.max(capacity / min_rate, paused_until - now, recovery)) + 60)
+return tostring(wait)
+"""
+
+
+class RedisTokenBucket(TokenBucket):
+	"""Token bucket whose state lives in Redis, shared by every worker process.
+
+	Priority ordering still happens per process: each worker queues its own
+	callers and only the head of the queue asks Redis for a token.
+	"""
+
+	def __init__(self, client, key: str, rate: float, capacity: float, min_rate: Optional[float] = None, recovery: float = 60.0):
+		super().__init__(rate, capacity, min_rate=min_rate, recovery=recovery)
+		self._redis = client
+		self.key = key
+		self._script = client.register_script(_REDIS_SCRIPT)
+
+	async def _call(self, tokens: float, throttle: bool = False, retry_after: Optional[float] = None) -> float:
+		args = [self.base_rate, self.min_rate, self.capacity, self.recovery, tokens, int(throttle), "" if retry_after is None else retry_after]
+		return float(await self._script(keys=[self.key], args=args))
+
+	async def _take(self, tokens: float) -> float:
+		return await self._call(tokens)
+
+	async def throttled(self, retry_after: Optional[float] = None) -> None:
+		await self._call(0, throttle=True, retry_after=retry_after)
+		self.throttles += 1
+
+
+class RateLimitManager:
+	"""Token buckets per provider and API key, built from `settings.provider_rate_limits`.
+
+	Buckets are keyed by a fingerprint of the API key, so two keys for one
+	provider get separate budgets and the key itself never reaches Redis or
+	the stats endpoint. With `settings.rate_limit_backend == "redis"` the
+	buckets are shared by every worker.
+	"""
+
+	def __init__(self, limits: Dict[str, List[float]], recovery: float = 60.0, redis_url: Optional[str] = None):
+		self.limits = {provider: (float(rate), float(burst)) for provider, (rate, burst) in limits.items()}
+		self.recovery = recovery
+		self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+		self._redis = None
+		if redis_url:
+			import redis.asyncio as redis
+
+			self._redis = redis.from_url(redis_url)
+
+	@staticmethod
+	def _fingerprint(key: str) -> str:
+		return hashlib.sha256(key.encode()).hexdigest()[:12] if key else "default"
+
+	def register(self, provider: str, rate: float, burst: float) -> TokenBucket:
+		"""Set a provider's budget (overriding the settings) and return its default-key bucket."""
+		self.limits[provider] = (rate, burst)
+		for bucket_key in [k for k in self._buckets if k[0] == provider]:
+			del self._buckets[bucket_key]
+		return self.bucket(provider)
+
+	def bucket(self, provider: str, key: str = "") -> Optional[TokenBucket]:
+		"""The bucket for `provider` and API `key`; None for providers without a configured limit."""
+		if provider not in self.limits:
+			return None
+		bucket_key = (provider, self._fingerprint(key))
+		bucket = self._buckets.get(bucket_key)
+		if bucket is None:
+			rate, burst = self.limits[provider]
+			if self._redis is not None:
+				bucket = RedisTokenBucket(self._redis, f"ratelimit:{provider}:{bucket_key[1]}", rate, burst, recovery=self.recovery)
+			else:
+				bucket = TokenBucket(rate, burst, recovery=self.recovery)
+			self._buckets[bucket_key] = bucket
+		return bucket
+
+	async def acquire(self, provider: str, key: str = "") -> None:
+		bucket = self.bucket(provider, key)
+		if bucket is not None:
+			await bucket.acquire()
+
+	async def throttled(self, provider: str, key: str = "", retry_after: Optional[float] = None) -> None:
+		bucket = self.bucket(provider, key)
+		if bucket is not None:
+			await bucket.throttled(retry_after)
+
+	def stats(self) -> Dict[str, Any]:
+		return {
+			"backend": "redis" if self._redis is not None else "memory",
+			"buckets": {f"{provider}:{fingerprint}": bucket.stats() for (provider, fingerprint), bucket in self._buckets.items()},
+		}
+
+
+# Global rate limit manager instance, built on first use
+rate_limits = Lazy(lambda: RateLimitManager(
+	settings.provider_rate_limits,
+	recovery=settings.rate_limit_recovery_seconds,
+	redis_url=settings.redis_url if settings.rate_limit_backend == "redis" else None,
+))
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from app.core.config import settings
+
+
+class Readiness:
+	"""Startup gate behind `GET /health/ready`, kept apart from liveness.
+
+	A process is live as soon as it answers HTTP; it is ready once the
+	lifespan has finished starting up (`started`) and every registered
+	dependency check passes within `readiness_check_timeout`. Readiness drops
+	again as soon as shutdown begins, so the load balancer drains traffic
+	before the clients and pools are closed.
+	"""
+
+	def __init__(self):
+		self.started = False
+		self._checks: Dict[str, Callable[[], Awaitable[None]]] = {}
+
+	def register(self, name: str, check: Callable[[], Awaitable[None]]) -> None:
+		"""Add a dependency check; it passes by returning and fails by raising."""
+		self._checks[name] = check
+
+	async def _run(self, check: Callable[[], Awaitable[None]]) -> Dict[str, Any]:
+		try:
+			await asyncio.wait_for(check(), timeout=settings.readiness_check_timeout)
+			return {"ok": True}
+		except asyncio.TimeoutError:
+			return {"ok": False, "error": "timed out"}
+		except Exception as e:
+			return {"ok": False, "error": str(e) or type(e).__name__}
+
+	async def check(self) -> Dict[str, Any]:
+		if not self.started:
+			return {"ready": False, "status": "starting", "checks": {}}
+		results = await asyncio.gather(*(self._run(check) for check in self._checks.values()))
+		checks = dict(zip(self._checks, results))
+		ready = all(result["ok"] for result in results)
+		return {"ready": ready, "status": "ready" if ready else "unavailable", "checks": checks}
+
+
+# Global readiness gate instance
+readiness = Readiness()
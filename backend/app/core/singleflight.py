@@ -0,0 +1,46 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+
+def flight_key(provider: str, endpoint: str, params: Optional[Mapping[str, Any]] = None) -> Tuple:
+	"""Build a hashable (provider, endpoint, params) key for `SingleFlight.do`."""
+	items = tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+	return (provider, endpoint, items)
+
+
+class SingleFlight:
+	"""Coalesce identical in-flight calls so concurrent callers share one upstream request.
+
+	The first caller for a key starts the work; everyone arriving while it is
+	running awaits the same future. The key is forgotten as soon as the call
+	finishes, so this never serves stale results - caching is the quote
+	cache's job.
+	"""
+
+	def __init__(self):
+		self._inflight: Dict[Hashable, asyncio.Future] = {}
+		self.calls = 0
+		self.coalesced = 0
+
+	async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+		future = self._inflight.get(key)
+		if future is None:
+			self.calls += 1
+			future = asyncio.ensure_future(fn())
+			self._inflight[key] = future
+
+			def _forget(done: asyncio.Future, key: Hashable = key) -> None:
+				if self._inflight.get(key) is done:
+					del self._inflight[key]
+				if not done.cancelled():
+					done.exception()  # waiters re-raise it; avoid "never retrieved" noise
+
+			future.add_done_callback(_forget)
+		else:
+			self.coalesced += 1
+		# Shield so one cancelled caller does not cancel the request for the others
+		return await asyncio.shield(future)
+
+
+# Global single-flight group for provider calls
+singleflight = SingleFlight()
@@ -1,17 +1,113 @@
+from typing import Any, AsyncIterator, Dict, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.lazy import Lazy, unwrap
+
+
+def database_url() -> str:
+	return settings.database_url or "sqlite:///./oryntal.db"
+
+
+def _pool_args(url: str) -> Dict[str, Any]:
+	"""Pool sizing for server databases; SQLite keeps the dialect's default pool."""
+	if url.startswith("sqlite"):
+		return {}
+	return {
+		"pool_size": settings.db_pool_size,
+		"max_overflow": settings.db_max_overflow,
+		"pool_recycle": settings.db_pool_recycle,
+		"pool_timeout": settings.db_pool_timeout,
+	}
 
 
-DATABASE_URL = settings.database_url or "sqlite:///./oryntal.db"
+def _build_engine() -> Engine:
+	url = database_url()
+	connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+	return create_engine(url, pool_pre_ping=True, connect_args=connect_args, **_pool_args(url))
 
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Synchronous engine: ingestion stores (run in threads), scripts and table creation; built on first use
+engine = Lazy(_build_engine)
+SessionLocal = Lazy(lambda: sessionmaker(autocommit=False, autoflush=False, bind=unwrap(engine)))
 Base = declarative_base()
 
 
+def async_url(url: str) -> str:
+	"""The async driver URL for a sync one: asyncpg for PostgreSQL, aiosqlite for SQLite."""
+	parsed = make_url(url)
+	backend = parsed.get_backend_name()
+	if backend == "postgresql":
+		# asyncpg does not understand libpq's sslmode; AsyncDatabase maps it to `ssl`
+		parsed = parsed.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+	elif backend == "sqlite":
+		parsed = parsed.set(drivername="sqlite+aiosqlite")
+	return parsed.render_as_string(hide_password=False)
+
+
+class AsyncDatabase:
+	"""Async engine and session factory for request handlers.
+
+	Created on first use, so scripts that only need the sync engine never
+	import the async drivers, and disposed by the app lifespan on shutdown
+	(the pooled connections belong to the event loop that opened them; the
+	next app lifetime builds a fresh engine). Server databases are pre-pinged
+	on checkout; a local SQLite file cannot drop its connections.
+	"""
+
+	def __init__(self, url: str):
+		self.url = url
+		self._engine: Optional[AsyncEngine] = None
+		self._sessions: Optional[async_sessionmaker] = None
+
+	def _build(self) -> None:
+		kwargs: Dict[str, Any] = {}
+		if self.url.startswith("sqlite"):
+			# Each aiosqlite connection owns a thread; keep a few open instead of one per request
+			kwargs.update(poolclass=AsyncAdaptedQueuePool, pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+		else:
+			kwargs.update(pool_pre_ping=True, **_pool_args(self.url))
+			if make_url(self.url).query.get("sslmode") in ("require", "verify-ca", "verify-full"):
+				kwargs["connect_args"] = {"ssl": True}
+		self._engine = create_async_engine(async_url(self.url), **kwargs)
+		self._sessions = async_sessionmaker(self._engine, expire_on_commit=False, autoflush=False)
+
+	@property
+	def engine(self) -> AsyncEngine:
+		if self._engine is None:
+			self._build()
+		return self._engine
+
+	def session(self) -> AsyncSession:
+		if self._sessions is None:
+			self._build()
+		return self._sessions()
+
+	async def dispose(self) -> None:
+		engine, self._engine, self._sessions = self._engine, None, None
+		if engine is not None:
+			await engine.dispose()
+
+
+# Global async database instance, built on first use
+async_db = Lazy(lambda: AsyncDatabase(database_url()))
+
+
+def insert_ignore(table):
+	"""Bulk INSERT that skips rows whose primary/unique key already exists."""
+	if engine.dialect.name == "postgresql":
+		from sqlalchemy.dialects.postgresql import insert
+	elif engine.dialect.name == "sqlite":
+		from sqlalchemy.dialects.sqlite import insert
+	else:
+		return table.insert().prefix_with("IGNORE")
+	return insert(table).on_conflict_do_nothing()
+
+
 def get_db():
 	db = SessionLocal()
 	try:
@@ -20,3 +116,6 @@ def get_db():
 		db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+	async with async_db.session() as db:
+		yield db
@@ -1,8 +1,89 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from starlette.types import ASGIApp
 
 from app.api.routes import api_router
 from app.core.config import settings
+from app.core.http import http_clients
+from app.core.lazy import is_loaded
+from app.core.readiness import readiness
+from app.db import async_db
+from app.migrate import migrate, missing_tables
+from app.services.alerts_feed import alerts_feed
+from app.services.email_outbox import email_outbox
+from app.services.influencer_engine import influencer_engine
+from app.services.ohlcv_ingestor import ohlcv_ingestor
+from app.services.reddit_ingestor import reddit_ingestor
+from app.services.sentiment_engine import sentiment_engine
+from app.services.symbol_registry import symbol_registry
+from app.services.twitter_ingestor import twitter_ingestor
+
+
+async def database_ready() -> None:
+	async with async_db.engine.connect() as conn:
+		await conn.execute(text("SELECT 1"))
+		missing = await conn.run_sync(missing_tables)
+	if missing:
+		raise RuntimeError(f"missing tables {', '.join(missing)} (run python -m app.migrate)")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	# Startup
+	if settings.database_auto_migrate:
+		try:
+			await asyncio.to_thread(migrate)
+		except Exception as e:
+			print(f"Error migrating the database: {e}")
+	await http_clients.startup()
+	if settings.symbol_registry_remote:
+		try:
+			await asyncio.wait_for(symbol_registry.load(), timeout=settings.symbol_registry_load_timeout)
+		except asyncio.TimeoutError:
+			print("Error loading symbol registry: timed out, using the seed universe")
+	if settings.twitter_ingest_enabled:
+		await twitter_ingestor.start()
+	if settings.reddit_ingest_enabled:
+		await reddit_ingestor.start()
+	if settings.ohlcv_ingest_enabled:
+		await ohlcv_ingestor.start()
+	if settings.alerts_scheduler_enabled:
+		await alerts_feed.start()
+	if settings.influencer_engine_enabled:
+		await influencer_engine.start()
+	readiness.started = True
+	try:
+		yield
+	finally:
+		# Shutdown
+		readiness.started = False
+		# Services that were never used were never built; there is nothing to stop
+		for worker in (alerts_feed, influencer_engine, twitter_ingestor, reddit_ingestor, ohlcv_ingestor, email_outbox):
+			if is_loaded(worker):
+				await worker.stop()
+		if is_loaded(sentiment_engine):
+			await sentiment_engine.shutdown()
+		if is_loaded(async_db):
+			await async_db.dispose()
+		await http_clients.shutdown()
+
+
+class SettingsCORSMiddleware(CORSMiddleware):
+	"""CORS configured from settings when the middleware stack is built (at startup), not at import."""
+
+	def __init__(self, app: ASGIApp):
+		super().__init__(
+			app,
+			allow_origins=settings.cors_allow_origins,
+			allow_credentials=True,
+			allow_methods=["*"],
+			allow_headers=["*"],
+		)
 
 
 def create_app() -> FastAPI:
@@ -10,24 +91,28 @@ def create_app() -> FastAPI:
 		title="Oryntal AI API",
 		description="AI-powered platform for social sentiment and market insights",
 		version="0.1.0",
+		lifespan=lifespan,
 	)
 
 	# CORS
-	app.add_middleware(
-		CORSMiddleware,
-		allow_origins=settings.cors_allow_origins,
-		allow_credentials=True,
-		allow_methods=["*"],
-		allow_headers=["*"],
-	)
+	app.add_middleware(SettingsCORSMiddleware)
 
 	# Routes
 	app.include_router(api_router)
 
+	# Liveness: the process answers; readiness: startup finished and dependencies reachable
+	readiness.register("database", database_ready)
+
 	@app.get("/health")
+	@app.get("/health/live")
 	def health() -> dict:
 		return {"status": "ok"}
 
+	@app.get("/health/ready")
+	async def health_ready() -> JSONResponse:
+		result = await readiness.check()
+		return JSONResponse(result, status_code=200 if result["ready"] else 503)
+
 	return app
 
 
@@ -0,0 +1,53 @@
+"""Create the database schema, once per deploy, before the API starts.
+
+	cd backend && python -m app.migrate [--check]
+
+`--check` only lists the missing tables and exits non-zero if there are any.
+"""
+import argparse
+import sys
+from typing import List, Optional, Union
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.lazy import unwrap
+from app.db import Base, engine
+
+
+def load_models() -> None:
+	"""Register every model on `Base.metadata`."""
+	import app.models.sentiment  # noqa: F401
+	import app.models.social  # noqa: F401
+	import app.models.user  # noqa: F401
+
+
+def missing_tables(bind: Union[Connection, Engine]) -> List[str]:
+	load_models()
+	existing = set(inspect(unwrap(bind)).get_table_names())
+	return [table.name for table in Base.metadata.sorted_tables if table.name not in existing]
+
+
+def migrate(bind: Engine = engine) -> List[str]:
+	"""Create missing tables (and their indexes); returns the names of the tables created."""
+	missing = missing_tables(bind)
+	if missing:
+		Base.metadata.create_all(bind=bind)
+	return missing
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m app.migrate", description="Create the Oryntal AI database schema.")
+	parser.add_argument("--check", action="store_true", help="list missing tables without creating them")
+	args = parser.parse_args(argv)
+	if args.check:
+		missing = missing_tables(engine)
+		print(f"Missing tables: {', '.join(missing)}" if missing else "Schema is up to date")
+		return 1 if missing else 0
+	created = migrate()
+	print(f"Created tables: {', '.join(created)}" if created else "Schema is up to date")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.db import Base
+
+
+class SentimentScore(Base):
+	"""Persisted FinBERT output, content-addressed by model and normalized text."""
+
+	__tablename__ = "sentiment_scores"
+
+	key = Column(String(64), primary_key=True)
+	model = Column(String(255), nullable=False)
+	labels = Column(Text, nullable=False)
+	created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,74 @@
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index, PrimaryKeyConstraint
+from sqlalchemy.sql import func
+from app.db import Base
+
+
+class Tweet(Base):
+	"""Ingested tweet, stored once per watched symbol it matched."""
+
+	__tablename__ = "tweets"
+	__table_args__ = (
+		PrimaryKeyConstraint("symbol", "id"),
+		Index("ix_tweets_symbol_created_at", "symbol", "created_at"),
+	)
+
+	id = Column(String(32), nullable=False)
+	symbol = Column(String(32), nullable=False)
+	text = Column(Text, nullable=False)
+	author_id = Column(String(32), nullable=True)
+	lang = Column(String(8), nullable=True)
+	like_count = Column(Integer, default=0)
+	retweet_count = Column(Integer, default=0)
+	reply_count = Column(Integer, default=0)
+	created_at = Column(DateTime(timezone=True), nullable=False)
+	ingested_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class IngestionCursor(Base):
+	"""Resume point of a polling ingestion job, one row per (source, key)."""
+
+	__tablename__ = "ingestion_cursors"
+	__table_args__ = (PrimaryKeyConstraint("source", "key"),)
+
+	source = Column(String(32), nullable=False)
+	key = Column(String(255), nullable=False)
+	# Newest item id fully ingested; the next sweep only asks for items after it
+	since_id = Column(String(64), nullable=True)
+	# Mid-sweep checkpoint: page token to resume from and the sweep's newest id
+	next_token = Column(String(255), nullable=True)
+	pending_since_id = Column(String(64), nullable=True)
+	updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class RedditItem(Base):
+	"""Ingested Reddit post (t3) or comment (t1), keyed by its fullname."""
+
+	__tablename__ = "reddit_items"
+	__table_args__ = (Index("ix_reddit_items_subreddit_created_at", "subreddit", "created_at"),)
+
+	id = Column(String(32), primary_key=True)
+	kind = Column(String(8), nullable=False)
+	subreddit = Column(String(64), nullable=False)
+	author = Column(String(64), nullable=True)
+	title = Column(Text, nullable=True)
+	text = Column(Text, nullable=True)
+	parent_id = Column(String(32), nullable=True)
+	permalink = Column(String(512), nullable=True)
+	score = Column(Integer, default=0)
+	num_comments = Column(Integer, default=0)
+	created_at = Column(DateTime(timezone=True), nullable=False)
+	ingested_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class RedditMention(Base):
+	"""Symbol mentioned by a Reddit item."""
+
+	__tablename__ = "reddit_mentions"
+	__table_args__ = (
+		PrimaryKeyConstraint("symbol", "item_id"),
+		Index("ix_reddit_mentions_symbol_created_at", "symbol", "created_at"),
+	)
+
+	symbol = Column(String(32), nullable=False)
+	item_id = Column(String(32), nullable=False)
+	created_at = Column(DateTime(timezone=True), nullable=False)
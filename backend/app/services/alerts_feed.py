@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.lazy import Lazy
+from app.core.rate_limit import BACKGROUND, priority
+from app.core.singleflight import singleflight
+from app.services.alerts_service import alerts_service
+
+
+# Fields that change on every run without the alert itself changing
+_VOLATILE_FIELDS = ("timestamp", "read")
+
+
+def _fingerprint(alert: Dict[str, Any]) -> str:
+	stable = {k: v for k, v in alert.items() if k not in _VOLATILE_FIELDS}
+	return hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class AlertsFeed:
+	"""Background-computed alert snapshot with delta push to subscribers.
+
+	A scheduler task started from the app lifespan re-runs the alerts pipeline
+	every `settings.alerts_refresh_interval` seconds. Alerts are keyed by their
+	stable id and deduplicated by content fingerprint, so a run that finds the
+	same alerts produces no delta. `/alerts` serves the prebuilt snapshot; SSE
+	clients receive `added`/`updated`/`removed` deltas tagged with a version and
+	can resume from the bounded delta history.
+	"""
+
+	def __init__(self, history_size: int):
+		self._alerts: Dict[str, Dict[str, Any]] = {}
+		self._fingerprints: Dict[str, str] = {}
+		self._snapshot: Dict[str, Any] = {"alerts": [], "version": 0, "updated_at": None}
+		self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+		self._subscribers: Set[asyncio.Queue] = set()
+		self._task: Optional[asyncio.Task] = None
+
+	@property
+	def version(self) -> int:
+		return self._snapshot["version"]
+
+	def snapshot(self) -> Dict[str, Any]:
+		return self._snapshot
+
+	def apply(self, alerts: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+		"""Merge a fresh run into the snapshot and return the delta (None when nothing changed)."""
+		now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+		current: Dict[str, Dict[str, Any]] = {}
+		fingerprints: Dict[str, str] = {}
+		added, updated = [], []
+		for alert in alerts:
+			alert_id = alert["id"]
+			if alert_id in current:
+				continue
+			fingerprint = _fingerprint(alert)
+			previous = self._alerts.get(alert_id)
+			if previous is None:
+				alert = {**alert, "timestamp": now}
+				added.append(alert)
+			elif self._fingerprints[alert_id] != fingerprint:
+				alert = {**alert, "timestamp": now}
+				updated.append(alert)
+			else:
+				alert = previous
+			current[alert_id] = alert
+			fingerprints[alert_id] = fingerprint
+		removed = [alert_id for alert_id in self._alerts if alert_id not in current]
+
+		self._alerts, self._fingerprints = current, fingerprints
+		if not (added or updated or removed):
+			return None
+		version = self.version + 1
+		self._snapshot = {"alerts": list(current.values()), "version": version, "updated_at": now}
+		delta = {"version": version, "added": added, "updated": updated, "removed": removed}
+		self.history.append(delta)
+		self._publish(delta)
+		return delta
+
+	async def refresh(self) -> Optional[Dict[str, Any]]:
+		alerts = await singleflight.do(("alerts", "generate"), alerts_service.generate)
+		return self.apply(alerts)
+
+	async def latest(self) -> Dict[str, Any]:
+		"""Current snapshot; computed on demand only if the scheduler has not produced one yet."""
+		if self._snapshot["updated_at"] is None and self._task is None:
+			await self.refresh()
+		return self._snapshot
+
+	def deltas_since(self, version: int) -> Optional[List[Dict[str, Any]]]:
+		"""Deltas after `version`, or None if the history no longer reaches back that far."""
+		if version >= self.version:
+			return []
+		if not self.history or self.history[0]["version"] > version + 1:
+			return None
+		return [d for d in self.history if d["version"] > version]
+
+	def subscribe(self) -> asyncio.Queue:
+		queue: asyncio.Queue = asyncio.Queue(maxsize=settings.alerts_subscriber_queue_size)
+		self._subscribers.add(queue)
+		return queue
+
+	def unsubscribe(self, queue: asyncio.Queue) -> None:
+		self._subscribers.discard(queue)
+
+	def _publish(self, delta: Dict[str, Any]) -> None:
+		for queue in list(self._subscribers):
+			try:
+				queue.put_nowait(("delta", delta))
+			except asyncio.QueueFull:
+				# Slow consumer: drop its backlog and resync it with the full snapshot
+				while not queue.empty():
+					queue.get_nowait()
+				queue.put_nowait(("snapshot", self._snapshot))
+
+	async def _run(self) -> None:
+		# Queue behind interactive requests for provider rate limit tokens
+		with priority(BACKGROUND):
+			while True:
+				try:
+					await self.refresh()
+				except Exception as e:
+					print(f"Error refreshing alerts: {e}")
+				await asyncio.sleep(settings.alerts_refresh_interval)
+
+	async def start(self) -> None:
+		if self._task is None:
+			self._task = asyncio.create_task(self._run())
+
+	async def stop(self) -> None:
+		task, self._task = self._task, None
+		if task is not None:
+			task.cancel()
+			try:
+				await task
+			except asyncio.CancelledError:
+				pass
+
+
+# Global alerts feed instance, built on first use
+alerts_feed = Lazy(lambda: AlertsFeed(history_size=settings.alerts_history_size))
@@ -1,59 +1,111 @@
-from typing import List, Dict, Any
 import asyncio
+import time
+from typing import List, Dict, Any, Optional
+from app.core.config import settings
 from app.services.market_data_service import market_data_service
-from app.services.twitter_service import twitter_service
-from app.services.recommendation_service import recommendation_service
+from app.services.ohlcv_store import ohlcv_store
+from app.services.sentiment_aggregates import sentiment_aggregates
 
 
 class AlertsService:
+	"""Alert pipeline over the watch universe.
+
+	Quotes for the whole universe come from one batched `get_quotes` call (the
+	symbol registry routes each symbol to its provider). Sentiment spikes are
+	read from the rolling sentiment aggregates, which the ingestion workers keep
+	current: a symbol spikes when the mean of its recent window is
+	`settings.alerts_spike_zscore` standard errors away from its baseline
+	window, so a quiet symbol's usual mood never alerts and no model call
+	happens on this path. Volume spikes compare the latest daily bar in the
+	local OHLCV store with its 20-day average. Every alert of a run carries the
+	run's time as an ISO-8601 UTC `timestamp`.
+	"""
+
+	def __init__(self, symbols: Optional[List[str]] = None):
+		self.symbols = symbols
+
+	@property
+	def universe(self) -> List[str]:
+		return list(dict.fromkeys(s.upper() for s in (self.symbols or settings.alerts_watchlist)))
+
+	@staticmethod
+	def _price_alert(sym: str, asset: Dict[str, Any], timestamp: str) -> Optional[Dict[str, Any]]:
+		change = asset.get("change_percent") or 0
+		if change and abs(float(change)) >= 3:
+			return {
+				"id": f"price-{sym}",
+				"type": "price_alert",
+				"severity": "high" if abs(float(change)) >= 5 else "medium",
+				"title": "Price Movement Alert",
+				"description": f"{sym} moved {float(change):.2f}% in the last day",
+				"symbol": sym,
+				"changePercent": float(change),
+				"timestamp": timestamp,
+				"read": False,
+			}
+		return None
+
+	@staticmethod
+	def _volume_alert(sym: str, features: Dict[str, Any], timestamp: str) -> Optional[Dict[str, Any]]:
+		ratio = features.get("volume_ratio")
+		if ratio is None or ratio < settings.alerts_volume_ratio:
+			return None
+		return {
+			"id": f"volume-{sym}",
+			"type": "volume_spike",
+			"severity": "high" if ratio >= 2 * settings.alerts_volume_ratio else "medium",
+			"title": "Volume Spike",
+			"description": f"{sym} traded {ratio:.1f}x its 20-day average volume",
+			"symbol": sym,
+			"volumeRatio": round(ratio, 1),
+			"timestamp": timestamp,
+			"read": False,
+		}
+
+	@staticmethod
+	def _sentiment_alert(sym: str, timestamp: str) -> Optional[Dict[str, Any]]:
+		spike = sentiment_aggregates.zscore(sym)
+		if spike is None or abs(spike["z"]) < settings.alerts_spike_zscore:
+			return None
+		z, recent, baseline = spike["z"], spike["recent"], spike["baseline"]
+		return {
+			"id": f"sentiment-{sym}",
+			"type": "sentiment_spike",
+			"severity": "high" if abs(z) >= 2 * settings.alerts_spike_zscore else "medium",
+			"title": "Sentiment Spike",
+			"description": (
+				f"{sym} sentiment {recent['mean']:+.2f} over the last {settings.alerts_spike_window} "
+				f"vs {baseline['mean']:+.2f} {settings.alerts_baseline_window} baseline (z={z:+.1f})"
+			),
+			"symbol": sym,
+			"sentiment": round(recent["mean"], 2),
+			"zScore": round(z, 1),
+			"timestamp": timestamp,
+			"read": False,
+		}
+
 	async def generate(self) -> List[Dict[str, Any]]:
+		symbols = self.universe
+		timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+		# One batch quote call per provider for the whole universe
+		quotes = await market_data_service.get_quotes(symbols, deadline=settings.alerts_quote_timeout)
+		# Multi-day features from the local OHLCV history
+		history = await asyncio.to_thread(lambda: {sym: ohlcv_store.features(sym) for sym in symbols})
 		alerts: List[Dict[str, Any]] = []
-		# Sample universe
-		symbols = ["AAPL", "TSLA", "NVDA", "MSFT", "BTC", "ETH"]
 		for sym in symbols:
-			# Price/volume alerts from market services
-			stock = await market_data_service.get_stock_quote(sym)
-			crypto = None
-			if not stock:
-				crypto = await market_data_service.get_crypto_quote(sym)
-			asset = stock or crypto
-			if not asset:
-				continue
-			change = asset.get("change") or asset.get("change_24h") or 0
-			if change and abs(float(change)) >= 3:
-				alerts.append({
-					"id": f"price-{sym}",
-					"type": "price_alert",
-					"severity": "high" if abs(float(change)) >= 5 else "medium",
-					"title": "Price Movement Alert",
-					"description": f"{sym} moved {float(change):.2f}% in the last day",
-					"symbol": sym,
-					"changePercent": float(change),
-					"timestamp": "now",
-					"read": False,
-				})
-			# Sentiment spikes from tweets
-			try:
-				res = await twitter_service.search_recent(query=f"${sym} lang:en -is:retweet", max_results=10)
-				texts = [t.get("text", "") for t in res.get("data", [])]
-				reco = await recommendation_service.recommend(sym, texts)
-				if abs(float(reco.get("sentiment", 0))) >= 0.4:
-					alerts.append({
-						"id": f"sentiment-{sym}",
-						"type": "sentiment_spike",
-						"severity": "high",
-						"title": "Sentiment Spike",
-						"description": f"{sym} sentiment={reco.get('sentiment')}",
-						"symbol": sym,
-						"sentiment": reco.get("sentiment", 0),
-						"timestamp": "now",
-						"read": False,
-					})
-			except Exception:
-				pass
+			asset = quotes.get(sym)
+			# Price/volume alerts from market services and stored history
+			price_alert = self._price_alert(sym, asset, timestamp) if asset else None
+			if price_alert:
+				alerts.append(price_alert)
+			volume_alert = self._volume_alert(sym, history[sym], timestamp)
+			if volume_alert:
+				alerts.append(volume_alert)
+			# Sentiment spikes from the rolling aggregates
+			sentiment_alert = self._sentiment_alert(sym, timestamp)
+			if sentiment_alert:
+				alerts.append(sentiment_alert)
 		return alerts
 
 
 alerts_service = AlertsService()
-
-
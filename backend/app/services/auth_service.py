@@ -1,14 +1,22 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.lazy import Lazy
 from app.models.user import User
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = Lazy(lambda: CryptContext(schemes=["bcrypt"], deprecated="auto"))
+
+# bcrypt burns 100-300 ms of CPU per call; a small dedicated pool caps how many
+# run at once, so a login storm queues here instead of starving other requests
+_hash_executor = Lazy(lambda: ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="bcrypt"))
 
 
 def hash_password(password: str) -> str:
@@ -19,7 +27,17 @@ def verify_password(password: str, password_hash: str) -> bool:
 	return pwd_context.verify(password, password_hash)
 
 
+async def hash_password_async(password: str) -> str:
+	return await asyncio.get_running_loop().run_in_executor(_hash_executor, hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+	return await asyncio.get_running_loop().run_in_executor(_hash_executor, verify_password, password, password_hash)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+	from jose import jwt  # cryptography backend: ~100 ms of import, deferred to the first login
+
 	to_encode = data.copy()
 	expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
 	to_encode.update({"exp": expire})
@@ -31,12 +49,29 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
 	return db.query(User).filter(User.email == email.lower()).first()
 
 
-def create_user(db: Session, *, email: str, password: str, first_name: str = "", last_name: str = "") -> User:
+def create_user(
+	db: Session,
+	*,
+	email: str,
+	password: Optional[str] = None,
+	first_name: str = "",
+	last_name: str = "",
+	password_hash: Optional[str] = None,
+) -> User:
+	"""Insert a user, hashing `password` here (blocking, 100-300 ms of bcrypt).
+
+	Callers on the event loop hash with `hash_password_async` and pass
+	`password_hash` instead.
+	"""
+	if password_hash is None:
+		if password is None:
+			raise TypeError("create_user() needs a password or a password_hash")
+		password_hash = hash_password(password)
 	user = User(
 		email=email.lower(),
 		first_name=first_name,
 		last_name=last_name,
-		password_hash=hash_password(password),
+		password_hash=password_hash,
 	)
 	db.add(user)
 	db.commit()
@@ -44,3 +79,19 @@ def create_user(db: Session, *, email: str, password: str, first_name: str = "",
 	return user
 
 
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+	return (await db.execute(select(User).where(User.email == email.lower()).limit(1))).scalar_one_or_none()
+
+
+async def create_user_async(
+	db: AsyncSession, *, email: str, password_hash: str, first_name: str = "", last_name: str = ""
+) -> User:
+	user = User(
+		email=email.lower(),
+		first_name=first_name,
+		last_name=last_name,
+		password_hash=password_hash,
+	)
+	db.add(user)
+	await db.commit()
+	return user
@@ -0,0 +1,212 @@
+import asyncio
+import smtplib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.lazy import Lazy
+from app.services.email_service import OTP_SUBJECT, PASSWORD_RESET_SUBJECT, EmailService, email_service
+
+
+@dataclass
+class OutgoingEmail:
+	to: str
+	subject: str
+	html: str
+	attempts: int = 0
+
+
+class EmailOutbox:
+	"""Asynchronous email delivery: request handlers queue messages and return at once.
+
+	A pool of worker tasks drains the queue. Each worker owns one SMTP
+	connection, reused across messages and closed after `idle_timeout`
+	seconds without work; the blocking smtplib calls run on a thread pool
+	sized to the workers, so the event loop never waits on an SMTP
+	conversation. Temporary failures are retried with exponential backoff up
+	to `max_attempts`; permanent (5xx) refusals are dropped. Workers start
+	lazily on the first submission in the running loop.
+	"""
+
+	def __init__(
+		self,
+		service: EmailService,
+		workers: int,
+		max_queue: int,
+		max_attempts: int,
+		backoff: float,
+		idle_timeout: float,
+	):
+		self.service = service
+		self.workers = max(1, workers)
+		self.max_queue = max_queue
+		self.max_attempts = max(1, max_attempts)
+		self.backoff = backoff
+		self.idle_timeout = idle_timeout
+		self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="smtp")
+		self._queue: Optional[asyncio.Queue] = None
+		self._tasks: List[asyncio.Task] = []
+		self._loop: Optional[asyncio.AbstractEventLoop] = None
+		self._retrying: Set[asyncio.TimerHandle] = set()
+		self._closing: Set[asyncio.Future] = set()
+		# Accepted and not yet sent or dropped (queued, in flight or waiting to retry)
+		self.pending = 0
+		self.sent = 0
+		self.failed = 0
+		self.retries = 0
+		self.rejected = 0
+
+	def _ensure_workers(self) -> None:
+		loop = asyncio.get_running_loop()
+		if self._loop is not loop or all(task.done() for task in self._tasks):
+			self._loop = loop
+			self._queue = asyncio.Queue()
+			self._retrying = set()
+			self.pending = 0
+			self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+	def submit(self, to: str, subject: str, html: str) -> bool:
+		"""Queue a message; False when the outbox is full."""
+		self._ensure_workers()
+		if self.pending >= self.max_queue:
+			self.rejected += 1
+			return False
+		self.pending += 1
+		self._queue.put_nowait(OutgoingEmail(to, subject, html))
+		return True
+
+	def send_otp(self, to: str, otp: str, user_name: str = "User") -> bool:
+		return self.submit(to, OTP_SUBJECT, self.service.create_otp_template(otp, user_name))
+
+	def send_password_reset(self, to: str, reset_link: str, user_name: str = "User") -> bool:
+		return self.submit(to, PASSWORD_RESET_SUBJECT, self.service.create_password_reset_template(reset_link, user_name))
+
+	# Blocking SMTP work, on the executor
+
+	@staticmethod
+	def _close(connection: Optional[smtplib.SMTP]) -> None:
+		if connection is None:
+			return
+		try:
+			connection.quit()
+		except Exception:
+			connection.close()
+
+	def _deliver(self, connection: Optional[smtplib.SMTP], email: OutgoingEmail) -> smtplib.SMTP:
+		message = self.service.build_message(email.to, email.subject, email.html)
+		if connection is not None:
+			try:
+				connection.send_message(message)
+				return connection
+			except smtplib.SMTPServerDisconnected:
+				# The server dropped the kept-alive connection; reconnect once below
+				pass
+			except Exception:
+				self._close(connection)
+				raise
+		connection = self.service.connect()
+		try:
+			connection.send_message(message)
+		except Exception:
+			self._close(connection)
+			raise
+		return connection
+
+	# Workers
+
+	async def _work(self) -> None:
+		loop = asyncio.get_running_loop()
+		connection: Optional[smtplib.SMTP] = None
+		try:
+			while True:
+				try:
+					if connection is None:
+						email = await self._queue.get()
+					else:
+						email = await asyncio.wait_for(self._queue.get(), self.idle_timeout)
+				except asyncio.TimeoutError:
+					await loop.run_in_executor(self._executor, self._close, connection)
+					connection = None
+					continue
+				try:
+					connection = await loop.run_in_executor(self._executor, self._deliver, connection, email)
+					self.sent += 1
+					self.pending -= 1
+				except Exception as e:
+					connection = None
+					self._retry(email, e)
+		finally:
+			if connection is not None:
+				self._closing.add(asyncio.wrap_future(self._executor.submit(self._close, connection)))
+
+	@staticmethod
+	def _permanent(error: Exception) -> bool:
+		if isinstance(error, smtplib.SMTPRecipientsRefused):
+			return True
+		code = getattr(error, "smtp_code", None)
+		return isinstance(code, int) and 500 <= code < 600
+
+	def _retry(self, email: OutgoingEmail, error: Exception) -> None:
+		email.attempts += 1
+		if email.attempts >= self.max_attempts or self._permanent(error):
+			self.failed += 1
+			self.pending -= 1
+			print(f"Email sending failed for {email.to} after {email.attempts} attempt(s): {error}")
+			return
+		self.retries += 1
+		delay = self.backoff * 2 ** (email.attempts - 1)
+		handle: Optional[asyncio.TimerHandle] = None
+
+		def requeue() -> None:
+			self._retrying.discard(handle)
+			self._queue.put_nowait(email)
+
+		handle = self._loop.call_later(delay, requeue)
+		self._retrying.add(handle)
+
+	async def drain(self) -> None:
+		"""Wait until every queued message (retries included) has been delivered or dropped."""
+		while self.pending and self._loop is asyncio.get_running_loop():
+			await asyncio.sleep(0.01)
+
+	async def stop(self, timeout: float = 5.0) -> None:
+		"""Give queued messages `timeout` seconds to go out, then stop the workers."""
+		if self._loop is not asyncio.get_running_loop():
+			return
+		try:
+			await asyncio.wait_for(self.drain(), timeout)
+		except asyncio.TimeoutError:
+			print(f"Email outbox stopped with {self.pending} message(s) unsent")
+		for handle in self._retrying:
+			handle.cancel()
+		self._retrying = set()
+		self.pending = 0
+		tasks, self._tasks = self._tasks, []
+		for task in tasks:
+			task.cancel()
+		await asyncio.gather(*tasks, return_exceptions=True)
+		closing, self._closing = self._closing, set()
+		await asyncio.gather(*closing, return_exceptions=True)
+
+	def stats(self) -> Dict[str, Any]:
+		return {
+			"workers": self.workers,
+			"pending": self.pending,
+			"retrying": len(self._retrying),
+			"sent": self.sent,
+			"failed": self.failed,
+			"retries": self.retries,
+			"rejected": self.rejected,
+		}
+
+
+# Global email outbox instance, built on first use
+email_outbox = Lazy(lambda: EmailOutbox(
+	email_service,
+	workers=settings.email_outbox_workers,
+	max_queue=settings.email_outbox_max_queue,
+	max_attempts=settings.email_outbox_max_attempts,
+	backoff=settings.email_outbox_backoff,
+	idle_timeout=settings.email_smtp_idle_seconds,
+))
@@ -5,6 +5,11 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
 from app.core.config import settings
+from app.core.lazy import Lazy
+
+
+OTP_SUBJECT = "Verify Your Email - Oryntal AI"
+PASSWORD_RESET_SUBJECT = "Reset Your Password - Oryntal AI"
 
 
 class EmailService:
@@ -306,23 +311,31 @@ class EmailService:
         </html>
         """
 
-    def send_email(self, to_email: str, subject: str, html_content: str) -> bool:
-        """Send email with HTML content"""
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.email
-            msg['To'] = to_email
+    def build_message(self, to_email: str, subject: str, html_content: str) -> MIMEMultipart:
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.email
+        msg['To'] = to_email
+        msg.attach(MIMEText(html_content, 'html'))
+        return msg
 
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
+    def connect(self) -> smtplib.SMTP:
+        """Open an authenticated SMTP connection (blocking; the outbox calls it from its worker threads)."""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=settings.email_smtp_timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            server.login(self.email, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.email, self.password)
-                server.send_message(msg)
-            
+    def send_email(self, to_email: str, subject: str, html_content: str) -> bool:
+        """Send email with HTML content over a one-off connection (blocking; request handlers use the outbox)"""
+        try:
+            with self.connect() as server:
+                server.send_message(self.build_message(to_email, subject, html_content))
             return True
         except Exception as e:
             print(f"Email sending failed: {e}")
@@ -330,16 +343,12 @@ class EmailService:
 
     def send_otp_email(self, to_email: str, otp: str, user_name: str = "User") -> bool:
         """Send OTP verification email"""
-        subject = "Verify Your Email - Oryntal AI"
-        html_content = self.create_otp_template(otp, user_name)
-        return self.send_email(to_email, subject, html_content)
+        return self.send_email(to_email, OTP_SUBJECT, self.create_otp_template(otp, user_name))
 
     def send_password_reset_email(self, to_email: str, reset_link: str, user_name: str = "User") -> bool:
         """Send password reset email"""
-        subject = "Reset Your Password - Oryntal AI"
-        html_content = self.create_password_reset_template(reset_link, user_name)
-        return self.send_email(to_email, subject, html_content)
+        return self.send_email(to_email, PASSWORD_RESET_SUBJECT, self.create_password_reset_template(reset_link, user_name))
 
 
-# Global email service instance
-email_service = EmailService()
+# Global email service instance, built on first use
+email_service = Lazy(EmailService)
@@ -0,0 +1,332 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.lazy import Lazy
+from app.services.ohlcv_store import ohlcv_store
+
+
+# Leaderboard orderings and platform filters precomputed on every rescore
+SORTS = ("credibility", "followers", "accuracy")
+PLATFORMS = ("twitter", "reddit")
+
+# Credibility = weighted hit rate, reach (followers) and engagement per post, each in [0, 1]
+CREDIBILITY_WEIGHTS = {"accuracy": 0.6, "reach": 0.25, "engagement": 0.15}
+
+# Weight of the newest post in the engagement-per-post moving average
+_ENGAGEMENT_ALPHA = 0.1
+
+# Until the leaderboard lists anyone, rescore this often (seconds) so it fills soon after boot
+_WARMUP_INTERVAL = 10.0
+
+# A directional call waiting for its price outcome: (author, symbol, +1/-1, ts)
+Call = Tuple["AuthorStats", str, int, float]
+
+
+class AuthorStats:
+	"""Rolling stats of one social author, updated in O(1) per post."""
+
+	__slots__ = (
+		"platform", "author_id", "name", "followers", "posts", "engagement",
+		"last_active", "hits", "resolved", "accuracy", "credibility",
+	)
+
+	def __init__(self, platform: str, author_id: str):
+		self.platform = platform
+		self.author_id = author_id
+		self.name = author_id
+		self.followers: Optional[int] = None
+		self.posts = 0
+		self.engagement = 0.0
+		self.last_active = 0.0
+		self.hits = 0
+		self.resolved = 0
+		self.accuracy = 0.5
+		self.credibility = 0.0
+
+
+class InfluencerEngine:
+	"""Per-author credibility from ingested social posts, served as a precomputed leaderboard.
+
+	The ingestion workers feed every scored post to `observe`, which updates
+	the author's reach, engagement and last activity and, for posts whose
+	sentiment clears `settings.influencer_call_threshold`, queues a
+	directional call - all O(1). A batch job (`rescore`, at startup and then
+	every `settings.influencer_rescore_interval` seconds) judges matured calls
+	against the daily closes in the OHLCV store, recomputes every score in one
+	vectorized pass and rebuilds the sorted indexes. `/influencers` pages
+	through the last built index with a slice, never sorting per request.
+
+	The background job takes a snapshot on the event loop (the author list
+	and the queued calls), computes on a worker thread, and applies the
+	result back on the loop, so the OHLCV reads and the per-author loops
+	never stall requests. Posts observed meanwhile are kept for the next run.
+	"""
+
+	def __init__(
+		self,
+		call_threshold: float,
+		horizon_days: int,
+		max_pending_calls: int,
+		accuracy_prior: float,
+		min_posts: int,
+		retention_days: int,
+		max_authors: int,
+		store=None,
+	):
+		self.call_threshold = call_threshold
+		self.horizon = horizon_days * 86400
+		self.max_pending_calls = max_pending_calls
+		self.accuracy_prior = accuracy_prior
+		self.min_posts = min_posts
+		self.retention = retention_days * 86400
+		self.max_authors = max_authors
+		self.store = store or ohlcv_store
+		self._authors: Dict[Tuple[str, str], AuthorStats] = {}
+		# Appended by `observe`, taken whole by each rescore
+		self._calls: List[Call] = []
+		self._rows: List[Dict[str, Any]] = []
+		self._index: Dict[Tuple[str, Optional[str]], List[int]] = {}
+		self.updated_at: Optional[str] = None
+		self.observed = 0
+		self.rescores = 0
+		self.last_rescore_ms: Optional[float] = None
+		self._task: Optional[asyncio.Task] = None
+
+	def observe(
+		self,
+		platform: str,
+		author_id: Optional[str],
+		symbol: str,
+		sentiment: Optional[float],
+		ts: float,
+		engagement: float = 0.0,
+		followers: Optional[int] = None,
+		name: Optional[str] = None,
+	) -> None:
+		"""Account one post by an author; a strong enough sentiment becomes a call on `symbol`."""
+		if not author_id or author_id == "[deleted]":
+			return
+		key = (platform, author_id)
+		author = self._authors.get(key)
+		if author is None:
+			author = self._authors[key] = AuthorStats(platform, author_id)
+		if name:
+			author.name = name
+		if followers is not None:
+			author.followers = followers
+		author.engagement = engagement if author.posts == 0 else author.engagement + _ENGAGEMENT_ALPHA * (engagement - author.engagement)
+		author.posts += 1
+		author.last_active = max(author.last_active, ts)
+		if sentiment is not None and abs(sentiment) >= self.call_threshold:
+			self._calls.append((author, symbol.upper(), 1 if sentiment > 0 else -1, ts))
+		self.observed += 1
+
+	def followers(self, platform: str, author_id: Optional[str]) -> Optional[int]:
+		author = self._authors.get((platform, author_id))
+		return author.followers if author is not None else None
+
+	def _resolve(self, calls: List[Call], now: float) -> List[Call]:
+		"""Judge every matured call (a hit when the close `horizon` later moved in the called direction).
+
+		Returns the calls still waiting, at most `max_pending_calls` (the newest) per author.
+		"""
+		by_symbol: Dict[str, List[Call]] = defaultdict(list)
+		for call in calls:
+			by_symbol[call[1]].append(call)
+		waiting: List[Call] = []
+		for symbol, symbol_calls in by_symbol.items():
+			bars = self.store.range(symbol)
+			ts, close = bars["ts"], bars["close"]
+			call_ts = np.fromiter((call[3] for call in symbol_calls), dtype=np.float64, count=len(symbol_calls))
+			directions = np.fromiter((call[2] for call in symbol_calls), dtype=np.int8, count=len(symbol_calls))
+			# Entry: the last close at or before the call; exit: the first close a horizon later
+			entry = np.searchsorted(ts, call_ts, side="right") - 1
+			later = np.searchsorted(ts, call_ts + self.horizon, side="left")
+			matured = later < len(ts)
+			judged = matured & (entry >= 0)
+			hits = np.zeros(len(symbol_calls), dtype=bool)
+			if judged.any():
+				moves = close[later[judged]] / close[entry[judged]] - 1
+				hits[judged] = np.sign(moves) == directions[judged]
+			for i, call in enumerate(symbol_calls):
+				if judged[i]:
+					call[0].resolved += 1
+					call[0].hits += int(hits[i])
+				elif not matured[i] and now - call[3] < self.retention:
+					waiting.append(call)
+		waiting.sort(key=lambda call: call[3])
+		kept: Dict[int, int] = defaultdict(int)
+		capped: Deque[Call] = deque()
+		for call in reversed(waiting):
+			if kept[id(call[0])] < self.max_pending_calls:
+				kept[id(call[0])] += 1
+				capped.appendleft(call)
+		return list(capped)
+
+	def _evictions(self, authors: List[AuthorStats], now: float) -> List[AuthorStats]:
+		cutoff = now - self.retention
+		evicted = [author for author in authors if author.last_active < cutoff]
+		remaining = len(authors) - len(evicted)
+		if remaining > self.max_authors:
+			ranked = sorted((a for a in authors if a.last_active >= cutoff), key=lambda a: (a.credibility, a.last_active))
+			evicted += ranked[:remaining - self.max_authors]
+		return evicted
+
+	def _compute(self, authors: List[AuthorStats], calls: List[Call], now: float) -> Dict[str, Any]:
+		"""The heavy part of a rescore, safe on a worker thread: it only reads and writes the snapshot."""
+		waiting = self._resolve(calls, now)
+		if authors:
+			hits = np.array([a.hits for a in authors], dtype=np.float64)
+			resolved = np.array([a.resolved for a in authors], dtype=np.float64)
+			followers = np.array([a.followers or 0 for a in authors], dtype=np.float64)
+			engagement = np.array([a.engagement for a in authors], dtype=np.float64)
+			accuracy = (hits + 0.5 * self.accuracy_prior) / (resolved + self.accuracy_prior)
+			# 10M followers and 10k interactions per post saturate their components
+			reach = np.minimum(1.0, np.log10(1 + followers) / 7)
+			engaged = np.minimum(1.0, np.log10(1 + np.maximum(engagement, 0)) / 4)
+			credibility = (
+				CREDIBILITY_WEIGHTS["accuracy"] * accuracy
+				+ CREDIBILITY_WEIGHTS["reach"] * reach
+				+ CREDIBILITY_WEIGHTS["engagement"] * engaged
+			)
+			for author, a, c in zip(authors, accuracy.tolist(), credibility.tolist()):
+				author.accuracy, author.credibility = a, c
+		# Remember when each evicted author was last seen: a post since then keeps it
+		evicted = {id(author): (author, author.last_active) for author in self._evictions(authors, now)}
+		rows, index = self._build([author for author in authors if id(author) not in evicted])
+		waiting = [call for call in waiting if id(call[0]) not in evicted]
+		return {"waiting": waiting, "evicted": list(evicted.values()), "rows": rows, "index": index}
+
+	def _apply(self, result: Dict[str, Any], now: float, started: float) -> int:
+		# Calls observed while computing were appended after the snapshot; they stay queued
+		self._calls = result["waiting"] + self._calls
+		for author, last_active in result["evicted"]:
+			key = (author.platform, author.author_id)
+			if self._authors.get(key) is author and author.last_active == last_active:
+				del self._authors[key]
+		# Swap both at once so a page is always cut from one consistent build
+		self._rows, self._index = result["rows"], result["index"]
+		self.rescores += 1
+		self.updated_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+		self.last_rescore_ms = round((time.perf_counter() - started) * 1000, 2)
+		return len(self._rows)
+
+	def _snapshot(self) -> Tuple[List[AuthorStats], List[Call]]:
+		calls, self._calls = self._calls, []
+		return list(self._authors.values()), calls
+
+	def rescore(self, now: Optional[float] = None) -> int:
+		"""Batch job: judge matured calls, recompute every score and rebuild the leaderboard indexes."""
+		started = time.perf_counter()
+		now = time.time() if now is None else now
+		return self._apply(self._compute(*self._snapshot(), now), now, started)
+
+	async def rescore_async(self, now: Optional[float] = None) -> int:
+		"""`rescore` with the computation on a worker thread; only the snapshot and the swap run on the loop."""
+		started = time.perf_counter()
+		now = time.time() if now is None else now
+		authors, calls = self._snapshot()
+		try:
+			result = await asyncio.to_thread(self._compute, authors, calls, now)
+		except BaseException:
+			# Nothing was judged; put the calls back for the next run
+			self._calls = calls + self._calls
+			raise
+		return self._apply(result, now, started)
+
+	def _build(self, authors: List[AuthorStats]) -> Tuple[List[Dict[str, Any]], Dict[Tuple[str, Optional[str]], List[int]]]:
+		listed = [author for author in authors if author.posts >= self.min_posts]
+		rows = [
+			{
+				"id": author.author_id,
+				"name": author.name,
+				"platform": author.platform,
+				"credibility": round(author.credibility, 4),
+				"followers": author.followers or 0,
+				"accuracy": round(author.accuracy, 4),
+				"lastActive": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(author.last_active)),
+				"posts": author.posts,
+				"calls": author.resolved,
+			}
+			for author in listed
+		]
+		index: Dict[Tuple[str, Optional[str]], List[int]] = {}
+		platforms = np.array([row["platform"] for row in rows], dtype=object)
+		for sort in SORTS:
+			values = np.array([row[sort] for row in rows], dtype=np.float64)
+			# Descending, ties keep the author's listing order
+			order = np.argsort(-values, kind="stable")
+			index[(sort, None)] = order.tolist()
+			for platform in PLATFORMS:
+				index[(sort, platform)] = order[platforms[order] == platform].tolist()
+		return rows, index
+
+	def leaderboard(
+		self,
+		sort: str = "credibility",
+		platform: Optional[str] = None,
+		page: int = 1,
+		page_size: int = 20,
+	) -> Dict[str, Any]:
+		"""One page of the leaderboard as of the last rescore."""
+		rows, index = self._rows, self._index
+		order = index.get((sort, platform), [])
+		start = max(0, (page - 1) * page_size)
+		return {
+			"items": [rows[i] for i in order[start:start + page_size]],
+			"total": len(order),
+			"page": page,
+			"page_size": page_size,
+			"updated_at": self.updated_at,
+		}
+
+	def stats(self) -> Dict[str, Any]:
+		return {
+			"running": self._task is not None,
+			"authors": len(self._authors),
+			"listed": len(self._rows),
+			"pending_calls": len(self._calls),
+			"observed": self.observed,
+			"rescores": self.rescores,
+			"last_rescore_ms": self.last_rescore_ms,
+			"updated_at": self.updated_at,
+		}
+
+	async def _run(self) -> None:
+		while True:
+			try:
+				await self.rescore_async()
+			except Exception as e:
+				print(f"Error rescoring influencers: {e}")
+			interval = settings.influencer_rescore_interval
+			await asyncio.sleep(interval if self._rows else min(interval, _WARMUP_INTERVAL))
+
+	async def start(self) -> None:
+		if self._task is None:
+			self._task = asyncio.create_task(self._run())
+
+	async def stop(self) -> None:
+		task, self._task = self._task, None
+		if task is not None:
+			task.cancel()
+			try:
+				await task
+			except asyncio.CancelledError:
+				pass
+
+
+# Global influencer engine instance, built on first use
+influencer_engine = Lazy(lambda: InfluencerEngine(
+	call_threshold=settings.influencer_call_threshold,
+	horizon_days=settings.influencer_call_horizon_days,
+	max_pending_calls=settings.influencer_max_pending_calls,
+	accuracy_prior=settings.influencer_accuracy_prior,
+	min_posts=settings.influencer_min_posts,
+	retention_days=settings.influencer_retention_days,
+	max_authors=settings.influencer_max_authors,
+))
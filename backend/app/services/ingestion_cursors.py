@@ -0,0 +1,47 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models.social import IngestionCursor
+
+
+_FIELDS = ("since_id", "next_token", "pending_since_id")
+
+
+class CursorStore:
+	"""Checkpoints for polling ingestion jobs, persisted so a restart resumes where it stopped."""
+
+	@staticmethod
+	def _get(source: str, key: str) -> Dict[str, Optional[str]]:
+		with SessionLocal() as db:
+			row = db.execute(
+				select(IngestionCursor).where(IngestionCursor.source == source, IngestionCursor.key == key)
+			).scalar_one_or_none()
+			return {field: getattr(row, field) if row else None for field in _FIELDS}
+
+	@staticmethod
+	def _save(source: str, key: str, fields: Dict[str, Any]) -> None:
+		with SessionLocal() as db:
+			db.merge(IngestionCursor(source=source, key=key, **fields))
+			db.commit()
+
+	@staticmethod
+	def _all(source: str) -> Dict[str, Dict[str, Optional[str]]]:
+		with SessionLocal() as db:
+			rows = db.execute(select(IngestionCursor).where(IngestionCursor.source == source)).scalars()
+			return {row.key: {field: getattr(row, field) for field in _FIELDS} for row in rows}
+
+	async def get(self, source: str, key: str) -> Dict[str, Optional[str]]:
+		return await asyncio.to_thread(self._get, source, key)
+
+	async def save(self, source: str, key: str, **fields: Optional[str]) -> None:
+		await asyncio.to_thread(self._save, source, key, {field: fields.get(field) for field in _FIELDS})
+
+	async def all(self, source: str) -> Dict[str, Dict[str, Optional[str]]]:
+		return await asyncio.to_thread(self._all, source)
+
+
+# Global ingestion cursor store instance
+cursor_store = CursorStore()
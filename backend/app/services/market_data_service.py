@@ -1,7 +1,36 @@
-import httpx
 import asyncio
+import calendar
+import time
 from typing import Dict, List, Optional, Any
 from app.core.config import settings
+from app.core.http import http_clients
+from app.core.lazy import Lazy
+from app.core.rate_limit import RateLimited, rate_limits, retry_after
+from app.core.singleflight import flight_key, singleflight
+from app.services.quote_cache import quote_cache
+from app.services.quote_providers import AlphaVantageQuotes, CoinGeckoQuotes, FmpQuotes, QuoteRouter
+from app.services.symbol_registry import symbol_registry
+
+
+def _daily_bars(prices: List[List[float]], volumes: List[List[float]]) -> List[Dict[str, Any]]:
+    """Fold CoinGecko [ms, value] samples into UTC-day bars.
+
+    Open, high, low and close come from the day's price samples. Volume is the
+    last rolling 24h total of the day, or NaN if there is none.
+    """
+    daily: Dict[int, Dict[str, Any]] = {}
+    for ts_ms, price in sorted(prices):
+        ts = int(ts_ms // 1000) // 86400 * 86400
+        bar = daily.get(ts)
+        if bar is None:
+            daily[ts] = {"ts": ts, "open": price, "high": price, "low": price, "close": price, "volume": float("nan")}
+        else:
+            bar.update(high=max(bar["high"], price), low=min(bar["low"], price), close=price)
+    for ts_ms, volume in sorted(volumes):
+        bar = daily.get(int(ts_ms // 1000) // 86400 * 86400)
+        if bar is not None:
+            bar["volume"] = volume
+    return [daily[ts] for ts in sorted(daily)]
 
 
 class MarketDataService:
@@ -9,90 +38,188 @@ class MarketDataService:
         self.alpha_vantage_key = settings.alpha_vantage_api_key
         self.fmp_key = settings.financial_modeling_prep_api_key
         self.coingecko_key = settings.coingecko_api_key
+        # Per-provider cap on concurrent upstream requests, for the loop in _slots_loop
+        self._provider_slots: Dict[str, asyncio.Semaphore] = {}
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        # API key per provider; rate limit buckets are kept per key
+        self._keys = {"alpha_vantage": self.alpha_vantage_key, "fmp": self.fmp_key, "coingecko": self.coingecko_key}
+        self._background: set = set()
+        # Quote sources per asset type, routed by rolling health with hedged requests
+        self.quote_router = QuoteRouter(
+            [
+                FmpQuotes(self._get_json, self.fmp_key),
+                AlphaVantageQuotes(self._get_json, self.alpha_vantage_key),
+                CoinGeckoQuotes(self._get_json, self.coingecko_key),
+                FmpQuotes(self._get_json, self.fmp_key, asset_type="crypto"),
+            ],
+            order=settings.quote_providers,
+        )
+
+    def _slots(self, provider: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            # A semaphore binds to the loop it first waits on; each app lifetime (or test loop) gets its own
+            self._slots_loop, self._provider_slots = loop, {}
+        slots = self._provider_slots.get(provider)
+        if slots is None:
+            limit = settings.provider_concurrency.get(provider, settings.provider_concurrency_default)
+            slots = self._provider_slots[provider] = asyncio.Semaphore(limit)
+        return slots
+
+    async def _get_json(
+        self,
+        provider: str,
+        url: str,
+        params: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        """GET a provider endpoint within its rate limit, coalescing identical concurrent requests.
+
+        Throttle responses (429, or Alpha Vantage's "Note"/"Information" payload)
+        back the provider's bucket off and raise `RateLimited`.
+        """
+        key = self._keys.get(provider, "")
+
+        async def fetch() -> Any:
+            await rate_limits.acquire(provider, key)
+            async with self._slots(provider):
+                response = await http_clients.get(url).get(url, params=params, headers=headers)
+            if response.status_code == 429:
+                delay = retry_after(response.headers)
+                await rate_limits.throttled(provider, key, delay)
+                raise RateLimited(provider, delay)
+            data = response.json()
+            if provider == "alpha_vantage" and isinstance(data, dict) and ("Note" in data or "Information" in data):
+                await rate_limits.throttled(provider, key)
+                raise RateLimited(provider, detail=data.get("Note") or data.get("Information"))
+            return data
+
+        return await singleflight.do(flight_key(provider, url, params), fetch)
 
     async def get_stock_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Get real-time stock quote using Alpha Vantage"""
+        """Get real-time stock quote from the healthiest stock provider (cached)"""
         try:
-            async with httpx.AsyncClient() as client:
-                url = "https://www.alphavantage.co/query"
-                params = {
-                    "function": "GLOBAL_QUOTE",
-                    "symbol": symbol,
-                    "apikey": self.alpha_vantage_key
-                }
-                response = await client.get(url, params=params)
-                data = response.json()
-                
-                if "Global Quote" in data:
-                    quote = data["Global Quote"]
-                    return {
-                        "symbol": quote.get("01. symbol"),
-                        "price": float(quote.get("05. price", 0)),
-                        "change": float(quote.get("09. change", 0)),
-                        "change_percent": quote.get("10. change percent", "0%").replace("%", ""),
-                        "volume": int(quote.get("06. volume", 0)),
-                        "high": float(quote.get("03. high", 0)),
-                        "low": float(quote.get("04. low", 0)),
-                        "open": float(quote.get("02. open", 0)),
-                        "previous_close": float(quote.get("08. previous close", 0)),
-                        "timestamp": quote.get("07. latest trading day")
-                    }
-                return None
+            return await quote_cache.get_or_fetch(
+                f"stock:{symbol.upper()}",
+                lambda: self._fetch_stock_quote(symbol),
+                ttl=settings.quote_cache_stock_ttl,
+            )
+        except RateLimited:
+            raise
         except Exception as e:
             print(f"Error fetching stock quote for {symbol}: {e}")
             return None
 
+    async def _fetch_stock_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return (await self.quote_router.fetch("stock", [symbol.upper()])).get(symbol.upper())
+
     async def get_crypto_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Get real-time crypto quote using CoinGecko"""
+        """Get real-time crypto quote from the healthiest crypto provider (cached)"""
         try:
-            # Map common symbols to CoinGecko IDs
-            crypto_map = {
-                "BTC": "bitcoin",
-                "ETH": "ethereum",
-                "SOL": "solana",
-                "ADA": "cardano",
-                "DOT": "polkadot",
-                "MATIC": "matic-network",
-                "AVAX": "avalanche-2",
-                "LINK": "chainlink",
-                "UNI": "uniswap",
-                "ATOM": "cosmos"
-            }
-            
-            crypto_id = crypto_map.get(symbol.upper(), symbol.lower())
-            
-            async with httpx.AsyncClient() as client:
-                url = f"https://api.coingecko.com/api/v3/simple/price"
-                params = {
-                    "ids": crypto_id,
-                    "vs_currencies": "usd",
-                    "include_24hr_change": "true",
-                    "include_24hr_vol": "true",
-                    "include_market_cap": "true"
-                }
-                
-                headers = {}
-                if self.coingecko_key:
-                    headers["x-cg-demo-api-key"] = self.coingecko_key
-                
-                response = await client.get(url, params=params, headers=headers)
-                data = response.json()
-                
-                if crypto_id in data:
-                    crypto_data = data[crypto_id]
-                    return {
-                        "symbol": symbol.upper(),
-                        "price": crypto_data.get("usd", 0),
-                        "change_24h": crypto_data.get("usd_24h_change", 0),
-                        "volume_24h": crypto_data.get("usd_24h_vol", 0),
-                        "market_cap": crypto_data.get("usd_market_cap", 0),
-                        "timestamp": "24h"
-                    }
-                return None
+            return await quote_cache.get_or_fetch(
+                f"crypto:{symbol.upper()}",
+                lambda: self._fetch_crypto_quote(symbol),
+                ttl=settings.quote_cache_crypto_ttl,
+            )
+        except RateLimited:
+            raise
         except Exception as e:
             print(f"Error fetching crypto quote for {symbol}: {e}")
             return None
 
+    async def _fetch_crypto_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return (await self.quote_router.fetch("crypto", [symbol.upper()])).get(symbol.upper())
+
+    async def _fetch_stock_quotes(self, symbols: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        return await self.quote_router.fetch("stock", symbols)
+
+    async def _fetch_crypto_quotes(self, symbols: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        return await self.quote_router.fetch("crypto", symbols)
+
+    async def get_quotes(
+        self,
+        symbols: List[str],
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Batch quotes: group symbols by provider and fetch each group in batch calls.
+
+        Groups are split into chunks of `settings.quote_batch_size` symbols that
+        run concurrently under each provider's concurrency cap. Returns
+        {SYMBOL: quote or None}; cached symbols never reach the provider and
+        quotes served from the stale window carry `"stale": True`. With a
+        `deadline` (seconds), chunks that have not answered in time are left out
+        of the result and keep running in the background to warm the cache.
+        """
+        groups: Dict[str, List[str]] = {"stock": [], "crypto": []}
+        for symbol in dict.fromkeys(s.upper() for s in symbols if s):
+            groups[symbol_registry.asset_type(symbol)].append(symbol)
+
+        async def fetch_chunk(kind: str, chunk: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+            fetch_many = self._fetch_crypto_quotes if kind == "crypto" else self._fetch_stock_quotes
+            ttl = settings.quote_cache_crypto_ttl if kind == "crypto" else settings.quote_cache_stock_ttl
+            try:
+                return await quote_cache.get_many_or_fetch(kind, chunk, fetch_many, ttl=ttl)
+            except Exception as e:
+                print(f"Error fetching {kind} quotes for {','.join(chunk)}: {e}")
+                return {symbol: None for symbol in chunk}
+
+        size = max(1, settings.quote_batch_size)
+        tasks = [
+            asyncio.ensure_future(fetch_chunk(kind, group[i:i + size]))
+            for kind, group in groups.items()
+            for i in range(0, len(group), size)
+        ]
+        if not tasks:
+            return {}
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for task in done:
+            results.update(task.result())
+        return results
+
+    async def get_daily_bars(self, symbol: str, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Daily OHLCV bars (oldest first, `ts` = UTC midnight epoch seconds) from FMP or CoinGecko.
+
+        With `since`, only bars from that day on are requested. CoinGecko's
+        /ohlc sizes its candles by the range (4-day candles beyond 30 days), so
+        crypto bars are built from the /market_chart/range price and volume
+        series instead, bucketed into UTC days. CoinGecko samples that series
+        hourly for ranges up to 90 days and daily beyond, so a full backfill
+        has one price per day as open, high, low and close; the incremental
+        runs that follow rebuild the latest day from hourly samples.
+        """
+        symbol = symbol.upper()
+        days = settings.ohlcv_history_days
+        if since is not None:
+            days = max(1, min(days, int((time.time() - since) // 86400) + 1))
+        if symbol_registry.is_crypto(symbol):
+            url = f"https://api.coingecko.com/api/v3/coins/{symbol_registry.coingecko_id(symbol)}/market_chart/range"
+            now = int(time.time())
+            params = {"vs_currency": "usd", "from": (now - days * 86400) // 86400 * 86400, "to": now}
+            headers = {"x-cg-demo-api-key": self.coingecko_key} if self.coingecko_key else {}
+            data = await self._get_json("coingecko", url, params, headers=headers)
+            bars = _daily_bars(data.get("prices") or [], data.get("total_volumes") or []) if data else []
+        else:
+            url = f"https://financialmodelingprep.com/api/v3/historical-price-full/{symbol}"
+            start = time.strftime("%Y-%m-%d", time.gmtime(time.time() - days * 86400))
+            data = await self._get_json("fmp", url, {"from": start, "apikey": self.fmp_key})
+            bars = [
+                {
+                    "ts": calendar.timegm(time.strptime(item["date"], "%Y-%m-%d")),
+                    "open": item.get("open"),
+                    "high": item.get("high"),
+                    "low": item.get("low"),
+                    "close": item.get("close"),
+                    "volume": item.get("volume"),
+                }
+                for item in reversed((data or {}).get("historical", []))
+            ]
+        return [bar for bar in bars if since is None or bar["ts"] >= since]
+
     async def get_market_overview(self) -> Dict[str, Any]:
         """Get market overview data"""
         try:
@@ -100,16 +227,12 @@ class MarketDataService:
             symbols = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA", "META", "NFLX"]
             crypto_symbols = ["BTC", "ETH", "SOL", "ADA"]
             
-            # Fetch stock data
-            stock_tasks = [self.get_stock_quote(symbol) for symbol in symbols]
-            crypto_tasks = [self.get_crypto_quote(symbol) for symbol in crypto_symbols]
-            
-            stock_results = await asyncio.gather(*stock_tasks, return_exceptions=True)
-            crypto_results = await asyncio.gather(*crypto_tasks, return_exceptions=True)
-            
-            # Filter out None results and exceptions
-            stocks = [result for result in stock_results if isinstance(result, dict)]
-            cryptos = [result for result in crypto_results if isinstance(result, dict)]
+            # One batch call per provider
+            quotes = await self.get_quotes(symbols + crypto_symbols)
+
+            # Filter out missing symbols
+            stocks = [quotes[symbol] for symbol in symbols if quotes.get(symbol)]
+            cryptos = [quotes[symbol] for symbol in crypto_symbols if quotes.get(symbol)]
             
             return {
                 "stocks": stocks,
@@ -125,23 +248,21 @@ class MarketDataService:
     async def get_trending_stocks(self) -> List[Dict[str, Any]]:
         """Get trending stocks using Financial Modeling Prep"""
         try:
-            async with httpx.AsyncClient() as client:
-                url = "https://financialmodelingprep.com/api/v3/stock/actives"
-                params = {"apikey": self.fmp_key}
-                response = await client.get(url, params=params)
-                data = response.json()
+            url = "https://financialmodelingprep.com/api/v3/stock/actives"
+            params = {"apikey": self.fmp_key}
+            data = await self._get_json("fmp", url, params)
                 
-                trending = []
-                for stock in data[:10]:  # Top 10
-                    trending.append({
-                        "symbol": stock.get("ticker"),
-                        "price": stock.get("price", 0),
-                        "change": stock.get("changes", 0),
-                        "change_percent": stock.get("changesPercentage", "0%").replace("%", ""),
-                        "volume": stock.get("volume", 0),
-                        "market_cap": stock.get("marketCap", 0)
-                    })
-                return trending
+            trending = []
+            for stock in data[:10]:  # Top 10
+                trending.append({
+                    "symbol": stock.get("ticker"),
+                    "price": stock.get("price", 0),
+                    "change": stock.get("changes", 0),
+                    "change_percent": stock.get("changesPercentage", "0%").replace("%", ""),
+                    "volume": stock.get("volume", 0),
+                    "market_cap": stock.get("marketCap", 0)
+                })
+            return trending
         except Exception as e:
             print(f"Error fetching trending stocks: {e}")
             return []
@@ -149,36 +270,34 @@ class MarketDataService:
     async def get_trending_crypto(self) -> List[Dict[str, Any]]:
         """Get trending cryptocurrencies using CoinGecko"""
         try:
-            async with httpx.AsyncClient() as client:
-                url = "https://api.coingecko.com/api/v3/coins/markets"
-                params = {
-                    "vs_currency": "usd",
-                    "order": "market_cap_desc",
-                    "per_page": 10,
-                    "page": 1,
-                    "sparkline": False,
-                    "price_change_percentage": "24h"
-                }
+            url = "https://api.coingecko.com/api/v3/coins/markets"
+            params = {
+                "vs_currency": "usd",
+                "order": "market_cap_desc",
+                "per_page": 10,
+                "page": 1,
+                "sparkline": False,
+                "price_change_percentage": "24h"
+            }
                 
-                headers = {}
-                if self.coingecko_key:
-                    headers["x-cg-demo-api-key"] = self.coingecko_key
+            headers = {}
+            if self.coingecko_key:
+                headers["x-cg-demo-api-key"] = self.coingecko_key
                 
-                response = await client.get(url, params=params, headers=headers)
-                data = response.json()
+            data = await self._get_json("coingecko", url, params, headers=headers)
                 
-                trending = []
-                for crypto in data:
-                    trending.append({
-                        "symbol": crypto.get("symbol", "").upper(),
-                        "name": crypto.get("name"),
-                        "price": crypto.get("current_price", 0),
-                        "change_24h": crypto.get("price_change_percentage_24h", 0),
-                        "market_cap": crypto.get("market_cap", 0),
-                        "volume_24h": crypto.get("total_volume", 0),
-                        "image": crypto.get("image")
-                    })
-                return trending
+            trending = []
+            for crypto in data:
+                trending.append({
+                    "symbol": crypto.get("symbol", "").upper(),
+                    "name": crypto.get("name"),
+                    "price": crypto.get("current_price", 0),
+                    "change_24h": crypto.get("price_change_percentage_24h", 0),
+                    "market_cap": crypto.get("market_cap", 0),
+                    "volume_24h": crypto.get("total_volume", 0),
+                    "image": crypto.get("image")
+                })
+            return trending
         except Exception as e:
             print(f"Error fetching trending crypto: {e}")
             return []
@@ -186,32 +305,32 @@ class MarketDataService:
     async def get_stocks(self, q: Optional[str] = None, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
         """Paginated stocks list using FMP actives/gainers/losers or search."""
         try:
-            async with httpx.AsyncClient() as client:
-                if q:
-                    url = "https://financialmodelingprep.com/api/v3/search"
-                    params = {"query": q, "limit": page_size, "exchange": "NASDAQ", "apikey": self.fmp_key}
-                    response = await client.get(url, params=params)
-                    data = response.json()
-                    # For each match, fetch quote
-                    symbols = [item.get("symbol") for item in data]
-                else:
-                    url = "https://financialmodelingprep.com/api/v3/stock/actives"
-                    params = {"apikey": self.fmp_key}
-                    response = await client.get(url, params=params)
-                    data = response.json()
-                    symbols = [item.get("ticker") for item in data]
-
-                # Pagination over symbols
-                start = max(0, (page - 1) * page_size)
-                end = start + page_size
-                page_symbols = [s for s in symbols if s][start:end]
-
-                results: List[Dict[str, Any]] = []
-                for sym in page_symbols:
-                    quote = await self.get_stock_quote(sym)
-                    if quote:
-                        results.append(quote)
-                return {"items": results, "total": len(symbols), "page": page, "page_size": page_size}
+            if q:
+                url = "https://financialmodelingprep.com/api/v3/search"
+                params = {"query": q, "limit": page_size, "exchange": "NASDAQ", "apikey": self.fmp_key}
+                data = await self._get_json("fmp", url, params)
+                # For each match, fetch quote
+                symbols = [item.get("symbol") for item in data]
+            else:
+                url = "https://financialmodelingprep.com/api/v3/stock/actives"
+                params = {"apikey": self.fmp_key}
+                data = await self._get_json("fmp", url, params)
+                symbols = [item.get("ticker") for item in data]
+
+            # Pagination over symbols
+            start = max(0, (page - 1) * page_size)
+            end = start + page_size
+            page_symbols = [s for s in symbols if s][start:end]
+
+            # Concurrent, bounded fetch; quotes that miss the deadline come back as "missing"
+            quotes = await self.get_quotes(page_symbols, deadline=settings.quote_deadline_seconds)
+            results: List[Dict[str, Any]] = []
+            for sym in page_symbols:
+                if sym.upper() not in quotes:
+                    results.append({"symbol": sym.upper(), "missing": True})
+                elif quotes[sym.upper()]:
+                    results.append(quotes[sym.upper()])
+            return {"items": results, "total": len(symbols), "page": page, "page_size": page_size}
         except Exception as e:
             print(f"Error fetching stocks: {e}")
             return {"items": [], "total": 0, "page": page, "page_size": page_size}
@@ -219,34 +338,32 @@ class MarketDataService:
     async def get_crypto(self, q: Optional[str] = None, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
         """Paginated crypto list using CoinGecko markets with search filter."""
         try:
-            async with httpx.AsyncClient() as client:
-                per_page = min(250, page_size)
-                url = "https://api.coingecko.com/api/v3/coins/markets"
-                params = {
-                    "vs_currency": "usd",
-                    "order": "market_cap_desc",
-                    "per_page": per_page,
-                    "page": max(1, page),
-                    "sparkline": False,
-                    "price_change_percentage": "24h"
-                }
-                headers = {}
-                if self.coingecko_key:
-                    headers["x-cg-demo-api-key"] = self.coingecko_key
-                response = await client.get(url, params=params, headers=headers)
-                data = response.json()
-                if q:
-                    data = [d for d in data if q.lower() in (d.get("symbol", "") + d.get("name", "")).lower()]
-                items = [{
-                    "symbol": d.get("symbol", "").upper(),
-                    "name": d.get("name"),
-                    "price": d.get("current_price", 0),
-                    "change_24h": d.get("price_change_percentage_24h", 0),
-                    "market_cap": d.get("market_cap", 0),
-                    "volume_24h": d.get("total_volume", 0),
-                    "image": d.get("image")
-                } for d in data]
-                return {"items": items, "total": len(items), "page": page, "page_size": page_size}
+            per_page = min(250, page_size)
+            url = "https://api.coingecko.com/api/v3/coins/markets"
+            params = {
+                "vs_currency": "usd",
+                "order": "market_cap_desc",
+                "per_page": per_page,
+                "page": max(1, page),
+                "sparkline": False,
+                "price_change_percentage": "24h"
+            }
+            headers = {}
+            if self.coingecko_key:
+                headers["x-cg-demo-api-key"] = self.coingecko_key
+            data = await self._get_json("coingecko", url, params, headers=headers)
+            if q:
+                data = [d for d in data if q.lower() in (d.get("symbol", "") + d.get("name", "")).lower()]
+            items = [{
+                "symbol": d.get("symbol", "").upper(),
+                "name": d.get("name"),
+                "price": d.get("current_price", 0),
+                "change_24h": d.get("price_change_percentage_24h", 0),
+                "market_cap": d.get("market_cap", 0),
+                "volume_24h": d.get("total_volume", 0),
+                "image": d.get("image")
+            } for d in data]
+            return {"items": items, "total": len(items), "page": page, "page_size": page_size}
         except Exception as e:
             print(f"Error fetching crypto: {e}")
             return {"items": [], "total": 0, "page": page, "page_size": page_size}
@@ -254,32 +371,30 @@ class MarketDataService:
     async def get_company_profile(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get company profile using Financial Modeling Prep"""
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"https://financialmodelingprep.com/api/v3/profile/{symbol}"
-                params = {"apikey": self.fmp_key}
-                response = await client.get(url, params=params)
-                data = response.json()
+            url = f"https://financialmodelingprep.com/api/v3/profile/{symbol}"
+            params = {"apikey": self.fmp_key}
+            data = await self._get_json("fmp", url, params)
                 
-                if data and len(data) > 0:
-                    profile = data[0]
-                    return {
-                        "symbol": profile.get("symbol"),
-                        "company_name": profile.get("companyName"),
-                        "description": profile.get("description"),
-                        "sector": profile.get("sector"),
-                        "industry": profile.get("industry"),
-                        "website": profile.get("website"),
-                        "logo": profile.get("image"),
-                        "market_cap": profile.get("mktCap"),
-                        "employees": profile.get("fullTimeEmployees"),
-                        "ceo": profile.get("ceo"),
-                        "country": profile.get("country")
-                    }
-                return None
+            if data and len(data) > 0:
+                profile = data[0]
+                return {
+                    "symbol": profile.get("symbol"),
+                    "company_name": profile.get("companyName"),
+                    "description": profile.get("description"),
+                    "sector": profile.get("sector"),
+                    "industry": profile.get("industry"),
+                    "website": profile.get("website"),
+                    "logo": profile.get("image"),
+                    "market_cap": profile.get("mktCap"),
+                    "employees": profile.get("fullTimeEmployees"),
+                    "ceo": profile.get("ceo"),
+                    "country": profile.get("country")
+                }
+            return None
         except Exception as e:
             print(f"Error fetching company profile for {symbol}: {e}")
             return None
 
 
-# Global market data service instance
-market_data_service = MarketDataService()
+# Global market data service instance, built on first use
+market_data_service = Lazy(MarketDataService)
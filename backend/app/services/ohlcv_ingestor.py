@@ -0,0 +1,83 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.rate_limit import BACKGROUND, priority
+from app.services.market_data_service import market_data_service
+from app.services.ohlcv_store import ohlcv_store
+
+
+class OhlcvIngestor:
+	"""Background job that keeps daily OHLCV history current in the OHLCV store.
+
+	The first run backfills `settings.ohlcv_history_days`; later runs request
+	bars from the last stored day on, which refreshes today's bar and appends
+	new ones.
+	"""
+
+	def __init__(self, symbols: Optional[List[str]] = None):
+		self.symbols = symbols
+		self.last_run: Optional[str] = None
+		self.errors: Dict[str, str] = {}
+		self._task: Optional[asyncio.Task] = None
+
+	@property
+	def universe(self) -> List[str]:
+		symbols = self.symbols or settings.ohlcv_ingest_symbols or settings.alerts_watchlist
+		return list(dict.fromkeys(s.upper() for s in symbols))
+
+	async def ingest_symbol(self, sym: str) -> int:
+		since = await asyncio.to_thread(ohlcv_store.last_ts, sym)
+		bars = await market_data_service.get_daily_bars(sym, since=since)
+		return await asyncio.to_thread(ohlcv_store.append, sym, bars)
+
+	async def run_once(self) -> Dict[str, int]:
+		async def one(sym: str) -> int:
+			try:
+				written = await self.ingest_symbol(sym)
+				self.errors.pop(sym, None)
+				return written
+			except Exception as e:
+				print(f"Error ingesting OHLCV bars for {sym}: {e}")
+				self.errors[sym] = str(e)
+				return 0
+
+		# Provider concurrency caps in market_data_service bound the fan-out
+		symbols = self.universe
+		counts = dict(zip(symbols, await asyncio.gather(*(one(sym) for sym in symbols))))
+		self.last_run = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+		return counts
+
+	def stats(self) -> Dict[str, Any]:
+		return {
+			"running": self._task is not None,
+			"symbols": self.universe,
+			"last_run": self.last_run,
+			"errors": self.errors,
+			"stored": {sym: ohlcv_store.last_ts(sym) for sym in ohlcv_store.symbols()},
+		}
+
+	async def _run(self) -> None:
+		# Queue behind interactive requests for provider rate limit tokens
+		with priority(BACKGROUND):
+			while True:
+				await self.run_once()
+				await asyncio.sleep(settings.ohlcv_ingest_interval)
+
+	async def start(self) -> None:
+		if self._task is None:
+			self._task = asyncio.create_task(self._run())
+
+	async def stop(self) -> None:
+		task, self._task = self._task, None
+		if task is not None:
+			task.cancel()
+			try:
+				await task
+			except asyncio.CancelledError:
+				pass
+
+
+# Global OHLCV ingestion job instance
+ohlcv_ingestor = OhlcvIngestor()
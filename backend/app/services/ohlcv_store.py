@@ -0,0 +1,158 @@
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.lazy import Lazy
+
+
+# Column name -> dtype; one append-only file per column
+COLUMNS: Dict[str, np.dtype] = {
+	"ts": np.dtype("<i8"),
+	"open": np.dtype("<f8"),
+	"high": np.dtype("<f8"),
+	"low": np.dtype("<f8"),
+	"close": np.dtype("<f8"),
+	"volume": np.dtype("<f8"),
+}
+
+
+class _Series:
+	"""Memory maps of one symbol's column files, remapped when the files grow."""
+
+	def __init__(self, path: str):
+		self.path = path
+		self.lock = threading.Lock()
+		self.length = 0
+		self.columns: Dict[str, np.ndarray] = {}
+
+	def file(self, column: str) -> str:
+		return os.path.join(self.path, f"{column}.bin")
+
+	def refresh(self) -> None:
+		ts_file = self.file("ts")
+		length = os.path.getsize(ts_file) // COLUMNS["ts"].itemsize if os.path.exists(ts_file) else 0
+		if length == self.length and self.columns:
+			return
+		if length == 0:
+			self.columns = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+		else:
+			self.columns = {
+				name: np.memmap(self.file(name), dtype=dtype, mode="r", shape=(length,))
+				for name, dtype in COLUMNS.items()
+			}
+		self.length = length
+
+
+class OhlcvStore:
+	"""Compact on-disk store of daily OHLCV bars, one directory per symbol.
+
+	Each column is an append-only little-endian file that is memory-mapped for
+	reads, so a range query is a binary search on the timestamp column and a
+	slice of each column - views into the page cache, no copy and no parsing.
+	Bars are kept in timestamp order: appends skip bars older than the last
+	stored one and overwrite the last bar in place when it is re-sent (today's
+	bar keeps changing until the close).
+	"""
+
+	def __init__(self, root: str):
+		self.root = root
+		self._series: Dict[str, _Series] = {}
+		self._lock = threading.Lock()
+
+	def _get(self, symbol: str) -> _Series:
+		symbol = symbol.upper()
+		with self._lock:
+			series = self._series.get(symbol)
+			if series is None:
+				series = self._series[symbol] = _Series(os.path.join(self.root, symbol))
+		return series
+
+	def symbols(self) -> List[str]:
+		if not os.path.isdir(self.root):
+			return []
+		return sorted(name for name in os.listdir(self.root) if os.path.exists(os.path.join(self.root, name, "ts.bin")))
+
+	def last_ts(self, symbol: str) -> Optional[int]:
+		ts = self.range(symbol)["ts"]
+		return int(ts[-1]) if len(ts) else None
+
+	def append(self, symbol: str, bars: Iterable[Dict[str, Any]]) -> int:
+		"""Append bars (dicts with the COLUMNS keys); returns how many rows were written or updated."""
+		rows = sorted((bar for bar in bars if bar.get("ts") is not None), key=lambda bar: bar["ts"])
+		if not rows:
+			return 0
+		series = self._get(symbol)
+		with series.lock:
+			series.refresh()
+			last = int(series.columns["ts"][-1]) if series.length else None
+			replace = None
+			if last is not None:
+				replace = next((bar for bar in reversed(rows) if bar["ts"] == last), None)
+				rows = [bar for bar in rows if bar["ts"] > last]
+			# Collapse duplicates inside the batch, keeping the latest version of each bar
+			rows = list({bar["ts"]: bar for bar in rows}.values())
+			os.makedirs(series.path, exist_ok=True)
+			# The ts column is written last and defines the length, so a crash mid-append
+			# only leaves orphan rows in the other columns, trimmed by the next append
+			for name in (*[c for c in COLUMNS if c != "ts"], "ts"):
+				dtype = COLUMNS[name]
+				size = series.length * dtype.itemsize
+				if os.path.exists(series.file(name)) and os.path.getsize(series.file(name)) > size:
+					os.truncate(series.file(name), size)
+				if replace is not None:
+					with open(series.file(name), "r+b") as f:
+						f.seek(-dtype.itemsize, os.SEEK_END)
+						f.write(np.array([self._value(replace, name)], dtype=dtype).tobytes())
+				if rows:
+					column = np.array([self._value(bar, name) for bar in rows], dtype=dtype)
+					with open(series.file(name), "ab") as f:
+						f.write(column.tobytes())
+			series.refresh()
+		return len(rows) + (replace is not None)
+
+	@staticmethod
+	def _value(bar: Dict[str, Any], name: str) -> Any:
+		value = bar.get(name)
+		if name == "ts":
+			return int(value)
+		return float("nan") if value is None else float(value)
+
+	def range(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, np.ndarray]:
+		"""Columns for bars with start <= ts <= end, as read-only views into the mapped files."""
+		series = self._get(symbol)
+		with series.lock:
+			series.refresh()
+			columns = series.columns
+		ts = columns["ts"]
+		lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+		hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="right"))
+		return {name: column[lo:hi] for name, column in columns.items()}
+
+	def tail(self, symbol: str, count: int) -> Dict[str, np.ndarray]:
+		"""The last `count` bars, as views."""
+		columns = self.range(symbol)
+		return {name: column[-count:] if count else column[:0] for name, column in columns.items()}
+
+	def features(self, symbol: str) -> Dict[str, Optional[float]]:
+		"""Multi-day price features from the last 21 bars: 5d/20d momentum, 20d volatility and volume ratio."""
+		bars = self.tail(symbol, 21)
+		close, volume = bars["close"], bars["volume"]
+		features: Dict[str, Optional[float]] = {"momentum_5d": None, "momentum_20d": None, "volatility_20d": None, "volume_ratio": None}
+		if len(close) >= 6:
+			features["momentum_5d"] = float(close[-1] / close[-6] - 1)
+		if len(close) >= 21:
+			features["momentum_20d"] = float(close[-1] / close[0] - 1)
+			features["volatility_20d"] = float(np.std(np.diff(np.log(close))))
+			history = volume[:-1]
+			if np.isfinite(history).any() and np.isfinite(volume[-1]):
+				average = float(np.nanmean(history))
+				if average > 0:
+					features["volume_ratio"] = float(volume[-1] / average)
+		return features
+
+
+# Global OHLCV store instance, built on first use
+ohlcv_store = Lazy(lambda: OhlcvStore(settings.ohlcv_data_dir))
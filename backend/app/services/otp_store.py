@@ -1,30 +1,232 @@
+import heapq
+import hmac
 import time
-from typing import Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.lazy import Lazy
+
+
+class _ExpiringMap:
+	"""Key -> value with a deadline per key, capped at `max_entries`.
+
+	A min-heap of (deadline, key) is swept on every write, so expired entries
+	are dropped even for keys that never come back, in O(log n) per entry.
+	Past `max_entries` the entries closest to expiry are evicted first.
+	"""
+
+	def __init__(self, max_entries: int):
+		self.max_entries = max_entries
+		self._entries: Dict[str, Tuple[Any, float]] = {}
+		self._expiry: List[Tuple[float, str]] = []
+		self.expired = 0
+		self.evicted = 0
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def put(self, key: str, value: Any, deadline: float) -> None:
+		# Make room before inserting, so the new entry is never the one evicted
+		self.sweep(room=0 if key in self._entries else 1)
+		self._entries[key] = (value, deadline)
+		heapq.heappush(self._expiry, (deadline, key))
+
+	def get(self, key: str) -> Optional[Tuple[Any, float]]:
+		"""(value, deadline), or None if the key is missing or expired."""
+		entry = self._entries.get(key)
+		if entry is None:
+			return None
+		if time.monotonic() >= entry[1]:
+			del self._entries[key]
+			self.expired += 1
+			return None
+		return entry
+
+	def pop(self, key: str) -> None:
+		self._entries.pop(key, None)
+
+	def sweep(self, room: int = 0) -> None:
+		"""Drop expired entries, then the soonest-expiring ones until `room` more fit under `max_entries`."""
+		now = time.monotonic()
+		while self._expiry and (self._expiry[0][0] <= now or len(self._entries) > self.max_entries - room):
+			deadline, key = heapq.heappop(self._expiry)
+			entry = self._entries.get(key)
+			# Heap entries outlived by a newer deadline for the same key are skipped
+			if entry is not None and entry[1] == deadline:
+				del self._entries[key]
+				if deadline <= now:
+					self.expired += 1
+				else:
+					self.evicted += 1
+		# Re-issued codes leave stale heap entries behind; rebuild once they dominate
+		if len(self._expiry) > 2 * len(self._entries) + 64:
+			self._expiry = [(deadline, key) for key, (_, deadline) in self._entries.items()]
+			heapq.heapify(self._expiry)
 
 
 class InMemoryOtpStore:
-	def __init__(self):
-		self._store: Dict[str, Tuple[str, float]] = {}
+	"""Per-process OTP store with expiry sweeping, size caps and issuance limits.
 
-	def set_code(self, email: str, code: str, ttl_seconds: int = 600) -> None:
-		expires_at = time.time() + ttl_seconds
-		self._store[email.lower()] = (code, expires_at)
+	Codes and issuance counters are kept in two `_ExpiringMap`s with their
+	own caps (`max_entries`, `max_counters`), so a flood of codes for junk
+	emails cannot evict another user's counters and reset their limits. The
+	IP counter is checked first and an IP over its limit opens no further
+	email counters. Use the Redis backend when running several workers.
+	"""
 
-	def verify_code(self, email: str, code: str) -> bool:
-		record = self._store.get(email.lower())
-		if not record:
-			return False
-		stored_code, expires_at = record
-		if time.time() > expires_at:
-			# expire
-			self._store.pop(email.lower(), None)
+	def __init__(
+		self,
+		max_entries: int = 100000,
+		max_attempts: int = 5,
+		issue_limit_per_email: int = 5,
+		issue_limit_per_ip: int = 20,
+		issue_window: int = 3600,
+		max_counters: int = 100000,
+	):
+		self.max_attempts = max_attempts
+		self.issue_limit_per_email = issue_limit_per_email
+		self.issue_limit_per_ip = issue_limit_per_ip
+		self.issue_window = issue_window
+		# email -> [code, failed attempts]
+		self._codes = _ExpiringMap(max_entries)
+		# "email:..." / "ip:..." -> issuances in the current window
+		self._issued = _ExpiringMap(max_counters)
+
+	def sweep(self) -> None:
+		self._codes.sweep()
+		self._issued.sweep()
+
+	async def allow_issue(self, email: str, ip: Optional[str] = None) -> bool:
+		"""Count an issuance for the client IP and the email; False once either is over its limit for the window."""
+		limits = [(f"ip:{ip}", self.issue_limit_per_ip)] if ip else []
+		limits.append((f"email:{email.lower()}", self.issue_limit_per_email))
+		for key, limit in limits:
+			entry = self._issued.get(key)
+			count, deadline = entry if entry is not None else (0, time.monotonic() + self.issue_window)
+			self._issued.put(key, count + 1, deadline)
+			if count + 1 > limit:
+				return False
+		return True
+
+	async def set_code(self, email: str, code: str, ttl_seconds: int = 600) -> None:
+		self._codes.put(email.lower(), [code, 0], time.monotonic() + ttl_seconds)
+
+	async def verify_code(self, email: str, code: str) -> bool:
+		"""One-shot check: a matching code is consumed; `max_attempts` misses burn it."""
+		key = email.lower()
+		entry = self._codes.get(key)
+		if entry is None:
 			return False
-		if stored_code == code:
-			self._store.pop(email.lower(), None)
+		record = entry[0]
+		if hmac.compare_digest(record[0].encode(), code.encode()):
+			self._codes.pop(key)
 			return True
+		record[1] += 1
+		if record[1] >= self.max_attempts:
+			self._codes.pop(key)
 		return False
 
+	def stats(self) -> Dict[str, Any]:
+		return {
+			"backend": "memory",
+			"size": len(self._codes),
+			"expired": self._codes.expired,
+			"evicted": self._codes.evicted,
+			"counters": len(self._issued),
+			"counters_evicted": self._issued.evicted,
+		}
+
+
+# Atomic check-and-delete: consume a matching code, count a miss and burn the code after max attempts.
+# KEYS[1] = code hash; ARGV = code, max attempts
+_VERIFY_SCRIPT = """
+local stored = redis.call('HGET', KEYS[1], 'code')
+if not stored then
+	return 0
+end
+if stored == ARGV[1] then
+	redis.call('DEL', KEYS[1])
+	return 1
+end
+if redis.call('HINCRBY', KEYS[1], 'attempts', 1) >= tonumber(ARGV[2]) then
+	redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Count an issuance against each key in order, stopping at the first one over its limit;
+# the window starts with the first issuance. KEYS = counters; ARGV = window seconds, then one limit per key
+_ISSUE_SCRIPT = """
+for i, key in ipairs(KEYS) do
+	local count = redis.call('INCR', key)
+	if count == 1 then
+		redis.call('EXPIRE', key, ARGV[1])
+	end
+	if count > tonumber(ARGV[i + 1]) then
+		return 0
+	end
+end
+return 1
+"""
+
+
+class RedisOtpStore:
+	"""OTP store shared by every worker; Redis key TTLs do the expiry."""
+
+	def __init__(
+		self,
+		url: str,
+		prefix: str = "otp:",
+		max_attempts: int = 5,
+		issue_limit_per_email: int = 5,
+		issue_limit_per_ip: int = 20,
+		issue_window: int = 3600,
+	):
+		import redis.asyncio as redis
+
+		self._redis = redis.from_url(url, decode_responses=True)
+		self.prefix = prefix
+		self.max_attempts = max_attempts
+		self.issue_limit_per_email = issue_limit_per_email
+		self.issue_limit_per_ip = issue_limit_per_ip
+		self.issue_window = issue_window
+		self._verify = self._redis.register_script(_VERIFY_SCRIPT)
+		self._issue = self._redis.register_script(_ISSUE_SCRIPT)
+
+	async def allow_issue(self, email: str, ip: Optional[str] = None) -> bool:
+		# IP first, as in InMemoryOtpStore: an IP over its limit opens no further email counters
+		keys = [f"{self.prefix}issued:ip:{ip}"] if ip else []
+		limits = [self.issue_limit_per_ip] if ip else []
+		keys.append(f"{self.prefix}issued:email:{email.lower()}")
+		limits.append(self.issue_limit_per_email)
+		return bool(await self._issue(keys=keys, args=[self.issue_window, *limits]))
+
+	async def set_code(self, email: str, code: str, ttl_seconds: int = 600) -> None:
+		key = f"{self.prefix}code:{email.lower()}"
+		async with self._redis.pipeline(transaction=True) as pipe:
+			pipe.delete(key)
+			pipe.hset(key, mapping={"code": code, "attempts": 0})
+			pipe.expire(key, ttl_seconds)
+			await pipe.execute()
+
+	async def verify_code(self, email: str, code: str) -> bool:
+		return bool(await self._verify(keys=[f"{self.prefix}code:{email.lower()}"], args=[code, self.max_attempts]))
+
+	def stats(self) -> Dict[str, Any]:
+		return {"backend": "redis"}
+
 
-otp_store = InMemoryOtpStore()
+def _build_store():
+	limits = {
+		"max_attempts": settings.otp_max_attempts,
+		"issue_limit_per_email": settings.otp_issue_limit_per_email,
+		"issue_limit_per_ip": settings.otp_issue_limit_per_ip,
+		"issue_window": settings.otp_issue_window_seconds,
+	}
+	if settings.otp_store_backend == "redis" and settings.redis_url:
+		return RedisOtpStore(settings.redis_url, **limits)
+	return InMemoryOtpStore(max_entries=settings.otp_max_entries, max_counters=settings.otp_max_counters, **limits)
 
 
+# Global OTP store instance, built on first use
+otp_store = Lazy(_build_store)
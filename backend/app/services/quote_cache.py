@@ -0,0 +1,223 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.lazy import Lazy
+from app.core.rate_limit import BACKGROUND, priority
+
+
+# (value, fresh_until, stale_until); value None is a cached "unknown symbol"
+Entry = Tuple[Optional[Dict[str, Any]], float, float]
+
+
+class MemoryQuoteBackend:
+	"""Bounded in-process LRU store for quote entries."""
+
+	def __init__(self, max_entries: int):
+		self.max_entries = max_entries
+		self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+		self.evictions = 0
+
+	async def get(self, key: str) -> Optional[Entry]:
+		entry = self._entries.get(key)
+		if entry is not None:
+			self._entries.move_to_end(key)
+		return entry
+
+	async def set(self, key: str, entry: Entry) -> None:
+		self._entries[key] = entry
+		self._entries.move_to_end(key)
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+			self.evictions += 1
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+
+class RedisQuoteBackend:
+	"""Redis store shared by every worker; bounded by the server's maxmemory LRU policy."""
+
+	def __init__(self, url: str, prefix: str = "quote:"):
+		import redis.asyncio as redis
+
+		self._redis = redis.from_url(url)
+		self.prefix = prefix
+		self.evictions = 0
+
+	async def get(self, key: str) -> Optional[Entry]:
+		raw = await self._redis.get(self.prefix + key)
+		if raw is None:
+			return None
+		value, fresh_until, stale_until = json.loads(raw)
+		return value, fresh_until, stale_until
+
+	async def set(self, key: str, entry: Entry) -> None:
+		ttl_ms = max(1, int((entry[2] - time.time()) * 1000))
+		await self._redis.set(self.prefix + key, json.dumps(entry), px=ttl_ms)
+
+	def __len__(self) -> int:
+		return 0
+
+
+class QuoteCache:
+	"""TTL cache with stale-while-revalidate and negative caching for quotes.
+
+	Fresh entries are served directly. Entries past their TTL but inside the
+	stale window are served immediately, marked `"stale": True`, while a
+	single background task refreshes them (at background rate limit
+	priority), so readers never wait on the provider. `None` results (unknown symbols) are cached for
+	`negative_ttl`. Fetch errors are never cached, and neither is a symbol a
+	batch fetch left out of its result.
+	"""
+
+	def __init__(self, backend, stale_ttl: float, negative_ttl: float):
+		self.backend = backend
+		self.stale_ttl = stale_ttl
+		self.negative_ttl = negative_ttl
+		self.hits = 0
+		self.misses = 0
+		self.stale = 0
+		self.negative_hits = 0
+		self.refresh_errors = 0
+		self._refreshing: Dict[str, asyncio.Task] = {}
+
+	async def _store(self, key: str, value: Optional[Dict[str, Any]], ttl: float) -> None:
+		now = time.time()
+		if value is None:
+			await self.backend.set(key, (None, now + self.negative_ttl, now + self.negative_ttl))
+		else:
+			await self.backend.set(key, (value, now + ttl, now + ttl + self.stale_ttl))
+
+	async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]], ttl: float) -> None:
+		try:
+			with priority(BACKGROUND):
+				value = await fetch()
+			await self._store(key, value, ttl)
+		except Exception as e:
+			self.refresh_errors += 1
+			print(f"Error refreshing cached quote {key}: {e}")
+		finally:
+			self._refreshing.pop(key, None)
+
+	def _classify(self, entry: Optional[Entry], now: float) -> Tuple[str, Optional[Dict[str, Any]]]:
+		"""Return ("fresh" | "stale" | "miss", value) and bump the matching counter."""
+		if entry is not None:
+			value, fresh_until, stale_until = entry
+			if now < fresh_until:
+				if value is None:
+					self.negative_hits += 1
+				else:
+					self.hits += 1
+				return "fresh", value
+			if value is not None and now < stale_until:
+				self.stale += 1
+				return "stale", value
+		self.misses += 1
+		return "miss", None
+
+	async def get_or_fetch(
+		self,
+		key: str,
+		fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+		ttl: float,
+	) -> Optional[Dict[str, Any]]:
+		status, value = self._classify(await self.backend.get(key), time.time())
+		if status == "stale":
+			value = {**value, "stale": True}
+			if key not in self._refreshing:
+				self._refreshing[key] = asyncio.create_task(self._refresh(key, fetch, ttl))
+		if status != "miss":
+			return value
+		value = await fetch()
+		await self._store(key, value, ttl)
+		return value
+
+	async def _refresh_many(
+		self,
+		prefix: str,
+		symbols: List[str],
+		fetch_many: Callable[[List[str]], Awaitable[Dict[str, Optional[Dict[str, Any]]]]],
+		ttl: float,
+	) -> None:
+		try:
+			with priority(BACKGROUND):
+				fetched = await fetch_many(symbols)
+			for symbol in symbols:
+				if symbol in fetched:
+					await self._store(f"{prefix}:{symbol}", fetched[symbol], ttl)
+		except Exception as e:
+			self.refresh_errors += 1
+			print(f"Error refreshing cached quotes {prefix}:{','.join(symbols)}: {e}")
+		finally:
+			for symbol in symbols:
+				self._refreshing.pop(f"{prefix}:{symbol}", None)
+
+	async def get_many_or_fetch(
+		self,
+		prefix: str,
+		symbols: List[str],
+		fetch_many: Callable[[List[str]], Awaitable[Dict[str, Optional[Dict[str, Any]]]]],
+		ttl: float,
+	) -> Dict[str, Optional[Dict[str, Any]]]:
+		"""Batch variant of `get_or_fetch`: all misses are fetched with one `fetch_many` call.
+
+		Stale symbols are refreshed together in a single background batch.
+		"""
+		now = time.time()
+		results: Dict[str, Optional[Dict[str, Any]]] = {}
+		missing: List[str] = []
+		stale: List[str] = []
+		for symbol in symbols:
+			key = f"{prefix}:{symbol}"
+			status, value = self._classify(await self.backend.get(key), now)
+			if status == "miss":
+				missing.append(symbol)
+				continue
+			if status == "stale":
+				value = {**value, "stale": True}
+				if key not in self._refreshing:
+					stale.append(symbol)
+			results[symbol] = value
+		if stale:
+			task = asyncio.create_task(self._refresh_many(prefix, stale, fetch_many, ttl))
+			for symbol in stale:
+				self._refreshing[f"{prefix}:{symbol}"] = task
+		if missing:
+			fetched = await fetch_many(missing)
+			for symbol in missing:
+				results[symbol] = fetched.get(symbol)
+				if symbol in fetched:
+					await self._store(f"{prefix}:{symbol}", results[symbol], ttl)
+		return results
+
+	def stats(self) -> Dict[str, Any]:
+		lookups = self.hits + self.negative_hits + self.stale + self.misses
+		return {
+			"backend": type(self.backend).__name__,
+			"size": len(self.backend),
+			"hits": self.hits,
+			"negative_hits": self.negative_hits,
+			"stale": self.stale,
+			"misses": self.misses,
+			"evictions": self.backend.evictions,
+			"refresh_errors": self.refresh_errors,
+			"hit_ratio": round((self.hits + self.negative_hits + self.stale) / lookups, 4) if lookups else 0.0,
+		}
+
+
+def _build_backend():
+	if settings.quote_cache_backend == "redis" and settings.redis_url:
+		return RedisQuoteBackend(settings.redis_url)
+	return MemoryQuoteBackend(settings.quote_cache_max_entries)
+
+
+# Global quote cache instance, built on first use
+quote_cache = Lazy(lambda: QuoteCache(
+	_build_backend(),
+	stale_ttl=settings.quote_cache_stale_ttl,
+	negative_ttl=settings.quote_cache_negative_ttl,
+))
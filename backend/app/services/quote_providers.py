@@ -0,0 +1,389 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.rate_limit import RateLimited
+from app.services.symbol_registry import symbol_registry
+
+
+Quote = Dict[str, Any]
+# (provider, url, params, headers) -> parsed JSON; MarketDataService._get_json (rate limited, coalesced)
+GetJson = Callable[..., Awaitable[Any]]
+
+
+def _float(value: Any) -> float:
+	try:
+		return float(str(value).replace("%", "")) if value not in (None, "") else 0.0
+	except ValueError:
+		return 0.0
+
+
+def make_quote(symbol: str, asset_type: str, provider: str, **fields: Any) -> Quote:
+	"""One quote schema for every provider and asset type.
+
+	Crypto quotes also carry the older `change_24h` / `volume_24h` keys the
+	dashboard reads.
+	"""
+	quote = {
+		"symbol": symbol.upper(),
+		"asset_type": asset_type,
+		"price": _float(fields.get("price")),
+		"change": _float(fields.get("change")),
+		"change_percent": _float(fields.get("change_percent")),
+		"volume": _float(fields.get("volume")),
+		"high": _float(fields.get("high")),
+		"low": _float(fields.get("low")),
+		"open": _float(fields.get("open")),
+		"previous_close": _float(fields.get("previous_close")),
+		"market_cap": _float(fields.get("market_cap")),
+		"timestamp": fields.get("timestamp"),
+		"provider": provider,
+	}
+	if asset_type == "crypto":
+		quote["change_24h"] = quote["change_percent"]
+		quote["volume_24h"] = quote["volume"]
+	return quote
+
+
+class QuoteProvider:
+	"""A quote source for one asset type; `fetch` returns {SYMBOL: quote or None}."""
+
+	name = ""
+	asset_type = "stock"
+	# Largest symbol list one call can serve
+	max_symbols = 1
+
+	def __init__(self, get_json: GetJson, api_key: str = ""):
+		self.get_json = get_json
+		self.api_key = api_key
+		# Calls a larger batch may be split into: the burst of the provider's rate limit
+		self.max_calls = max(1, int(settings.provider_rate_limits.get(self.name, [0, 1])[1]))
+
+	async def fetch(self, symbols: List[str]) -> Dict[str, Optional[Quote]]:
+		raise NotImplementedError
+
+
+class AlphaVantageQuotes(QuoteProvider):
+	"""GLOBAL_QUOTE, one symbol per call (the free tier allows 5 calls a minute)."""
+
+	name = "alpha_vantage"
+
+	async def fetch(self, symbols: List[str]) -> Dict[str, Optional[Quote]]:
+		symbol = symbols[0]
+		params = {"function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": self.api_key}
+		data = await self.get_json(self.name, "https://www.alphavantage.co/query", params)
+		quote = (data or {}).get("Global Quote")
+		if not quote:
+			return {symbol: None}
+		return {symbol: make_quote(
+			symbol,
+			"stock",
+			self.name,
+			price=quote.get("05. price"),
+			change=quote.get("09. change"),
+			change_percent=quote.get("10. change percent"),
+			volume=quote.get("06. volume"),
+			high=quote.get("03. high"),
+			low=quote.get("04. low"),
+			open=quote.get("02. open"),
+			previous_close=quote.get("08. previous close"),
+			timestamp=quote.get("07. latest trading day"),
+		)}
+
+
+class FmpQuotes(QuoteProvider):
+	"""FMP /quote/AAPL,MSFT,... batch call; crypto goes through the same endpoint as BTCUSD."""
+
+	name = "fmp"
+	max_symbols = 100
+
+	def __init__(self, get_json: GetJson, api_key: str = "", asset_type: str = "stock"):
+		super().__init__(get_json, api_key)
+		self.asset_type = asset_type
+
+	def _ticker(self, symbol: str) -> str:
+		return f"{symbol}USD" if self.asset_type == "crypto" else symbol
+
+	async def fetch(self, symbols: List[str]) -> Dict[str, Optional[Quote]]:
+		tickers = {self._ticker(symbol): symbol for symbol in symbols}
+		url = f"https://financialmodelingprep.com/api/v3/quote/{','.join(tickers)}"
+		data = await self.get_json(self.name, url, {"apikey": self.api_key})
+		if isinstance(data, dict):
+			# Errors (bad key, plan limits) come back as {"Error Message": ...}
+			raise RuntimeError(data.get("Error Message") or "Unexpected FMP quote response")
+		quotes: Dict[str, Optional[Quote]] = {symbol: None for symbol in symbols}
+		for item in data or []:
+			symbol = tickers.get((item.get("symbol") or "").upper())
+			if symbol is None:
+				continue
+			quotes[symbol] = make_quote(
+				symbol,
+				self.asset_type,
+				self.name,
+				price=item.get("price"),
+				change=item.get("change"),
+				change_percent=item.get("changesPercentage"),
+				volume=item.get("volume"),
+				high=item.get("dayHigh"),
+				low=item.get("dayLow"),
+				open=item.get("open"),
+				previous_close=item.get("previousClose"),
+				market_cap=item.get("marketCap"),
+				timestamp=item.get("timestamp"),
+			)
+		return quotes
+
+
+class CoinGeckoQuotes(QuoteProvider):
+	"""CoinGecko /simple/price with a comma-separated id list."""
+
+	name = "coingecko"
+	asset_type = "crypto"
+	max_symbols = 250
+
+	async def fetch(self, symbols: List[str]) -> Dict[str, Optional[Quote]]:
+		ids = {symbol: symbol_registry.coingecko_id(symbol) for symbol in symbols}
+		params = {
+			"ids": ",".join(sorted(set(ids.values()))),
+			"vs_currencies": "usd",
+			"include_24hr_change": "true",
+			"include_24hr_vol": "true",
+			"include_market_cap": "true",
+		}
+		headers = {"x-cg-demo-api-key": self.api_key} if self.api_key else {}
+		data = await self.get_json(self.name, "https://api.coingecko.com/api/v3/simple/price", params, headers=headers)
+		quotes: Dict[str, Optional[Quote]] = {}
+		for symbol, coin_id in ids.items():
+			coin = (data or {}).get(coin_id)
+			if not coin:
+				quotes[symbol] = None
+				continue
+			price, percent = _float(coin.get("usd")), _float(coin.get("usd_24h_change"))
+			quotes[symbol] = make_quote(
+				symbol,
+				"crypto",
+				self.name,
+				price=price,
+				# CoinGecko only reports the percentage; derive the absolute move from it
+				change=price * percent / (100 + percent) if percent > -100 else 0.0,
+				change_percent=percent,
+				volume=coin.get("usd_24h_vol"),
+				market_cap=coin.get("usd_market_cap"),
+				timestamp="24h",
+			)
+		return quotes
+
+
+class ProviderHealth:
+	"""Rolling latency and error record of one provider.
+
+	Keeps the last `window` outcomes. After `failure_threshold` consecutive
+	failures, or a throttle response, the provider is down for `cooldown`
+	seconds (or the throttle's Retry-After); afterwards it is tried again and
+	one more failure takes it straight back down.
+	"""
+
+	def __init__(self, window: int = 50, failure_threshold: int = 3, cooldown: float = 30.0):
+		self.latencies: Deque[float] = deque(maxlen=window)
+		self.errors: Deque[int] = deque(maxlen=window)
+		self.failure_threshold = failure_threshold
+		self.cooldown = cooldown
+		self.consecutive_failures = 0
+		self.down_until = 0.0
+
+	def record(self, latency: Optional[float], ok: bool, retry_after: Optional[float] = None, throttled: bool = False) -> None:
+		self.errors.append(0 if ok else 1)
+		if ok:
+			self.latencies.append(latency)
+			self.consecutive_failures = 0
+			return
+		self.consecutive_failures += 1
+		if throttled or self.consecutive_failures >= self.failure_threshold:
+			pause = retry_after if retry_after is not None else self.cooldown
+			self.down_until = max(self.down_until, time.monotonic() + pause)
+
+	def healthy(self) -> bool:
+		return time.monotonic() >= self.down_until
+
+	@property
+	def error_rate(self) -> float:
+		return sum(self.errors) / len(self.errors) if self.errors else 0.0
+
+	def percentile(self, pct: float) -> Optional[float]:
+		if not self.latencies:
+			return None
+		ordered = sorted(self.latencies)
+		return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+	def score(self) -> float:
+		"""Expected cost of a call: median latency inflated by the error rate (lower is better)."""
+		median = self.percentile(50)
+		return (median or 0.0) * (1 + 4 * self.error_rate)
+
+	def stats(self) -> Dict[str, Any]:
+		p50, p95 = self.percentile(50), self.percentile(95)
+		return {
+			"healthy": self.healthy(),
+			"samples": len(self.errors),
+			"error_rate": round(self.error_rate, 3),
+			"p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+			"p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+			"consecutive_failures": self.consecutive_failures,
+			"down_for": round(max(0.0, self.down_until - time.monotonic()), 2),
+		}
+
+
+class QuoteRouter:
+	"""Route quote requests to the best provider for the asset type, with hedging.
+
+	Candidates are the providers of the asset type that can serve the whole
+	symbol list, healthy ones first, then by `ProviderHealth.score`, then in
+	the configured order (unmeasured providers go first so they get measured).
+	A provider that takes fewer symbols per call (Alpha Vantage: one) serves
+	a batch by splitting it into up to `max_calls` concurrent calls; it ranks
+	after the healthy providers that serve the batch in one call, so it is
+	the hedge and failover for a stock batch, and the first choice only while
+	those are down.
+	If the first choice has not answered after its p95 latency, a hedge
+	request goes to the next candidate and the first answer wins; the slower
+	call still finishes in the background so its latency is recorded. A
+	failure moves on to the next candidate at once.
+	Symbols a successful answer left out are re-routed to the providers not
+	tried yet, so `None` means every candidate rejected the symbol. When
+	that re-route fails, the symbols are left out of the result (unknown,
+	not rejected) unless nothing resolved, in which case the error is raised.
+	"""
+
+	def __init__(self, providers: List[QuoteProvider], order: Optional[Dict[str, List[str]]] = None):
+		self.providers = providers
+		self.order = order or {}
+		self.health: Dict[str, ProviderHealth] = {
+			self._id(p): ProviderHealth(
+				window=settings.quote_provider_window,
+				failure_threshold=settings.quote_provider_failure_threshold,
+				cooldown=settings.quote_provider_cooldown,
+			)
+			for p in providers
+		}
+		self.hedges = 0
+		self.failovers = 0
+		self.splits = 0
+		self.reroutes = 0
+		self._background: set = set()
+
+	@staticmethod
+	def _id(provider: QuoteProvider) -> str:
+		return f"{provider.asset_type}:{provider.name}"
+
+	def rank(self, asset_type: str, count: int = 1) -> List[QuoteProvider]:
+		order = self.order.get(asset_type, [])
+		candidates = [
+			p for p in self.providers
+			if p.asset_type == asset_type and p.max_symbols * p.max_calls >= count and (not order or p.name in order)
+		]
+
+		def key(provider: QuoteProvider):
+			health = self.health[self._id(provider)]
+			rank = order.index(provider.name) if provider.name in order else len(order)
+			return (not health.healthy(), provider.max_symbols < count, health.score(), rank)
+
+		return sorted(candidates, key=key)
+
+	def hedge_delay(self, provider: QuoteProvider) -> float:
+		health = self.health[self._id(provider)]
+		p95 = health.percentile(95) if len(health.latencies) >= settings.quote_hedge_min_samples else None
+		if p95 is None:
+			return settings.quote_hedge_default_delay
+		return min(max(p95, settings.quote_hedge_min_delay), settings.quote_hedge_max_delay)
+
+	async def _call(self, provider: QuoteProvider, symbols: List[str]) -> Dict[str, Optional[Quote]]:
+		if len(symbols) > provider.max_symbols:
+			# Split into calls the provider can serve; each is measured (and rate limited) on its own
+			self.splits += 1
+			size = provider.max_symbols
+			parts = await asyncio.gather(*(self._call(provider, symbols[i:i + size]) for i in range(0, len(symbols), size)))
+			return {symbol: quote for part in parts for symbol, quote in part.items()}
+		health = self.health[self._id(provider)]
+		start = time.perf_counter()
+		try:
+			result = await provider.fetch(symbols)
+		except RateLimited as e:
+			health.record(None, ok=False, retry_after=e.retry_after, throttled=True)
+			raise
+		except Exception:
+			health.record(None, ok=False)
+			raise
+		health.record(time.perf_counter() - start, ok=True)
+		return result
+
+	async def _reroute(self, asset_type: str, quotes: Dict[str, Optional[Quote]], tried: List[QuoteProvider]) -> Dict[str, Optional[Quote]]:
+		missing = [symbol for symbol, quote in quotes.items() if quote is None]
+		if not missing or not [p for p in self.rank(asset_type, len(missing)) if p not in tried]:
+			return quotes
+		self.reroutes += 1
+		try:
+			quotes.update(await self.fetch(asset_type, missing, exclude=tried))
+		except Exception:
+			if len(missing) == len(quotes):
+				raise
+			# Nobody has rejected these yet; leave them out rather than report them unknown
+			for symbol in missing:
+				quotes.pop(symbol)
+		return quotes
+
+	async def fetch(self, asset_type: str, symbols: List[str], exclude: Sequence[QuoteProvider] = ()) -> Dict[str, Optional[Quote]]:
+		candidates = [p for p in self.rank(asset_type, len(symbols)) if p not in exclude]
+		if not candidates:
+			raise RuntimeError(f"No quote provider for {len(symbols)} {asset_type} symbols")
+		pending: Dict[asyncio.Future, QuoteProvider] = {}
+		tried: List[QuoteProvider] = list(exclude)
+		error: Optional[BaseException] = None
+
+		def launch() -> QuoteProvider:
+			provider = candidates.pop(0)
+			tried.append(provider)
+			pending[asyncio.ensure_future(self._call(provider, symbols))] = provider
+			return provider
+
+		primary = launch()
+		try:
+			while pending:
+				# Hedge once: only while the first choice is the only call in flight
+				hedge = candidates and len(pending) == 1 and primary in pending.values()
+				done, _ = await asyncio.wait(
+					pending,
+					timeout=self.hedge_delay(primary) if hedge else None,
+					return_when=asyncio.FIRST_COMPLETED,
+				)
+				if not done:
+					self.hedges += 1
+					launch()
+					continue
+				for task in done:
+					pending.pop(task)
+					if task.exception() is None:
+						return await self._reroute(asset_type, dict(task.result()), tried)
+					# Report a throttle over other errors so callers can answer with Retry-After
+					if error is None or (isinstance(task.exception(), RateLimited) and not isinstance(error, RateLimited)):
+						error = task.exception()
+				if not pending and candidates:
+					self.failovers += 1
+					launch()
+			raise error
+		finally:
+			# Let losing calls finish in the background so their latency is still recorded
+			for task in pending:
+				self._background.add(task)
+				task.add_done_callback(self._background.discard)
+				task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+	def stats(self) -> Dict[str, Any]:
+		return {
+			"hedges": self.hedges,
+			"failovers": self.failovers,
+			"splits": self.splits,
+			"reroutes": self.reroutes,
+			"providers": {name: health.stats() for name, health in self.health.items()},
+		}
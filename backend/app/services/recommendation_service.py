@@ -1,64 +1,95 @@
-import os
-from typing import List, Dict, Any
-import httpx
+import asyncio
+import time
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
 
-from app.services.market_data_service import market_data_service
 from app.core.config import settings
+from app.services.influencer_engine import influencer_engine
+from app.services.market_data_service import market_data_service
+from app.services.ohlcv_store import ohlcv_store
+from app.services.sentiment_aggregates import sentiment_aggregates
+from app.services.sentiment_engine import score_labels, sentiment_engine
+from app.services.weighted_sentiment import weighted_mean
 
 
 class RecommendationService:
-	def __init__(self):
-		self.hf_api_key = os.getenv("HUGGINGFACE_API_KEY", "")
-		self.model = "ProsusAI/finbert"
-
-	async def _analyze_sentences(self, texts: List[str]) -> List[Dict[str, Any]]:
-		# Use Hugging Face Inference API for FinBERT sentiment
-		headers = {"Authorization": f"Bearer {self.hf_api_key}"} if self.hf_api_key else {}
-		url = f"https://api-inference.huggingface.co/models/{self.model}"
-		async with httpx.AsyncClient(timeout=40) as client:
-			resp = await client.post(url, headers=headers, json={"inputs": texts})
-			resp.raise_for_status()
-			return resp.json()
+	async def _analyze_sentences(self, texts: List[str]) -> List[Any]:
+		# FinBERT sentiment via the configured engine (hosted API or local model, micro-batched)
+		return await sentiment_engine.analyze(texts)
 
-	@staticmethod
-	def _score_to_numeric(labels: List[Dict[str, Any]]) -> float:
-		# Convert FinBERT output into a numeric sentiment score [-1, 1]
-		label_map = {"positive": 1.0, "neutral": 0.0, "negative": -1.0}
-		if not labels:
-			return 0.0
-		best = max(labels, key=lambda x: x.get("score", 0))
-		return label_map.get(best.get("label", "neutral").lower(), 0.0) * float(best.get("score", 0))
-
-	async def recommend(self, symbol: str, recent_texts: List[str]) -> Dict[str, Any]:
-		# Analyze sentiment
+	# Convert FinBERT output into a numeric sentiment score [-1, 1]
+	_score_to_numeric = staticmethod(score_labels)
+
+	async def analyze_sentiment(self, texts: List[str]) -> float:
+		"""Mean FinBERT sentiment of `texts` in [-1, 1]; 0.0 when the model is unavailable."""
 		try:
-			results = await self._analyze_sentences(recent_texts or [f"Outlook for {symbol}."])
+			results = await self._analyze_sentences(texts)
 		except Exception:
 			results = []
 		sentiment_scores = []
 		if isinstance(results, list):
 			for item in results:
-				if isinstance(item, list):
+				if isinstance(item, list) and item:
 					sentiment_scores.append(self._score_to_numeric(item))
 				elif isinstance(item, dict) and "label" in item:
 					sentiment_scores.append(self._score_to_numeric([item]))
-		sentiment = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0.0
+		return sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0.0
 
-		# Get price trend
-		market = await market_data_service.get_stock_quote(symbol) or await market_data_service.get_crypto_quote(symbol)
-		price = float(market.get("price", 0)) if market else 0
-		change = float(market.get("change", market.get("change_24h", 0))) if market else 0
+	async def weighted_sentiment(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+		"""Engagement-weighted sentiment of social posts, near-duplicates and repeat authors damped.
+
+		Posts are dicts with `text`, `author_id`, the public engagement counts
+		and optionally `followers`; a tweet author's follower count falls back
+		to the influencer engine's last sighting. Scores come from the engine
+		in one call (ingested posts are already in the sentiment cache).
+		"""
+		posts = [post for post in posts if post.get("text")]
+		try:
+			labels = await self._analyze_sentences([post["text"] for post in posts]) if posts else []
+		except Exception as e:
+			print(f"Error scoring posts for weighted sentiment: {e}")
+			labels = []
+		scores = np.full(len(posts), np.nan)
+		for i, item in enumerate(labels):
+			if item:
+				scores[i] = self._score_to_numeric(item)
+		for post in posts:
+			if post.get("followers") is None:
+				post["followers"] = influencer_engine.followers("twitter", post.get("author_id"))
+		return weighted_mean(scores, posts)
+
+	@staticmethod
+	def score(sentiment: np.ndarray, change: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+		"""Actions and confidences for whole arrays of symbols in one vectorized pass.
 
-		# Simple rules combining sentiment and price momentum
-		action = "hold"
-		confidence = max(0.5, min(0.95, abs(sentiment) + (0.1 if change else 0)))
-		if sentiment > 0.2 and change >= 0:
-			action = "buy"
-		elif sentiment < -0.2 and change <= 0:
-			action = "sell"
+		Rules: buy when sentiment > 0.2 and price is not falling, sell when
+		sentiment < -0.2 and price is not rising, otherwise hold. Confidence is
+		|sentiment| plus 0.1 when the price moved, clipped to [0.5, 0.95].
+		"""
+		actions = np.select(
+			[(sentiment > 0.2) & (change >= 0), (sentiment < -0.2) & (change <= 0)],
+			["buy", "sell"],
+			default="hold",
+		)
+		confidence = np.clip(np.abs(sentiment) + np.where(change != 0, 0.1, 0.0), 0.5, 0.95)
+		return actions, confidence
 
+	@staticmethod
+	def _quote_features(quotes: Dict[str, Any], symbols: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+		price = np.zeros(len(symbols))
+		change = np.zeros(len(symbols))
+		for i, symbol in enumerate(symbols):
+			market = quotes.get(symbol)
+			if market:
+				price[i] = float(market.get("price") or 0)
+				change[i] = float(market.get("change", market.get("change_24h")) or 0)
+		return price, change
+
+	@staticmethod
+	def _result(symbol: str, action: str, confidence: float, sentiment: float, change: float, price: float) -> Dict[str, Any]:
 		return {
-			"symbol": symbol.upper(),
+			"symbol": symbol,
 			"action": action,
 			"confidence": round(confidence, 2),
 			"reasoning": f"Sentiment={sentiment:.2f}, price change={change:.2f}.",
@@ -66,6 +97,63 @@ class RecommendationService:
 			"price": price,
 		}
 
+	async def recommend(self, symbol: str, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+		symbol = symbol.upper()
+		# Sentiment: engagement-weighted over the given posts, else the rolling 1h EWMA
+		# when ingestion has scored posts for the symbol, else a neutral prompt
+		weighting = await self.weighted_sentiment(posts) if posts else None
+		window = sentiment_aggregates.window(symbol, "1h")
+		if weighting is not None and weighting["sentiment"] is not None:
+			sentiment = weighting["sentiment"]
+		elif window["count"]:
+			sentiment = window["ewma"]
+		else:
+			sentiment = await self.analyze_sentiment([f"Outlook for {symbol}."])
+
+		# Get price trend (the symbol registry picks the stock or crypto provider)
+		quotes = await market_data_service.get_quotes([symbol])
+		price, change = self._quote_features(quotes, [symbol])
+		actions, confidence = self.score(np.array([sentiment]), change)
+		result = self._result(symbol, str(actions[0]), float(confidence[0]), sentiment, float(change[0]), float(price[0]))
+		if weighting is not None and weighting["posts"]:
+			result["weighting"] = {key: value for key, value in weighting.items() if key != "sentiment"}
+		return result
+
+	async def recommend_batch(self, symbols: List[str]) -> List[Dict[str, Any]]:
+		"""Recommendations for a whole watchlist, strongest signals first.
+
+		Quotes come from one batched `get_quotes` call and sentiment from the
+		rolling aggregates (1h EWMA; symbols without recent posts count as
+		neutral), so no model call happens here; the rules run once over arrays.
+		"""
+		symbols = list(dict.fromkeys(s.upper() for s in symbols))
+		if not symbols:
+			return []
+		quotes = await market_data_service.get_quotes(symbols, deadline=settings.quote_deadline_seconds)
+		price, change = self._quote_features(quotes, symbols)
+		sentiment = np.zeros(len(symbols))
+		mentions = np.zeros(len(symbols), dtype=np.int64)
+		for i, symbol in enumerate(symbols):
+			window = sentiment_aggregates.window(symbol, "1h")
+			if window["count"]:
+				sentiment[i] = window["ewma"]
+				mentions[i] = window["count"]
+		actions, confidence = self.score(sentiment, change)
+		# Multi-day context from the local OHLCV history (no provider call)
+		history = await asyncio.to_thread(lambda: [ohlcv_store.features(symbol) for symbol in symbols])
+
+		# Rank: buy/sell before hold, then by confidence, then by how much was said
+		order = np.lexsort((-mentions, -confidence, actions == "hold"))
+		now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+		results = []
+		for i in order:
+			result = self._result(symbols[i], str(actions[i]), float(confidence[i]), float(sentiment[i]), float(change[i]), float(price[i]))
+			result.update(mentions=int(mentions[i]), timestamp=now, **history[i])
+			if history[i]["momentum_5d"] is not None:
+				result["reasoning"] += f" 5d momentum={history[i]['momentum_5d'] * 100:.1f}%."
+			results.append(result)
+		return results
+
 
 recommendation_service = RecommendationService()
 
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.rate_limit import BACKGROUND, priority
+from app.services.influencer_engine import influencer_engine
+from app.services.ingestion_cursors import cursor_store
+from app.services.reddit_service import reddit_service
+from app.services.reddit_store import Mention, reddit_store
+from app.services.sentiment_aggregates import sentiment_aggregates
+from app.services.symbol_registry import symbol_registry
+
+
+class RedditIngestor:
+	"""Background worker that polls subreddits for new posts and comments.
+
+	Every (subreddit, posts|comments) listing keeps the fullname of the newest
+	item it stored as its cursor and asks Reddit only for items `before` it, so
+	nothing is fetched twice. The first poll of a listing takes just the
+	newest page rather than backfilling. All listings are polled concurrently;
+	the shared token bucket in `reddit_service` keeps them under the API limit.
+
+	Reddit answers `before` a deleted or removed item with an empty listing, so
+	an empty cursored page is re-checked against the newest page, keeping only
+	items created after the cursor item. Only items stored for the first time
+	are scored and fed to the aggregates and the influencer engine.
+	"""
+
+	source = "reddit"
+	kinds = ("posts", "comments")
+
+	def __init__(self, subreddits: Optional[List[str]] = None):
+		self.subreddits = subreddits
+		self.ingested = 0
+		self.last_run: Optional[str] = None
+		self.errors: Dict[str, str] = {}
+		self._task: Optional[asyncio.Task] = None
+
+	@property
+	def universe(self) -> List[str]:
+		return list(dict.fromkeys(self.subreddits or settings.reddit_subreddits))
+
+	@staticmethod
+	def _mentions(items: List[Dict[str, Any]]) -> List[Mention]:
+		"""(item, symbol, text, created_utc) for every symbol an item mentions."""
+		entries = []
+		seen = set()
+		for item in items:
+			if item.get("name") in seen:
+				continue
+			seen.add(item.get("name"))
+			text = "\n".join(part for part in (item.get("title"), item.get("selftext") or item.get("body")) if part)
+			for symbol in symbol_registry.extract(text):
+				entries.append((item, symbol, text, float(item.get("created_utc", 0))))
+		return entries
+
+	async def ingest_listing(self, subreddit: str, kind: str) -> int:
+		key = f"{subreddit.lower()}/{kind}"
+		cursor = (await cursor_store.get(self.source, key))["since_id"]
+		first_poll = cursor is None
+		saved = 0
+		for _ in range(settings.reddit_max_pages):
+			items = await reddit_service.listing(subreddit, kind, before=cursor, limit=settings.reddit_page_size)
+			anchored = True
+			if not items and cursor is not None:
+				# Empty either because nothing is newer or because the cursor item is gone
+				since = await reddit_store.created_utc(cursor)
+				latest = await reddit_service.listing(subreddit, kind, limit=settings.reddit_page_size)
+				items = [item for item in latest if since is None or float(item.get("created_utc", 0)) > since]
+				anchored = False
+			if not items:
+				break
+			mentions = self._mentions(items)
+			fresh = set(await reddit_store.save(items, mentions))
+			saved += len(fresh)
+			mentions = [entry for entry in mentions if entry[0].get("name") in fresh]
+			scores = await sentiment_aggregates.record(entry[1:] for entry in mentions)
+			for (item, symbol, _, ts), score in zip(mentions, scores):
+				influencer_engine.observe(
+					"reddit",
+					item.get("author"),
+					symbol,
+					score,
+					ts,
+					engagement=item.get("score", 0) + item.get("num_comments", 0),
+					name=item.get("author"),
+				)
+			# Listings are newest first: the head of the page is the next cursor
+			cursor = items[0]["name"]
+			await cursor_store.save(self.source, key, since_id=cursor)
+			# An unanchored page is already the newest one
+			if first_poll or not anchored or len(items) < settings.reddit_page_size:
+				break
+		return saved
+
+	async def run_once(self) -> Dict[str, int]:
+		slots = asyncio.Semaphore(settings.reddit_ingest_concurrency)
+
+		async def one(subreddit: str, kind: str) -> int:
+			key = f"{subreddit}/{kind}"
+			async with slots:
+				try:
+					saved = await self.ingest_listing(subreddit, kind)
+					self.errors.pop(key, None)
+					return saved
+				except Exception as e:
+					print(f"Error ingesting Reddit {key}: {e}")
+					self.errors[key] = str(e)
+					return 0
+
+		listings = [(subreddit, kind) for subreddit in self.universe for kind in self.kinds]
+		saved = await asyncio.gather(*(one(subreddit, kind) for subreddit, kind in listings))
+		counts = {f"{subreddit}/{kind}": n for (subreddit, kind), n in zip(listings, saved)}
+		self.ingested += sum(saved)
+		self.last_run = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+		return counts
+
+	async def stats(self) -> Dict[str, Any]:
+		return {
+			"running": self._task is not None,
+			"subreddits": self.universe,
+			"ingested": self.ingested,
+			"last_run": self.last_run,
+			"errors": self.errors,
+			"rate_limit_wait_seconds": round(reddit_service.limiter.waited, 2),
+			"cursors": {key: cursor["since_id"] for key, cursor in (await cursor_store.all(self.source)).items()},
+		}
+
+	async def _run(self) -> None:
+		# Queue behind interactive requests for provider rate limit tokens
+		with priority(BACKGROUND):
+			while True:
+				await self.run_once()
+				await asyncio.sleep(settings.reddit_ingest_interval)
+
+	async def start(self) -> None:
+		if self._task is None:
+			self._task = asyncio.create_task(self._run())
+
+	async def stop(self) -> None:
+		task, self._task = self._task, None
+		if task is not None:
+			task.cancel()
+			try:
+				await task
+			except asyncio.CancelledError:
+				pass
+
+
+# Global Reddit ingestion worker instance
+reddit_ingestor = RedditIngestor()
@@ -0,0 +1,44 @@
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.core.lazy import Lazy
+from app.core.http import http_clients
+from app.core.rate_limit import RateLimited, rate_limits, retry_after
+from app.core.singleflight import flight_key, singleflight
+
+
+class RedditService:
+	"""Reddit public JSON listings, paced by the "reddit" token bucket shared by all pollers."""
+
+	def __init__(self):
+		self.base_url = settings.reddit_base_url.rstrip("/")
+		self.headers = {"User-Agent": settings.reddit_user_agent}
+		self.limiter = rate_limits.register("reddit", settings.reddit_requests_per_minute / 60, settings.reddit_burst)
+
+	async def listing(
+		self,
+		subreddit: str,
+		kind: str = "posts",
+		before: Optional[str] = None,
+		limit: int = 100,
+	) -> List[Dict[str, Any]]:
+		"""Newest posts or comments of a subreddit, newest first; with `before`, only items newer than that fullname."""
+		url = f"{self.base_url}/r/{subreddit}/{'new' if kind == 'posts' else 'comments'}.json"
+		params: Dict[str, Any] = {"limit": max(1, min(limit, 100)), "raw_json": 1}
+		if before:
+			params["before"] = before
+
+		async def fetch() -> Dict[str, Any]:
+			await self.limiter.acquire()
+			resp = await http_clients.get(url).get(url, headers=self.headers, params=params, timeout=20)
+			if resp.status_code == 429:
+				delay = retry_after(resp.headers)
+				await self.limiter.throttled(delay)
+				raise RateLimited("reddit", delay)
+			resp.raise_for_status()
+			return resp.json()
+
+		data = await singleflight.do(flight_key("reddit", url, params), fetch)
+		return [child["data"] for child in data.get("data", {}).get("children", []) if child.get("data")]
+
+
+reddit_service = Lazy(RedditService)
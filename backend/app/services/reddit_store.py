@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.db import engine, insert_ignore
+from app.models.social import RedditItem, RedditMention
+
+# (item, symbol, text, created_utc) for one symbol an item mentions
+Mention = Tuple[Dict[str, Any], str, str, float]
+
+
+class RedditStore:
+	"""Bulk persistence of Reddit posts and comments plus the symbols they mention.
+
+	Items already stored are skipped and left out of the result, so a
+	re-fetched page is not scored twice.
+	"""
+
+	@staticmethod
+	def _rows(items: List[Dict[str, Any]], mentions: Iterable[Mention]):
+		rows: Dict[str, Dict[str, Any]] = {}
+		for item in items:
+			name = item.get("name")
+			if not name or name in rows:
+				continue
+			is_post = name.startswith("t3_")
+			title = item.get("title") if is_post else None
+			text = item.get("selftext") if is_post else item.get("body")
+			created_at = datetime.fromtimestamp(float(item.get("created_utc", 0)), tz=timezone.utc)
+			rows[name] = {
+				"id": name,
+				"kind": "post" if is_post else "comment",
+				"subreddit": item.get("subreddit", ""),
+				"author": item.get("author"),
+				"title": title,
+				"text": text,
+				"parent_id": item.get("parent_id"),
+				"permalink": item.get("permalink"),
+				"score": item.get("score", 0),
+				"num_comments": item.get("num_comments", 0),
+				"created_at": created_at,
+			}
+		mention_rows = {
+			(item["name"], symbol): {"symbol": symbol, "item_id": item["name"], "created_at": rows[item["name"]]["created_at"]}
+			for item, symbol, _, _ in mentions
+			if item.get("name") in rows
+		}
+		return list(rows.values()), list(mention_rows.values())
+
+	@classmethod
+	def _save(cls, items: List[Dict[str, Any]], mentions: List[Mention]) -> List[str]:
+		rows, mention_rows = cls._rows(items, mentions)
+		if not rows:
+			return []
+		with engine.begin() as conn:
+			stored = set(conn.execute(
+				select(RedditItem.id).where(RedditItem.id.in_([row["id"] for row in rows]))
+			).scalars())
+			rows = [row for row in rows if row["id"] not in stored]
+			mention_rows = [row for row in mention_rows if row["item_id"] not in stored]
+			if rows:
+				conn.execute(insert_ignore(RedditItem.__table__), rows)
+			if mention_rows:
+				conn.execute(insert_ignore(RedditMention.__table__), mention_rows)
+		return [row["id"] for row in rows]
+
+	@staticmethod
+	def _created_utc(name: str) -> Optional[float]:
+		with engine.connect() as conn:
+			created_at = conn.execute(select(RedditItem.created_at).where(RedditItem.id == name)).scalar_one_or_none()
+		if created_at is None:
+			return None
+		# SQLite hands back naive datetimes; they were stored as UTC
+		return (created_at if created_at.tzinfo else created_at.replace(tzinfo=timezone.utc)).timestamp()
+
+	async def save(self, items: List[Dict[str, Any]], mentions: List[Mention]) -> List[str]:
+		"""Store the items and their `mentions`; returns the fullnames that were not stored before."""
+		return await asyncio.to_thread(self._save, items, mentions)
+
+	async def created_utc(self, name: str) -> Optional[float]:
+		"""Creation time of a stored item (epoch seconds), or None when it was never stored."""
+		return await asyncio.to_thread(self._created_utc, name)
+
+
+# Global Reddit store instance
+reddit_store = RedditStore()
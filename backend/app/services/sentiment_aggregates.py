@@ -0,0 +1,185 @@
+import math
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.lazy import Lazy
+from app.services.sentiment_engine import score_labels, sentiment_engine
+
+
+# Window name -> (span in seconds, number of bins)
+WINDOWS: Dict[str, Tuple[int, int]] = {
+	"1m": (60, 12),
+	"5m": (300, 10),
+	"1h": (3600, 12),
+	"24h": (86400, 24),
+}
+
+
+class RollingWindow:
+	"""Sliding window of sentiment scores over `span` seconds.
+
+	The window is a ring buffer of `bins` fixed-width bins holding count, sum and
+	sum of squares; running totals are kept alongside, so adding a score and
+	reading count/mean/variance are O(1). A bin is cleared when the window
+	slides past it (amortized O(1), at most `bins` steps). The EWMA is
+	time-decayed with a time constant of `span`, so a burst of scores
+	arriving in the same second is weighted evenly.
+	"""
+
+	__slots__ = (
+		"span", "bins", "width", "head", "epochs", "counts", "sums", "squares",
+		"count", "total", "total_sq", "_ewma_sum", "_ewma_weight", "_ewma_at",
+	)
+
+	def __init__(self, span: float, bins: int):
+		self.span = span
+		self.bins = bins
+		self.width = span / bins
+		self.head = -1
+		self.epochs = array("q", [-1] * bins)
+		self.counts = array("q", [0] * bins)
+		self.sums = array("d", [0.0] * bins)
+		self.squares = array("d", [0.0] * bins)
+		self.count = 0
+		self.total = 0.0
+		self.total_sq = 0.0
+		self._ewma_sum = 0.0
+		self._ewma_weight = 0.0
+		self._ewma_at = 0.0
+
+	def _advance(self, index: int) -> None:
+		if index <= self.head:
+			return
+		for i in range(index - min(index - self.head, self.bins) + 1, index + 1):
+			slot = i % self.bins
+			self.count -= self.counts[slot]
+			self.total -= self.sums[slot]
+			self.total_sq -= self.squares[slot]
+			self.epochs[slot], self.counts[slot], self.sums[slot], self.squares[slot] = i, 0, 0.0, 0.0
+		if self.count == 0:
+			# Drop accumulated floating point drift
+			self.total = self.total_sq = 0.0
+		self.head = index
+
+	def add(self, value: float, ts: float) -> None:
+		index = int(ts // self.width)
+		self._advance(index)
+		if index > self.head - self.bins:
+			slot = index % self.bins
+			self.counts[slot] += 1
+			self.sums[slot] += value
+			self.squares[slot] += value * value
+			self.count += 1
+			self.total += value
+			self.total_sq += value * value
+		if ts >= self._ewma_at:
+			decay = math.exp(-(ts - self._ewma_at) / self.span)
+			self._ewma_sum = self._ewma_sum * decay + value
+			self._ewma_weight = self._ewma_weight * decay + 1.0
+			self._ewma_at = ts
+		else:
+			# Late arrival: weight it by its age instead of decaying the newer history
+			weight = math.exp(-(self._ewma_at - ts) / self.span)
+			self._ewma_sum += value * weight
+			self._ewma_weight += weight
+
+	def stats(self, now: float) -> Dict[str, Any]:
+		self._advance(int(now // self.width))
+		mean = self.total / self.count if self.count else 0.0
+		variance = max(0.0, self.total_sq / self.count - mean * mean) if self.count else 0.0
+		return {
+			"count": self.count,
+			"mean": mean,
+			"ewma": self._ewma_sum / self._ewma_weight if self._ewma_weight else None,
+			"variance": variance,
+			"std": math.sqrt(variance),
+		}
+
+
+class SentimentAggregates:
+	"""Per-symbol rolling sentiment windows (1m/5m/1h/24h), fed by the ingestion workers.
+
+	Every scored social text updates the windows of the symbols it mentions, so
+	recommendations and alerts read history instead of re-scoring a handful of
+	texts per request. Symbols are kept in an LRU bounded by
+	`settings.sentiment_aggregate_max_symbols`.
+	"""
+
+	def __init__(self, max_symbols: int, windows: Optional[Dict[str, Tuple[int, int]]] = None, engine=None):
+		self.max_symbols = max_symbols
+		self.engine = engine or sentiment_engine
+		self.windows = dict(windows or WINDOWS)
+		self._symbols: "OrderedDict[str, Dict[str, RollingWindow]]" = OrderedDict()
+
+	def _series(self, symbol: str, create: bool = False) -> Optional[Dict[str, RollingWindow]]:
+		symbol = symbol.upper()
+		series = self._symbols.get(symbol)
+		if series is None and create:
+			series = self._symbols[symbol] = {name: RollingWindow(span, bins) for name, (span, bins) in self.windows.items()}
+			while len(self._symbols) > self.max_symbols:
+				self._symbols.popitem(last=False)
+		if series is not None:
+			self._symbols.move_to_end(symbol)
+		return series
+
+	def add(self, symbol: str, score: float, ts: Optional[float] = None) -> None:
+		ts = time.time() if ts is None else ts
+		for window in self._series(symbol, create=True).values():
+			window.add(score, ts)
+
+	def window(self, symbol: str, name: str, now: Optional[float] = None) -> Dict[str, Any]:
+		series = self._series(symbol)
+		if series is None:
+			return {"count": 0, "mean": 0.0, "ewma": None, "variance": 0.0, "std": 0.0}
+		return series[name].stats(time.time() if now is None else now)
+
+	def snapshot(self, symbol: str, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+		now = time.time() if now is None else now
+		return {name: self.window(symbol, name, now) for name in self.windows}
+
+	def zscore(self, symbol: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+		"""Recent mean against the baseline window, in standard errors of the recent mean.
+
+		None until both windows hold enough scores to say anything.
+		"""
+		now = time.time() if now is None else now
+		recent = self.window(symbol, settings.alerts_spike_window, now)
+		baseline = self.window(symbol, settings.alerts_baseline_window, now)
+		if recent["count"] < settings.alerts_spike_min_count or baseline["count"] < settings.alerts_baseline_min_count:
+			return None
+		if baseline["std"] == 0:
+			return None
+		z = (recent["mean"] - baseline["mean"]) / (baseline["std"] / math.sqrt(recent["count"]))
+		return {"z": z, "recent": recent, "baseline": baseline}
+
+	async def record(self, entries: Iterable[Tuple[str, str, float]]) -> List[Optional[float]]:
+		"""Score (symbol, text, timestamp) entries in one engine call and add them to the windows.
+
+		Returns each entry's score, None for entries that could not be scored.
+		"""
+		entries = list(entries)
+		texts = list(dict.fromkeys(text for _, text, _ in entries if text))
+		if not texts:
+			return [None] * len(entries)
+		try:
+			labels = dict(zip(texts, await self.engine.analyze(texts)))
+		except Exception as e:
+			print(f"Error scoring sentiment for aggregates: {e}")
+			return [None] * len(entries)
+		scores: List[Optional[float]] = []
+		for symbol, text, ts in entries:
+			score = score_labels(labels[text]) if labels.get(text) else None
+			if score is not None:
+				self.add(symbol, score, ts)
+			scores.append(score)
+		return scores
+
+	def stats(self) -> Dict[str, Any]:
+		return {"symbols": len(self._symbols), "max_symbols": self.max_symbols, "windows": list(self.windows)}
+
+
+# Global sentiment aggregates instance, built on first use
+sentiment_aggregates = Lazy(lambda: SentimentAggregates(settings.sentiment_aggregate_max_symbols))
@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+import json
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.lazy import Lazy
+from app.db import engine, insert_ignore
+from app.models.sentiment import SentimentScore
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+	return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def content_key(model_id: str, text: str) -> str:
+	"""Content address of a scored text: sha256 over the model id and the normalized text."""
+	return hashlib.sha256(f"{model_id}\0{normalize_text(text)}".encode()).hexdigest()
+
+
+class SentimentCache:
+	"""Bounded LRU of FinBERT results keyed by `content_key`, with an optional database layer.
+
+	With `persist` enabled, memory misses are looked up in the `sentiment_scores`
+	table in one query and new results are written back in one bulk insert, so a
+	restarted worker does not start cold.
+	"""
+
+	def __init__(self, max_entries: int, persist: bool = False):
+		self.max_entries = max_entries
+		self.persist = persist
+		self._entries: "OrderedDict[str, Any]" = OrderedDict()
+		self.hits = 0
+		self.persistent_hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def _remember(self, key: str, labels: Any) -> None:
+		self._entries[key] = labels
+		self._entries.move_to_end(key)
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+			self.evictions += 1
+
+	@staticmethod
+	def _load(keys: List[str]) -> Dict[str, Any]:
+		found: Dict[str, Any] = {}
+		with engine.connect() as conn:
+			# Chunked to stay under the database's bound-parameter limit
+			for start in range(0, len(keys), 500):
+				chunk = keys[start:start + 500]
+				rows = conn.execute(select(SentimentScore.key, SentimentScore.labels).where(SentimentScore.key.in_(chunk)))
+				found.update({key: json.loads(labels) for key, labels in rows})
+		return found
+
+	@staticmethod
+	def _save(model_id: str, results: Dict[str, Any]) -> None:
+		rows = [{"key": key, "model": model_id, "labels": json.dumps(labels)} for key, labels in results.items()]
+		with engine.begin() as conn:
+			conn.execute(insert_ignore(SentimentScore.__table__), rows)
+
+	async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+		found: Dict[str, Any] = {}
+		missing: List[str] = []
+		for key in dict.fromkeys(keys):
+			if key in self._entries:
+				self._entries.move_to_end(key)
+				found[key] = self._entries[key]
+				self.hits += 1
+			else:
+				missing.append(key)
+		if missing and self.persist:
+			try:
+				stored = await asyncio.to_thread(self._load, missing)
+			except Exception as e:
+				print(f"Error reading sentiment cache: {e}")
+				stored = {}
+			for key, labels in stored.items():
+				self._remember(key, labels)
+			found.update(stored)
+			self.persistent_hits += len(stored)
+			missing = [key for key in missing if key not in stored]
+		self.misses += len(missing)
+		return found
+
+	async def set_many(self, model_id: str, results: Dict[str, Any]) -> None:
+		for key, labels in results.items():
+			self._remember(key, labels)
+		if results and self.persist:
+			try:
+				await asyncio.to_thread(self._save, model_id, results)
+			except Exception as e:
+				print(f"Error writing sentiment cache: {e}")
+
+	def stats(self) -> Dict[str, Any]:
+		lookups = self.hits + self.persistent_hits + self.misses
+		return {
+			"size": len(self._entries),
+			"persist": self.persist,
+			"hits": self.hits,
+			"persistent_hits": self.persistent_hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+			"hit_ratio": round((self.hits + self.persistent_hits) / lookups, 4) if lookups else 0.0,
+		}
+
+
+# Global sentiment result cache instance, built on first use
+sentiment_cache = Lazy(lambda: SentimentCache(settings.sentiment_cache_max_entries, persist=settings.sentiment_cache_persist))
@@ -0,0 +1,295 @@
+import asyncio
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.http import http_clients
+from app.core.lazy import Lazy
+from app.core.singleflight import singleflight
+from app.services.sentiment_cache import SentimentCache, content_key, sentiment_cache
+
+
+# One FinBERT result per text: [{"label": "positive", "score": 0.93}, ...]
+Labels = List[Dict[str, Any]]
+
+
+class HttpSentimentBackend:
+	"""FinBERT through the hosted Hugging Face Inference API."""
+
+	def __init__(self, model: str, api_key: str):
+		self.model = model
+		self.api_key = api_key
+
+	async def predict(self, texts: List[str]) -> List[Labels]:
+		headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+		url = f"https://api-inference.huggingface.co/models/{self.model}"
+
+		async def fetch() -> List[Labels]:
+			resp = await http_clients.get(url).post(url, headers=headers, json={"inputs": texts}, timeout=40)
+			resp.raise_for_status()
+			data = resp.json()
+			# Flat label lists come back for a single input or top-1 output; make it one list per text
+			if isinstance(data, list) and data and all(isinstance(d, dict) for d in data):
+				data = [data] if len(texts) == 1 else [[d] for d in data]
+			return data
+
+		# Identical text batches (e.g. /alerts and /recommendations for one symbol) share one call
+		return await singleflight.do(("huggingface", self.model, tuple(texts)), fetch)
+
+	async def close(self) -> None:
+		pass
+
+
+class LocalSentimentBackend:
+	"""In-process FinBERT (PyTorch, or ONNX Runtime via optimum) on a worker thread pool.
+
+	The model is loaded lazily on first use inside a worker thread, so importing
+	the app never pays for it. Inference releases the GIL, so it runs alongside
+	the event loop instead of blocking it.
+	"""
+
+	def __init__(self, model: str, onnx: bool = False, workers: int = 1, max_length: int = 512):
+		self.model = model
+		self.onnx = onnx
+		self.max_length = max_length
+		self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="finbert")
+		self._pipeline = None
+		self._lock = threading.Lock()
+
+	def _load(self):
+		with self._lock:
+			if self._pipeline is not None:
+				return self._pipeline
+			try:
+				from transformers import AutoTokenizer, pipeline
+			except ImportError as e:
+				raise RuntimeError(
+					"SENTIMENT_BACKEND=local requires `transformers` plus `torch` or `optimum[onnxruntime]`"
+				) from e
+			model: Any = self.model
+			if self.onnx:
+				from optimum.onnxruntime import ORTModelForSequenceClassification
+
+				exported = os.path.exists(os.path.join(self.model, "model.onnx"))
+				model = ORTModelForSequenceClassification.from_pretrained(self.model, export=not exported)
+			tokenizer = AutoTokenizer.from_pretrained(self.model)
+			self._pipeline = pipeline("text-classification", model=model, tokenizer=tokenizer, top_k=None, device=-1)
+			return self._pipeline
+
+	def _predict_sync(self, texts: List[str]) -> List[Labels]:
+		classify = self._load()
+		return classify(texts, batch_size=len(texts), truncation=True, max_length=self.max_length)
+
+	async def predict(self, texts: List[str]) -> List[Labels]:
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(self._executor, self._predict_sync, texts)
+
+	async def close(self) -> None:
+		self._executor.shutdown(wait=False)
+
+
+class MicroBatcher:
+	"""Merge texts from concurrent callers into model batches.
+
+	The first queued request opens a batch; the batch is flushed once it holds
+	`max_batch_size` texts or `max_wait` seconds have passed, whichever comes
+	first. Up to `concurrency` batches run at once; while all slots are busy the
+	next batch keeps filling, so load turns into bigger batches rather than a
+	longer queue.
+	"""
+
+	def __init__(self, backend, max_batch_size: int, max_wait: float, concurrency: int = 1):
+		self.backend = backend
+		self.max_batch_size = max(1, max_batch_size)
+		self.max_wait = max_wait
+		self.concurrency = max(1, concurrency)
+		self.batches = 0
+		self.texts = 0
+		self._queue: Optional[asyncio.Queue] = None
+		self._worker: Optional[asyncio.Task] = None
+		self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+	def _ensure_worker(self) -> None:
+		loop = asyncio.get_running_loop()
+		if self._worker is None or self._worker.done() or self._loop is not loop:
+			self._loop = loop
+			self._queue = asyncio.Queue()
+			self._worker = loop.create_task(self._run())
+
+	async def submit(self, texts: List[str]) -> List[Labels]:
+		if not texts:
+			return []
+		self._ensure_worker()
+		future: asyncio.Future = self._loop.create_future()
+		self._queue.put_nowait((texts, future))
+		return await future
+
+	async def _collect(self) -> List[Tuple[List[str], asyncio.Future]]:
+		loop = asyncio.get_running_loop()
+		first = await self._queue.get()
+		batch, size = [first], len(first[0])
+		deadline = loop.time() + self.max_wait
+		while size < self.max_batch_size:
+			timeout = deadline - loop.time()
+			if timeout <= 0 and self._queue.empty():
+				break
+			try:
+				item = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+			except asyncio.TimeoutError:
+				break
+			batch.append(item)
+			size += len(item[0])
+		return batch
+
+	async def _run_batch(self, batch: List[Tuple[List[str], asyncio.Future]], slots: asyncio.Semaphore) -> None:
+		try:
+			flat = [text for texts, _ in batch for text in texts]
+			results: List[Labels] = []
+			for start in range(0, len(flat), self.max_batch_size):
+				chunk = flat[start:start + self.max_batch_size]
+				labels = await self.backend.predict(chunk)
+				if not isinstance(labels, list) or len(labels) != len(chunk):
+					raise RuntimeError(f"Sentiment backend returned {type(labels).__name__} for {len(chunk)} texts")
+				results.extend(labels)
+				self.batches += 1
+			self.texts += len(flat)
+			offset = 0
+			for texts, future in batch:
+				if not future.done():
+					future.set_result(results[offset:offset + len(texts)])
+				offset += len(texts)
+		except Exception as e:
+			for _, future in batch:
+				if not future.done():
+					future.set_exception(e)
+		finally:
+			slots.release()
+
+	async def _run(self) -> None:
+		slots = asyncio.Semaphore(self.concurrency)
+		running: set = set()
+		while True:
+			await slots.acquire()
+			batch = await self._collect()
+			task = asyncio.create_task(self._run_batch(batch, slots))
+			running.add(task)
+			task.add_done_callback(running.discard)
+
+	async def close(self) -> None:
+		if self._worker is not None:
+			self._worker.cancel()
+			self._worker = None
+
+	def stats(self) -> Dict[str, Any]:
+		return {
+			"batches": self.batches,
+			"texts": self.texts,
+			"avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+			"max_batch_size": self.max_batch_size,
+			"max_wait_ms": self.max_wait * 1000,
+		}
+
+
+def score_labels(labels: Labels) -> float:
+	"""Collapse one FinBERT result into a numeric sentiment in [-1, 1] (top label, signed, times its score)."""
+	label_map = {"positive": 1.0, "neutral": 0.0, "negative": -1.0}
+	if not labels:
+		return 0.0
+	best = max(labels, key=lambda x: x.get("score", 0))
+	return label_map.get(best.get("label", "neutral").lower(), 0.0) * float(best.get("score", 0))
+
+
+_URL = re.compile(r"https?://\S+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def prepare_text(text: str) -> str:
+	"""Pre-filter a social text for FinBERT: drop URLs, collapse whitespace and
+	truncate at a word boundary to `settings.sentiment_max_chars` (the model reads
+	at most 512 tokens). Returns "" when nothing scoreable is left."""
+	text = _WHITESPACE.sub(" ", _URL.sub(" ", text or "")).strip()
+	if len(text) > settings.sentiment_max_chars:
+		text = text[:settings.sentiment_max_chars].rsplit(" ", 1)[0]
+	return text
+
+
+class SentimentEngine:
+	"""Entry point for FinBERT scoring; the backend is chosen by `settings.sentiment_backend`.
+
+	Every caller goes through `analyze`, which applies `prepare_text` and caches
+	results by content address (model + normalized text), so only texts the
+	model has never seen are sent to the batcher, once each. Texts that are
+	empty after pre-filtering get an empty label list.
+	"""
+
+	def __init__(
+		self,
+		backend,
+		max_batch_size: int,
+		max_wait: float,
+		concurrency: int = 1,
+		cache: Optional[SentimentCache] = None,
+	):
+		self.backend = backend
+		self.batcher = MicroBatcher(backend, max_batch_size, max_wait, concurrency)
+		self.cache = cache
+
+	@property
+	def model_id(self) -> str:
+		return self.backend.model
+
+	async def analyze(self, texts: List[str]) -> List[Labels]:
+		prepared = [prepare_text(text) for text in texts]
+		scoreable = [text for text in prepared if text]
+		if self.cache is None:
+			scored = iter(await self.batcher.submit(scoreable))
+			return [next(scored) if text else [] for text in prepared]
+		keys = [content_key(self.model_id, text) for text in scoreable]
+		known = await self.cache.get_many(keys)
+		unseen = {key: text for key, text in zip(keys, scoreable) if key not in known}
+		if unseen:
+			labels = await self.batcher.submit(list(unseen.values()))
+			fresh = dict(zip(unseen.keys(), labels))
+			await self.cache.set_many(self.model_id, fresh)
+			known.update(fresh)
+		scored = iter(known[key] for key in keys)
+		return [next(scored) if text else [] for text in prepared]
+
+	async def shutdown(self) -> None:
+		await self.batcher.close()
+		await self.backend.close()
+
+	def stats(self) -> Dict[str, Any]:
+		return {
+			"backend": settings.sentiment_backend,
+			"model": self.model_id,
+			**self.batcher.stats(),
+			"cache": self.cache.stats() if self.cache is not None else None,
+		}
+
+
+def _build_engine() -> SentimentEngine:
+	if settings.sentiment_backend == "local":
+		backend: Any = LocalSentimentBackend(
+			settings.sentiment_model,
+			onnx=settings.sentiment_onnx,
+			workers=settings.sentiment_workers,
+		)
+		concurrency = settings.sentiment_workers
+	else:
+		backend = HttpSentimentBackend(settings.sentiment_model, settings.huggingface_api_key)
+		concurrency = settings.sentiment_http_concurrency
+	return SentimentEngine(
+		backend,
+		max_batch_size=settings.sentiment_max_batch_size,
+		max_wait=settings.sentiment_max_wait_ms / 1000,
+		concurrency=concurrency,
+		cache=sentiment_cache,
+	)
+
+
+# Global sentiment engine instance, built on first use
+sentiment_engine = Lazy(_build_engine)
@@ -0,0 +1,272 @@
+import asyncio
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.lazy import Lazy
+from app.core.http import http_clients
+
+
+# Map common symbols to CoinGecko IDs
+CRYPTO_IDS: Dict[str, str] = {
+	"BTC": "bitcoin",
+	"ETH": "ethereum",
+	"SOL": "solana",
+	"ADA": "cardano",
+	"DOT": "polkadot",
+	"MATIC": "matic-network",
+	"AVAX": "avalanche-2",
+	"LINK": "chainlink",
+	"UNI": "uniswap",
+	"ATOM": "cosmos",
+}
+
+# Names that refer to a crypto asset in social text
+CRYPTO_NAMES: Dict[str, str] = {
+	"bitcoin": "BTC",
+	"ethereum": "ETH",
+	"solana": "SOL",
+	"cardano": "ADA",
+	"polkadot": "DOT",
+	"polygon": "MATIC",
+	"avalanche": "AVAX",
+	"chainlink": "LINK",
+	"uniswap": "UNI",
+	"cosmos": "ATOM",
+}
+
+# Seed stock universe, used until (or instead of) the remote symbol lists
+STOCK_SYMBOLS: Dict[str, str] = {
+	"AAPL": "Apple Inc.",
+	"MSFT": "Microsoft Corporation",
+	"GOOGL": "Alphabet Inc.",
+	"GOOG": "Alphabet Inc.",
+	"AMZN": "Amazon.com Inc.",
+	"META": "Meta Platforms Inc.",
+	"NVDA": "NVIDIA Corporation",
+	"TSLA": "Tesla Inc.",
+	"NFLX": "Netflix Inc.",
+	"AMD": "Advanced Micro Devices Inc.",
+	"INTC": "Intel Corporation",
+	"AVGO": "Broadcom Inc.",
+	"ORCL": "Oracle Corporation",
+	"CRM": "Salesforce Inc.",
+	"ADBE": "Adobe Inc.",
+	"PLTR": "Palantir Technologies Inc.",
+	"COIN": "Coinbase Global Inc.",
+	"MSTR": "MicroStrategy Inc.",
+	"HOOD": "Robinhood Markets Inc.",
+	"GME": "GameStop Corp.",
+	"AMC": "AMC Entertainment Holdings Inc.",
+	"SPY": "SPDR S&P 500 ETF Trust",
+	"QQQ": "Invesco QQQ Trust",
+	"JPM": "JPMorgan Chase & Co.",
+	"BAC": "Bank of America Corporation",
+	"V": "Visa Inc.",
+	"MA": "Mastercard Inc.",
+	"DIS": "The Walt Disney Company",
+	"NKE": "Nike Inc.",
+	"BA": "The Boeing Company",
+	"F": "Ford Motor Company",
+	"GM": "General Motors Company",
+	"UBER": "Uber Technologies Inc.",
+	"SHOP": "Shopify Inc.",
+	"BABA": "Alibaba Group Holding Ltd.",
+	"SOFI": "SoFi Technologies Inc.",
+	"RIVN": "Rivian Automotive Inc.",
+	"SNOW": "Snowflake Inc.",
+	"SMCI": "Super Micro Computer Inc.",
+	"ARM": "Arm Holdings plc",
+	"TSM": "Taiwan Semiconductor Manufacturing Co.",
+	"WMT": "Walmart Inc.",
+	"KO": "The Coca-Cola Company",
+	"XOM": "Exxon Mobil Corporation",
+	"BRK.B": "Berkshire Hathaway Inc.",
+}
+
+# Upper-case words that are also tickers; bare mentions are ignored, $CASHTAGS still count
+COMMON_WORDS = frozenset({
+	"A", "I", "AI", "ALL", "AM", "AN", "ANY", "APE", "ARE", "AT", "ATH", "ATM", "BE", "BEST", "BIG", "BY",
+	"CAN", "CASH", "CEO", "CFO", "CPI", "DD", "DO", "EDIT", "EOD", "EPS", "ETF", "EU", "EV", "FED", "FOMO",
+	"FOR", "FUD", "FUN", "GDP", "GO", "GOOD", "HAS", "HE", "HODL", "HOLD", "IMO", "IPO", "IT", "ITM", "IV",
+	"LOL", "LOVE", "LOW", "MOON", "NEW", "NOW", "OK", "ON", "ONE", "OP", "OPEN", "OR", "OTM", "OUT", "PM",
+	"PT", "REAL", "SEC", "SO", "TA", "TLDR", "TO", "TV", "UK", "UP", "US", "USA", "WSB", "YOLO",
+})
+
+# Asset names that are also ordinary words; they only count when capitalized
+COMMON_NAMES = frozenset({"avalanche", "cosmos", "polygon", "stellar", "maker", "near", "flow", "render", "graph"})
+
+_TOKEN = re.compile(r"\$?[A-Za-z][A-Za-z0-9]*(?:\.[A-Z](?![A-Za-z]))?")
+_END = ""
+
+
+class SymbolRegistry:
+	"""Source of truth for the symbol universe: provider routing and mention extraction.
+
+	Starts from the seed lists above and is extended once at startup with the
+	FMP stock list and CoinGecko's top coins (`load`). Mentions are found with a
+	token trie over tickers and asset names, so a text is scanned in one pass
+	regardless of universe size. False-positive rules: bare tickers must be
+	written in capitals, are at least two letters, are not common words and are
+	ignored in mostly upper-case ("shouting") posts; `$CASHTAGS` of known
+	symbols always count; names that are ordinary words must be capitalized.
+	"""
+
+	def __init__(
+		self,
+		crypto_ids: Optional[Dict[str, str]] = None,
+		stocks: Optional[Dict[str, str]] = None,
+		crypto_names: Optional[Dict[str, str]] = None,
+	):
+		self.crypto_ids: Dict[str, str] = dict(CRYPTO_IDS if crypto_ids is None else crypto_ids)
+		self.stocks: Dict[str, str] = dict(STOCK_SYMBOLS if stocks is None else stocks)
+		self.names: Dict[str, str] = dict(CRYPTO_NAMES if crypto_names is None else crypto_names)
+		self.loaded = False
+		self._trie: Dict[str, Any] = {}
+		self._rebuild()
+
+	def is_crypto(self, symbol: str) -> bool:
+		return symbol.upper() in self.crypto_ids
+
+	def asset_type(self, symbol: str) -> str:
+		"""Route a symbol to its provider group ("crypto" or "stock")."""
+		return "crypto" if self.is_crypto(symbol) else "stock"
+
+	def coingecko_id(self, symbol: str) -> str:
+		return self.crypto_ids.get(symbol.upper(), symbol.lower())
+
+	def is_known(self, symbol: str) -> bool:
+		symbol = symbol.upper()
+		return symbol in self.stocks or symbol in self.crypto_ids
+
+	def resolve(self, value: str) -> Optional[str]:
+		"""Canonical symbol for `TSLA`, `$tsla` or `bitcoin`; None if the registry does not know it."""
+		value = value.strip()
+		symbol = value.lstrip("$").upper()
+		if self.is_known(symbol):
+			return symbol
+		return self.names.get(value.lower())
+
+	# Universe updates
+
+	def add_stocks(self, stocks: Dict[str, str]) -> None:
+		self.stocks.update({s.upper(): name for s, name in stocks.items()})
+		self._rebuild()
+
+	def add_crypto(self, coins: Iterable[Tuple[str, str, str]]) -> None:
+		"""Add (symbol, coingecko id, name) entries; symbols already routed as stocks stay stocks."""
+		for symbol, coin_id, name in coins:
+			symbol = symbol.upper()
+			if symbol in self.stocks and symbol not in self.crypto_ids:
+				continue
+			self.crypto_ids.setdefault(symbol, coin_id)
+			if name and len(name) >= 3:
+				self.names.setdefault(name.lower(), symbol)
+		self._rebuild()
+
+	def _rebuild(self) -> None:
+		trie: Dict[str, Any] = {}
+
+		def insert(tokens: List[str], entry: Tuple[str, str]) -> None:
+			node = trie
+			for token in tokens:
+				node = node.setdefault(token, {})
+			node.setdefault(_END, []).append(entry)
+
+		for symbol in (*self.stocks, *self.crypto_ids):
+			insert([symbol.lower()], ("ticker", symbol))
+		for name, symbol in self.names.items():
+			tokens = [t.lower() for t in _TOKEN.findall(name)]
+			if tokens:
+				insert(tokens, ("name", symbol))
+		# Swap in one assignment so concurrent readers never see a partial trie
+		self._trie = trie
+
+	async def _fetch_stocks(self) -> Dict[str, str]:
+		url = "https://financialmodelingprep.com/api/v3/stock/list"
+		resp = await http_clients.get(url).get(url, params={"apikey": settings.financial_modeling_prep_api_key}, timeout=30)
+		resp.raise_for_status()
+		exchanges = set(settings.symbol_registry_exchanges)
+		return {
+			item["symbol"]: item.get("name") or item["symbol"]
+			for item in resp.json()
+			if item.get("symbol") and item.get("exchangeShortName") in exchanges and item.get("type") in ("stock", "etf")
+		}
+
+	async def _fetch_crypto(self) -> List[Tuple[str, str, str]]:
+		url = "https://api.coingecko.com/api/v3/coins/markets"
+		params = {"vs_currency": "usd", "order": "market_cap_desc", "per_page": settings.symbol_registry_crypto_limit, "page": 1}
+		headers = {"x-cg-demo-api-key": settings.coingecko_api_key} if settings.coingecko_api_key else {}
+		resp = await http_clients.get(url).get(url, params=params, headers=headers, timeout=30)
+		resp.raise_for_status()
+		return [(c["symbol"], c["id"], c.get("name", "")) for c in resp.json() if c.get("symbol") and c.get("id")]
+
+	async def load(self) -> None:
+		"""Extend the seed universe with the remote stock and coin lists (once, at startup)."""
+		stocks, coins = await asyncio.gather(self._fetch_stocks(), self._fetch_crypto(), return_exceptions=True)
+		if isinstance(stocks, Exception):
+			print(f"Error loading stock symbols: {stocks}")
+		else:
+			self.add_stocks(stocks)
+		if isinstance(coins, Exception):
+			print(f"Error loading crypto symbols: {coins}")
+		else:
+			self.add_crypto(coins)
+		self.loaded = True
+
+	# Mention extraction
+
+	@staticmethod
+	def _shouting(tokens: List[str]) -> bool:
+		words = [t for t in tokens if t[0] != "$" and len(t) > 1]
+		return len(words) >= 4 and sum(t.isupper() for t in words) > 0.6 * len(words)
+
+	def extract(self, text: str) -> List[str]:
+		"""Distinct symbols mentioned in `text`, in order of first mention."""
+		if not text:
+			return []
+		trie = self._trie
+		tokens = _TOKEN.findall(text)
+		found: Dict[str, None] = {}
+		shouting: Optional[bool] = None
+		i, n = 0, len(tokens)
+		while i < n:
+			raw = tokens[i]
+			cashtag = raw[0] == "$"
+			word = raw[1:] if cashtag else raw
+			node = trie.get(word.lower())
+			match, end, j = None, i, i
+			while node is not None:
+				for kind, symbol in node.get(_END, ()):
+					if kind == "ticker" and j == i:
+						if not cashtag:
+							if len(word) < 2 or not word.isupper() or word in COMMON_WORDS:
+								continue
+							if shouting is None:
+								shouting = self._shouting(tokens)
+							if shouting:
+								continue
+					elif kind == "name":
+						if cashtag or (word.lower() in COMMON_NAMES and not word[0].isupper()):
+							continue
+					else:
+						continue
+					match, end = symbol, j
+					break
+				j += 1
+				if j >= n or tokens[j][0] == "$":
+					break
+				node = node.get(tokens[j].lower())
+			if match is not None:
+				found.setdefault(match, None)
+				i = end + 1
+			else:
+				i += 1
+		return list(found)
+
+	def extract_many(self, texts: Iterable[str]) -> List[List[str]]:
+		return [self.extract(text) for text in texts]
+
+
+# Global symbol registry instance, built on first use
+symbol_registry = Lazy(SymbolRegistry)
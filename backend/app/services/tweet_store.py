@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+
+from app.db import engine, insert_ignore
+from app.models.social import Tweet
+
+
+def parse_created_at(value: Optional[str]) -> datetime:
+	if not value:
+		return datetime.now(timezone.utc)
+	return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class TweetStore:
+	"""Local tweet store written by the ingestion worker and read by the request path.
+
+	Writes are deduplicated bulk inserts: a tweet already stored for a symbol is
+	skipped and left out of the result, so a re-fetched page is not scored
+	twice. Reads are a single range scan on the (symbol, created_at) index.
+	"""
+
+	@staticmethod
+	def _rows(symbol: str, tweets: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+		rows = {}
+		for tweet in tweets:
+			if not tweet.get("id") or not tweet.get("text"):
+				continue
+			metrics = tweet.get("public_metrics") or {}
+			rows[tweet["id"]] = {
+				"id": tweet["id"],
+				"symbol": symbol,
+				"text": tweet["text"],
+				"author_id": tweet.get("author_id"),
+				"lang": tweet.get("lang"),
+				"like_count": metrics.get("like_count", 0),
+				"retweet_count": metrics.get("retweet_count", 0),
+				"reply_count": metrics.get("reply_count", 0),
+				"created_at": parse_created_at(tweet.get("created_at")),
+			}
+		return list(rows.values())
+
+	@classmethod
+	def _save(cls, symbol: str, tweets: List[Dict[str, Any]]) -> List[str]:
+		rows = cls._rows(symbol, tweets)
+		if not rows:
+			return []
+		with engine.begin() as conn:
+			stored = set(conn.execute(
+				select(Tweet.id).where(Tweet.symbol == symbol, Tweet.id.in_([row["id"] for row in rows]))
+			).scalars())
+			rows = [row for row in rows if row["id"] not in stored]
+			if rows:
+				conn.execute(insert_ignore(Tweet.__table__), rows)
+		return [row["id"] for row in rows]
+
+	@staticmethod
+	def _recent(symbols: List[str], limit: int, since: datetime) -> Dict[str, List[Dict[str, Any]]]:
+		ranked = (
+			select(
+				Tweet.symbol,
+				Tweet.text,
+				Tweet.author_id,
+				Tweet.like_count,
+				Tweet.retweet_count,
+				Tweet.reply_count,
+				Tweet.created_at,
+				func.row_number().over(partition_by=Tweet.symbol, order_by=Tweet.created_at.desc()).label("rank"),
+			)
+			.where(Tweet.symbol.in_(symbols), Tweet.created_at >= since)
+			.subquery()
+		)
+		query = (
+			select(ranked.c.symbol, ranked.c.text, ranked.c.author_id, ranked.c.like_count, ranked.c.retweet_count, ranked.c.reply_count)
+			.where(ranked.c.rank <= limit)
+			.order_by(ranked.c.symbol, ranked.c.created_at.desc())
+		)
+		posts: Dict[str, List[Dict[str, Any]]] = {symbol: [] for symbol in symbols}
+		with engine.connect() as conn:
+			for row in conn.execute(query).mappings():
+				post = dict(row)
+				posts[post.pop("symbol")].append(post)
+		return posts
+
+	async def save(self, symbol: str, tweets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+		"""Store `tweets` for `symbol` and return the ones that were not stored yet (a re-fetched page returns [])."""
+		new = set(await asyncio.to_thread(self._save, symbol.upper(), tweets))
+		fresh = []
+		for tweet in tweets:
+			if tweet.get("id") in new:
+				new.discard(tweet["id"])
+				fresh.append(tweet)
+		return fresh
+
+	async def recent_posts(
+		self, symbols: List[str], limit: int = 10, window_hours: float = 24
+	) -> Dict[str, List[Dict[str, Any]]]:
+		"""Newest posts per symbol from the last `window_hours` (text, author_id and engagement counts), in one query."""
+		symbols = list(dict.fromkeys(s.upper() for s in symbols))
+		since = datetime.now(timezone.utc) - timedelta(hours=window_hours)
+		return await asyncio.to_thread(self._recent, symbols, limit, since)
+
+	async def recent_texts(self, symbols: List[str], limit: int = 10, window_hours: float = 24) -> Dict[str, List[str]]:
+		"""Newest texts per symbol from the last `window_hours`, in one query for all symbols."""
+		posts = await self.recent_posts(symbols, limit, window_hours)
+		return {symbol: [post["text"] for post in rows] for symbol, rows in posts.items()}
+
+
+# Global tweet store instance
+tweet_store = TweetStore()
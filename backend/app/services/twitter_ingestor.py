@@ -0,0 +1,164 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.rate_limit import BACKGROUND, priority
+from app.services.influencer_engine import influencer_engine
+from app.services.ingestion_cursors import cursor_store
+from app.services.sentiment_aggregates import sentiment_aggregates
+from app.services.tweet_store import parse_created_at, tweet_store
+from app.services.twitter_service import twitter_service
+
+
+class SweepInterrupted(Exception):
+	"""A sweep failed after storing `saved` new tweets; the next one resumes from its page checkpoint."""
+
+	def __init__(self, error: Exception, saved: int):
+		super().__init__(f"{str(error) or type(error).__name__} (after storing {saved} tweets)")
+		self.saved = saved
+
+
+class TwitterIngestor:
+	"""Background worker that keeps the local tweet store current for a cashtag watchlist.
+
+	Each sweep pages through recent search newest-first. The page token is
+	checkpointed after every stored page, so an interrupted sweep resumes where
+	it stopped; once a sweep completes, the newest tweet id becomes the
+	`since_id` of the next one and only new tweets are requested.
+	"""
+
+	source = "twitter"
+
+	def __init__(self, symbols: Optional[List[str]] = None):
+		self.symbols = symbols
+		self.ingested = 0
+		self.last_run: Optional[str] = None
+		self.errors: Dict[str, str] = {}
+		self._task: Optional[asyncio.Task] = None
+
+	@property
+	def universe(self) -> List[str]:
+		symbols = self.symbols or settings.twitter_ingest_symbols or settings.alerts_watchlist
+		return list(dict.fromkeys(s.upper() for s in symbols))
+
+	@staticmethod
+	def _observe(
+		sym: str,
+		tweets: List[Dict[str, Any]],
+		created: List[float],
+		scores: List[Optional[float]],
+		users: List[Dict[str, Any]],
+	) -> None:
+		authors = {user.get("id"): user for user in users}
+		for tweet, ts, score in zip(tweets, created, scores):
+			author = authors.get(tweet.get("author_id"), {})
+			metrics = tweet.get("public_metrics") or {}
+			influencer_engine.observe(
+				"twitter",
+				tweet.get("author_id"),
+				sym,
+				score,
+				ts,
+				engagement=sum(metrics.get(k, 0) for k in ("like_count", "retweet_count", "reply_count", "quote_count")),
+				followers=(author.get("public_metrics") or {}).get("followers_count"),
+				name=author.get("username"),
+			)
+
+	async def ingest_symbol(self, sym: str) -> int:
+		import httpx  # loaded by the shared client pool by now; kept off the app import path
+
+		cursor = await cursor_store.get(self.source, sym)
+		since_id, next_token = cursor["since_id"], cursor["next_token"]
+		newest = cursor["pending_since_id"] if next_token else None
+		saved = 0
+		try:
+			for _ in range(settings.twitter_ingest_max_pages):
+				try:
+					page = await twitter_service.search_recent(
+						query=f"${sym} lang:en -is:retweet",
+						max_results=settings.twitter_ingest_page_size,
+						since_id=since_id,
+						next_token=next_token,
+					)
+				except httpx.HTTPStatusError as e:
+					if next_token and e.response.status_code == 400:
+						# Expired page token: restart the sweep from the last completed checkpoint
+						await cursor_store.save(self.source, sym, since_id=since_id)
+					raise
+				meta = page.get("meta", {})
+				newest = newest or meta.get("newest_id")
+				# Only tweets not stored before reach the aggregates and the influencer engine
+				tweets = await tweet_store.save(sym, page.get("data", []))
+				saved += len(tweets)
+				created = [parse_created_at(t.get("created_at")).timestamp() for t in tweets]
+				scores = await sentiment_aggregates.record(
+					(sym, t.get("text", ""), ts) for t, ts in zip(tweets, created)
+				)
+				self._observe(sym, tweets, created, scores, page.get("includes", {}).get("users", []))
+				next_token = meta.get("next_token")
+				if not next_token:
+					break
+				await cursor_store.save(self.source, sym, since_id=since_id, next_token=next_token, pending_since_id=newest)
+		except Exception as e:
+			if not saved:
+				raise
+			# Pages stored before the failure count; the resumed sweep skips them as already stored
+			raise SweepInterrupted(e, saved) from e
+		if not next_token:
+			await cursor_store.save(self.source, sym, since_id=newest or since_id)
+		return saved
+
+	async def run_once(self) -> Dict[str, int]:
+		slots = asyncio.Semaphore(settings.twitter_ingest_concurrency)
+
+		async def one(sym: str) -> int:
+			async with slots:
+				try:
+					saved = await self.ingest_symbol(sym)
+					self.errors.pop(sym, None)
+					return saved
+				except Exception as e:
+					print(f"Error ingesting tweets for {sym}: {e}")
+					self.errors[sym] = str(e)
+					return e.saved if isinstance(e, SweepInterrupted) else 0
+
+		symbols = self.universe
+		counts = dict(zip(symbols, await asyncio.gather(*(one(sym) for sym in symbols))))
+		self.ingested += sum(counts.values())
+		self.last_run = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+		return counts
+
+	async def stats(self) -> Dict[str, Any]:
+		return {
+			"running": self._task is not None,
+			"symbols": self.universe,
+			"ingested": self.ingested,
+			"last_run": self.last_run,
+			"errors": self.errors,
+			"cursors": await cursor_store.all(self.source),
+		}
+
+	async def _run(self) -> None:
+		# Queue behind interactive requests for provider rate limit tokens
+		with priority(BACKGROUND):
+			while True:
+				await self.run_once()
+				await asyncio.sleep(settings.twitter_ingest_interval)
+
+	async def start(self) -> None:
+		if self._task is None:
+			self._task = asyncio.create_task(self._run())
+
+	async def stop(self) -> None:
+		task, self._task = self._task, None
+		if task is not None:
+			task.cancel()
+			try:
+				await task
+			except asyncio.CancelledError:
+				pass
+
+
+# Global Twitter ingestion worker instance
+twitter_ingestor = TwitterIngestor()
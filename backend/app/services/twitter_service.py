@@ -1,26 +1,50 @@
-import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.core.config import settings
+from app.core.lazy import Lazy
+from app.core.http import http_clients
+from app.core.rate_limit import RateLimited, rate_limits, retry_after
+from app.core.singleflight import flight_key, singleflight
 
 
 class TwitterService:
 	def __init__(self):
 		self.bearer = settings.twitter_bearer_token
 
-	async def search_recent(self, query: str, max_results: int = 10) -> Dict[str, Any]:
+	async def search_recent(
+		self,
+		query: str,
+		max_results: int = 10,
+		since_id: Optional[str] = None,
+		next_token: Optional[str] = None,
+	) -> Dict[str, Any]:
 		url = "https://api.twitter.com/2/tweets/search/recent"
 		headers = {"Authorization": f"Bearer {self.bearer}"}
 		params = {
 			"query": query,
 			"max_results": max(10, min(max_results, 100)),
 			"tweet.fields": "created_at,public_metrics,lang,entities,author_id",
+			# Authors come back under includes.users, with their follower counts
+			"expansions": "author_id",
+			"user.fields": "username,public_metrics",
 		}
-		async with httpx.AsyncClient(timeout=20) as client:
-			resp = await client.get(url, headers=headers, params=params)
+		if since_id:
+			params["since_id"] = since_id
+		if next_token:
+			params["next_token"] = next_token
+
+		async def fetch() -> Dict[str, Any]:
+			await rate_limits.acquire("twitter", self.bearer)
+			resp = await http_clients.get(url).get(url, headers=headers, params=params, timeout=20)
+			if resp.status_code == 429:
+				delay = retry_after(resp.headers)
+				await rate_limits.throttled("twitter", self.bearer, delay)
+				raise RateLimited("twitter", delay)
 			resp.raise_for_status()
 			return resp.json()
 
+		return await singleflight.do(flight_key("twitter", url, params), fetch)
+
 
-twitter_service = TwitterService()
+twitter_service = Lazy(TwitterService)
 
 
@@ -0,0 +1,193 @@
+import hashlib
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# Engagement = likes + 2 * retweets + replies + quotes (a retweet carries the text to a new audience)
+ENGAGEMENT_WEIGHTS = {"like_count": 1.0, "retweet_count": 2.0, "reply_count": 1.0, "quote_count": 1.0}
+
+# Posts whose 64-bit SimHashes differ in at most this many bits count as near-duplicates
+# (unrelated texts differ in ~32 bits; a changed word in a tweet moves a handful)
+NEAR_DUPLICATE_BITS = 6
+# Candidates checked per post in each band's sorted order
+_NEIGHBOURS = 8
+
+_FINGERPRINT_CACHE_SIZE = 100_000
+_fingerprints: "OrderedDict[str, int]" = OrderedDict()
+
+_URL = re.compile(r"https?://\S+")
+_MENTION = re.compile(r"@\w+")
+_NUMBER = re.compile(r"\d+")
+_TOKEN = re.compile(r"[$#]?\w+")
+
+_M1, _M2, _M4, _H01 = (np.uint64(v) for v in (0x5555555555555555, 0x3333333333333333, 0x0F0F0F0F0F0F0F0F, 0x0101010101010101))
+
+
+def _tokens(text: str) -> List[str]:
+	"""Word tokens of a post with URLs, @mentions and the digits of numbers masked, so templated spam collides."""
+	text = _NUMBER.sub("0", _MENTION.sub(" ", _URL.sub(" ", text.lower())))
+	return _TOKEN.findall(text)
+
+
+@lru_cache(maxsize=65536)
+def _token_hash(token: str) -> int:
+	return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little", signed=True)
+
+
+def _simhash_batch(texts: List[str]) -> np.ndarray:
+	counts = np.zeros(len(texts), dtype=np.int64)
+	hashes: List[int] = []
+	for i, text in enumerate(texts):
+		tokens = _tokens(text)
+		counts[i] = len(tokens)
+		hashes.extend(map(_token_hash, tokens))
+	fingerprints = np.zeros(len(texts), dtype="<u8")
+	if hashes:
+		bits = np.unpackbits(np.array(hashes, dtype="<i8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+		has_tokens = counts > 0
+		starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[has_tokens]
+		# A bit is set when more than half of the text's tokens vote for it
+		ones = np.add.reduceat(bits, starts, axis=0, dtype=np.int32)
+		majority = (2 * ones > counts[has_tokens, None]).astype(np.uint8)
+		fingerprints[has_tokens] = np.packbits(majority, axis=1, bitorder="little").view("<u8").ravel()
+	return fingerprints
+
+
+def simhash(texts: Sequence[str]) -> np.ndarray:
+	"""64-bit SimHash of every text, one uint64 per text.
+
+	Token hashes are stable across processes and cached (social vocabulary
+	repeats heavily). Texts not fingerprinted before are tokenized once and
+	their per-bit votes run as one numpy reduction over all their tokens;
+	the fingerprints are kept in an LRU, since the same stored posts are
+	weighted again on every request for their symbol.
+	"""
+	distinct = list(dict.fromkeys(texts))
+	unseen = [text for text in distinct if text not in _fingerprints]
+	if unseen:
+		_fingerprints.update(zip(unseen, _simhash_batch(unseen).tolist()))
+	fingerprints = np.fromiter((_fingerprints[text] for text in texts), dtype=np.uint64, count=len(texts))
+	for text in distinct:
+		_fingerprints.move_to_end(text)
+	while len(_fingerprints) > _FINGERPRINT_CACHE_SIZE:
+		_fingerprints.popitem(last=False)
+	return fingerprints
+
+
+def popcount(values: np.ndarray) -> np.ndarray:
+	"""Set bits per uint64 (SWAR; numpy < 2 has no bitwise_count)."""
+	x = values - ((values >> np.uint64(1)) & _M1)
+	x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+	x = (x + (x >> np.uint64(4))) & _M4
+	return ((x * _H01) >> np.uint64(56)).astype(np.int64)
+
+
+def near_duplicate_clusters(fingerprints: np.ndarray, max_distance: int = NEAR_DUPLICATE_BITS) -> np.ndarray:
+	"""Cluster label of every fingerprint; near-duplicates share a label.
+
+	Identical fingerprints (templated spam after masking) collapse first.
+	The distinct ones are matched with banded LSH: the 64 bits are cut into
+	`max_distance + 1` bands, so two fingerprints within `max_distance` bits
+	agree on at least one band. Sorting by (band, fingerprint) puts those
+	candidates next to each other; each is checked against its next
+	`_NEIGHBOURS` entries with a popcount of the XOR, and the matches are
+	joined by min-label propagation. No all-pairs comparison happens.
+	"""
+	distinct, inverse = np.unique(fingerprints, return_inverse=True)
+	labels = np.arange(len(distinct))
+	if len(distinct) < 2:
+		return labels[inverse]
+	bands = max_distance + 1
+	width = 64 // bands
+	mask = np.uint64((1 << width) - 1)
+	left: List[np.ndarray] = []
+	right: List[np.ndarray] = []
+	for band in range(bands):
+		keys = (distinct >> np.uint64(band * width)) & mask
+		# np.unique sorted `distinct`, so a stable sort on the band keeps fingerprint order inside a run
+		order = np.argsort(keys, kind="stable")
+		for offset in range(1, min(_NEIGHBOURS, len(order) - 1) + 1):
+			a, b = order[:-offset], order[offset:]
+			close = (keys[a] == keys[b]) & (popcount(distinct[a] ^ distinct[b]) <= max_distance)
+			left.append(a[close])
+			right.append(b[close])
+	a, b = np.concatenate(left), np.concatenate(right)
+	while len(a):
+		joined = np.minimum(labels[a], labels[b])
+		if np.array_equal(joined, labels[a]) and np.array_equal(joined, labels[b]):
+			break
+		np.minimum.at(labels, a, joined)
+		np.minimum.at(labels, b, joined)
+	return labels[inverse]
+
+
+def engagement(posts: Sequence[Dict[str, Any]]) -> np.ndarray:
+	total = np.zeros(len(posts))
+	for key, weight in ENGAGEMENT_WEIGHTS.items():
+		total += weight * np.fromiter((post.get(key) or 0 for post in posts), dtype=np.float64, count=len(posts))
+	return total
+
+
+def post_weights(posts: Sequence[Dict[str, Any]], clusters: Optional[np.ndarray] = None) -> np.ndarray:
+	"""Weight of every post: engagement times author reach, shared out over near-duplicates and per author.
+
+	Base weight is (1 + log1p(engagement)) * (1 + log10(1 + followers) / 7),
+	so a viral post or a large account counts for more but logarithmically.
+	A cluster of near-duplicates shares one post's worth of weight, and so do
+	all posts of one author, so neither a bot wave nor one account posting on
+	repeat can outvote distinct voices.
+	"""
+	n = len(posts)
+	if n == 0:
+		return np.zeros(0)
+	followers = np.array([float(post.get("followers") or 0) for post in posts], dtype=np.float64)
+	weights = (1 + np.log1p(np.maximum(engagement(posts), 0))) * (1 + np.log10(1 + followers) / 7)
+	if clusters is None:
+		clusters = near_duplicate_clusters(simhash([post.get("text") or "" for post in posts]))
+	_, cluster_index, cluster_sizes = np.unique(clusters, return_inverse=True, return_counts=True)
+	# Posts without an author id count as their own author
+	authors = np.array([post.get("author_id") or f"#{i}" for i, post in enumerate(posts)], dtype=object)
+	_, author_index, author_posts = np.unique(authors, return_inverse=True, return_counts=True)
+	return weights / cluster_sizes[cluster_index] / author_posts[author_index]
+
+
+def weighted_mean(scores: np.ndarray, posts: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+	"""Engagement-weighted sentiment of scored posts (NaN scores are skipped)."""
+	scored = np.flatnonzero(~np.isnan(scores))
+	posts = [posts[i] for i in scored]
+	scores = scores[scored]
+	if not posts:
+		return {"sentiment": None, "posts": 0, "unique_posts": 0, "authors": 0, "effective_posts": 0.0}
+	clusters = near_duplicate_clusters(simhash([post.get("text") or "" for post in posts]))
+	weights = post_weights(posts, clusters)
+	total = float(weights.sum())
+	return {
+		"sentiment": float(np.dot(weights, scores) / total) if total else 0.0,
+		"posts": len(posts),
+		"unique_posts": int(len(np.unique(clusters))),
+		"authors": len({post.get("author_id") or f"#{i}" for i, post in enumerate(posts)}),
+		# Kish effective sample size: how many equally weighted posts this is worth
+		"effective_posts": round(total * total / float(np.dot(weights, weights)), 2) if total else 0.0,
+	}
+
+
+def tweet_posts(page: Dict[str, Any]) -> List[Dict[str, Any]]:
+	"""Flatten a recent-search page into posts: text, author id, public metrics and the author's followers."""
+	users = {user.get("id"): user for user in page.get("includes", {}).get("users", [])}
+	posts = []
+	for tweet in page.get("data", []):
+		if not tweet.get("text"):
+			continue
+		metrics = tweet.get("public_metrics") or {}
+		author = users.get(tweet.get("author_id"), {})
+		posts.append({
+			"text": tweet["text"],
+			"author_id": tweet.get("author_id"),
+			**{key: metrics.get(key, 0) for key in ENGAGEMENT_WEIGHTS},
+			"followers": (author.get("public_metrics") or {}).get("followers_count"),
+		})
+	return posts
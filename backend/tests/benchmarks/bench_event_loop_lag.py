@@ -0,0 +1,105 @@
+"""Event-loop lag under a burst of OTP emails and logins, before and after offloading.
+
+"Before" runs what the handlers used to do on the loop: a blocking smtplib
+conversation per email and bcrypt in the calling thread. "After" queues the
+email on the outbox and verifies the password on the bounded bcrypt pool. A
+ticker measures how late the loop wakes up (what every concurrent
+market-data request would wait on top of its own work). The SMTP stub runs
+in its own thread so a blocked loop cannot stall it.
+
+	cd backend && python tests/benchmarks/bench_event_loop_lag.py [requests]
+"""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import tests.conftest  # noqa: E402,F401  (Settings env defaults)
+
+from stub_server import percentile  # noqa: E402
+from app.services.auth_service import hash_password, verify_password, verify_password_async  # noqa: E402
+from app.services.email_outbox import EmailOutbox  # noqa: E402
+from app.services.email_service import EmailService  # noqa: E402
+from tests.smtp_stub import SmtpStub  # noqa: E402
+
+
+SMTP_DELAY = 0.02
+TICK = 0.005
+
+
+def start_smtp() -> SmtpStub:
+	ready = threading.Event()
+	holder = {}
+
+	def serve() -> None:
+		async def main() -> None:
+			async with SmtpStub(delay=SMTP_DELAY) as smtp:
+				holder["smtp"] = smtp
+				ready.set()
+				await asyncio.Event().wait()
+
+		asyncio.run(main())
+
+	threading.Thread(target=serve, daemon=True).start()
+	ready.wait()
+	return holder["smtp"]
+
+
+async def measure(label: str, burst) -> None:
+	lags = []
+	stop = asyncio.Event()
+
+	async def ticker() -> None:
+		while not stop.is_set():
+			start = time.perf_counter()
+			await asyncio.sleep(TICK)
+			lags.append((time.perf_counter() - start - TICK) * 1000)
+
+	task = asyncio.create_task(ticker())
+	start = time.perf_counter()
+	await burst()
+	elapsed = time.perf_counter() - start
+	stop.set()
+	await task
+	print(
+		f"{label:>34}: loop lag p50={percentile(lags, 50):7.1f}ms p99={percentile(lags, 99):7.1f}ms "
+		f"max={max(lags):7.1f}ms  burst took {elapsed:5.2f}s"
+	)
+
+
+async def main(requests: int) -> None:
+	smtp = start_smtp()
+	service = EmailService()
+	service.smtp_server, service.smtp_port, service.use_tls = "127.0.0.1", smtp.port, False
+	outbox = EmailOutbox(service, workers=2, max_queue=10000, max_attempts=3, backoff=0.1, idle_timeout=30)
+	password_hash = hash_password("correct horse")
+
+	async def blocking_request(i: int) -> None:
+		service.send_otp_email(f"user{i}@example.com", "123456")
+		verify_password("correct horse", password_hash)
+
+	async def offloaded_request(i: int) -> None:
+		outbox.send_otp(f"user{i}@example.com", "123456")
+		await verify_password_async("correct horse", password_hash)
+
+	async def burst(handler):
+		await asyncio.gather(*(handler(i) for i in range(requests)))
+
+	print(f"-- {requests} concurrent send-otp + login requests, SMTP stub {SMTP_DELAY * 1000:.0f}ms/message")
+	await measure("blocking SMTP + bcrypt (before)", lambda: burst(blocking_request))
+	connections = smtp.connections
+	await measure("outbox + bcrypt pool (after)", lambda: burst(offloaded_request))
+	start = time.perf_counter()
+	await outbox.drain()
+	print(
+		f"{'SMTP connections':>34}: before={connections} after={smtp.connections - connections} "
+		f"(outbox drained {time.perf_counter() - start:.2f}s after the burst)"
+	)
+	await outbox.stop()
+
+
+if __name__ == "__main__":
+	asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
@@ -0,0 +1,70 @@
+"""Handshake count and latency: per-call httpx clients vs. the shared pool.
+
+Simulates `/market/overview` (12 concurrent quote calls) against a local stub
+server and reports TCP connections opened plus p50/p99 per-call latency.
+
+	cd backend && python tests/benchmarks/bench_http_pool.py [rounds]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import tests.conftest  # noqa: E402,F401  (Settings env defaults)
+
+import httpx  # noqa: E402
+
+from stub_server import StubServer, percentile  # noqa: E402
+from app.core.http import HttpClientPool  # noqa: E402
+
+
+CALLS_PER_OVERVIEW = 12
+
+
+async def _timed(coro_factory, latencies: list) -> None:
+	start = time.perf_counter()
+	await coro_factory()
+	latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def run_fresh_clients(url: str, rounds: int) -> list:
+	latencies: list = []
+
+	async def call():
+		async with httpx.AsyncClient() as client:
+			(await client.get(url)).json()
+
+	for _ in range(rounds):
+		await asyncio.gather(*[_timed(call, latencies) for _ in range(CALLS_PER_OVERVIEW)])
+	return latencies
+
+
+async def run_pooled(url: str, rounds: int) -> list:
+	latencies: list = []
+	pool = HttpClientPool()
+
+	async def call():
+		(await pool.get(url).get(url)).json()
+
+	for _ in range(rounds):
+		await asyncio.gather(*[_timed(call, latencies) for _ in range(CALLS_PER_OVERVIEW)])
+	await pool.shutdown()
+	return latencies
+
+
+async def main(rounds: int) -> None:
+	async with StubServer(delay=0.002) as server:
+		url = f"{server.url}/query"
+		for name, runner in (("fresh client per call", run_fresh_clients), ("shared pool", run_pooled)):
+			server.reset()
+			latencies = await runner(url, rounds)
+			print(
+				f"{name:>22}: requests={server.requests} handshakes={server.connections} "
+				f"p50={percentile(latencies, 50):.2f}ms p99={percentile(latencies, 99):.2f}ms"
+			)
+
+
+if __name__ == "__main__":
+	asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
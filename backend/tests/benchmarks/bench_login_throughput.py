@@ -0,0 +1,118 @@
+"""Login throughput under concurrent load: threadpool ORM sessions vs the async engine.
+
+"Before" is the previous login handler: a sync session from `get_db` with
+the user lookup pushed to `asyncio.to_thread`. "After" is `/auth/login` on
+the async engine. Users are created with cheap bcrypt hashes (4 rounds) so
+the database path, not bcrypt, dominates. While each burst runs, a probe
+stands in for the market endpoints that also use the default thread pool
+(e.g. `/market/history`) and records how long it queues.
+
+SQLite by default; pass a PostgreSQL URL to measure the asyncpg pool.
+
+	cd backend && python tests/benchmarks/bench_login_throughput.py [logins] [concurrency] [database_url]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+if len(sys.argv) > 3:
+	os.environ["DATABASE_URL"] = sys.argv[3]
+else:
+	os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_login.db"))
+
+import tests.conftest  # noqa: E402,F401  (Settings env defaults)
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, HTTPException  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from stub_server import percentile  # noqa: E402
+from app.api.routes import LoginRequest, api_router  # noqa: E402
+from app.db import Base, SessionLocal, async_db, engine, get_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.auth_service import create_access_token, get_user_by_email, pwd_context, verify_password_async  # noqa: E402
+
+
+USERS = 200
+PROBE_INTERVAL = 0.01
+
+
+def build_app() -> FastAPI:
+	app = FastAPI()
+	app.include_router(api_router)
+
+	@app.post("/bench/login-threadpool")
+	async def login_threadpool(payload: LoginRequest, db: Session = Depends(get_db)):
+		user = await asyncio.to_thread(get_user_by_email, db, payload.email)
+		if not user or not await verify_password_async(payload.password, user.password_hash):
+			raise HTTPException(status_code=401, detail="Invalid credentials")
+		return {"access_token": create_access_token({"sub": user.email, "uid": user.id}), "token_type": "bearer"}
+
+	return app
+
+
+def seed() -> None:
+	Base.metadata.create_all(bind=engine, tables=[User.__table__])
+	password_hash = pwd_context.hash("correct horse", rounds=4)
+	with SessionLocal() as db:
+		known = {email for (email,) in db.query(User.email).filter(User.email.like("bench%"))}
+		db.add_all(
+			User(email=f"bench{i}@example.com", password_hash=password_hash)
+			for i in range(USERS)
+			if f"bench{i}@example.com" not in known
+		)
+		db.commit()
+
+
+async def burst(client: httpx.AsyncClient, path: str, logins: int, concurrency: int) -> None:
+	slots = asyncio.Semaphore(concurrency)
+	latencies, probes = [], []
+	done = asyncio.Event()
+
+	async def login(i: int) -> None:
+		async with slots:
+			start = time.perf_counter()
+			response = await client.post(path, json={"email": f"bench{i % USERS}@example.com", "password": "correct horse"})
+			assert response.status_code == 200, response.text
+			latencies.append((time.perf_counter() - start) * 1000)
+
+	async def probe() -> None:
+		while not done.is_set():
+			start = time.perf_counter()
+			await asyncio.to_thread(time.sleep, 0)
+			probes.append((time.perf_counter() - start) * 1000)
+			await asyncio.sleep(PROBE_INTERVAL)
+
+	prober = asyncio.create_task(probe())
+	start = time.perf_counter()
+	await asyncio.gather(*(login(i) for i in range(logins)))
+	elapsed = time.perf_counter() - start
+	done.set()
+	await prober
+	print(
+		f"{path:>26}: {logins / elapsed:7.0f} logins/s  p50={percentile(latencies, 50):6.1f}ms "
+		f"p99={percentile(latencies, 99):6.1f}ms  thread-pool probe p99={percentile(probes, 99):6.1f}ms"
+	)
+
+
+async def main(logins: int, concurrency: int) -> None:
+	seed()
+	app = build_app()
+	print(f"-- {logins} logins, {concurrency} concurrent, {engine.dialect.name}")
+	async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+		for path in ("/bench/login-threadpool", "/auth/login"):
+			await burst(client, path, min(logins, 100), concurrency)  # warm-up
+			await burst(client, path, logins, concurrency)
+	await async_db.dispose()
+
+
+if __name__ == "__main__":
+	asyncio.run(main(
+		int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+		int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+	))
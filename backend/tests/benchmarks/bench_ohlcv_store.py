@@ -0,0 +1,94 @@
+"""Append and range-read throughput of the memory-mapped OHLCV store.
+
+Writes `symbols` x `days` daily bars (bulk backfill, then one-bar daily
+appends), then runs random range queries and the 21-bar feature read used by
+recommendations and alerts. A plain SQLite table with a (symbol, ts) primary
+key holding the same bars is the baseline for the reads.
+
+	cd backend && python tests/benchmarks/bench_ohlcv_store.py [symbols] [days]
+"""
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import tests.conftest  # noqa: E402,F401  (Settings env defaults)
+
+import numpy as np  # noqa: E402
+
+from app.services.ohlcv_store import OhlcvStore  # noqa: E402
+
+
+DAY = 86400
+QUERIES = 20_000
+
+
+def history(days: int, rng: random.Random):
+	close = 100.0
+	out = []
+	for d in range(days):
+		close *= 1 + rng.gauss(0, 0.02)
+		out.append({"ts": d * DAY, "open": close, "high": close * 1.01, "low": close * 0.99, "close": close, "volume": rng.uniform(1e5, 1e6)})
+	return out
+
+
+def main() -> None:
+	symbol_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+	days = int(sys.argv[2]) if len(sys.argv) > 2 else 2520
+	rng = random.Random(11)
+	symbols = [f"S{i:04d}" for i in range(symbol_count)]
+	data = {symbol: history(days, rng) for symbol in symbols}
+	total = symbol_count * days
+
+	with tempfile.TemporaryDirectory() as root:
+		store = OhlcvStore(root)
+		start = time.perf_counter()
+		for symbol in symbols:
+			store.append(symbol, data[symbol][:-20])
+		elapsed = time.perf_counter() - start
+		print(f"{'bulk append':>16}: {(total - 20 * symbol_count) / elapsed:10.0f} bars/s")
+
+		start = time.perf_counter()
+		for d in range(days - 20, days):
+			for symbol in symbols:
+				store.append(symbol, [data[symbol][d]])
+		elapsed = time.perf_counter() - start
+		print(f"{'daily append':>16}: {20 * symbol_count / elapsed:10.0f} bars/s")
+
+		ranges = []
+		for _ in range(QUERIES):
+			lo = rng.randrange(days - 252)
+			ranges.append((rng.choice(symbols), lo * DAY, (lo + 251) * DAY))
+
+		start = time.perf_counter()
+		checksum = 0.0
+		for symbol, lo, hi in ranges:
+			checksum += float(np.mean(store.range(symbol, lo, hi)["close"]))
+		elapsed = time.perf_counter() - start
+		print(f"{'mmap 1y range':>16}: {QUERIES / elapsed:10.0f} queries/s")
+
+		start = time.perf_counter()
+		for symbol, _, _ in ranges[:5000]:
+			store.features(symbol)
+		print(f"{'mmap features':>16}: {5000 / (time.perf_counter() - start):10.0f} symbols/s")
+
+		db = sqlite3.connect(":memory:")
+		db.execute("CREATE TABLE bars (symbol TEXT, ts INTEGER, open REAL, high REAL, low REAL, close REAL, volume REAL, PRIMARY KEY (symbol, ts))")
+		db.executemany(
+			"INSERT INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)",
+			((s, b["ts"], b["open"], b["high"], b["low"], b["close"], b["volume"]) for s in symbols for b in data[s]),
+		)
+		start = time.perf_counter()
+		for symbol, lo, hi in ranges:
+			rows = db.execute("SELECT close FROM bars WHERE symbol = ? AND ts BETWEEN ? AND ?", (symbol, lo, hi)).fetchall()
+			np.mean(np.fromiter((r[0] for r in rows), dtype=float, count=len(rows)))
+		elapsed = time.perf_counter() - start
+		print(f"{'sqlite 1y range':>16}: {QUERIES / elapsed:10.0f} queries/s")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,99 @@
+"""Throughput (texts/sec) and caller latency of the local sentiment engine on CPU.
+
+Runs concurrent /recommendations-sized requests (5 texts each) through the
+engine with micro-batching disabled (batch size 1) and enabled.
+
+	cd backend && python tests/benchmarks/bench_sentiment_engine.py --model PATH_OR_ID [--onnx]
+
+PATH_OR_ID can be any small sequence-classification checkpoint saved locally
+(e.g. a tiny random BERT), so the benchmark runs offline. Without
+`transformers` installed it falls back to a synthetic CPU scorer with a fixed
+per-call overhead, which still shows the effect of the batching policy.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import tests.conftest  # noqa: E402,F401  (Settings env defaults)
+
+from stub_server import percentile  # noqa: E402
+from app.services.sentiment_engine import LocalSentimentBackend, SentimentEngine  # noqa: E402
+
+
+class SyntheticBackend:
+	"""Stand-in for a CPU model: fixed per-call cost plus a per-text cost, off the event loop."""
+
+	model = "synthetic"
+
+	def __init__(self, per_call: float = 0.02, per_text: float = 0.001):
+		self.per_call = per_call
+		self.per_text = per_text
+
+	def _score(self, texts):
+		time.sleep(self.per_call + self.per_text * len(texts))
+		return [[{"label": "neutral", "score": 1.0}] for _ in texts]
+
+	async def predict(self, texts):
+		return await asyncio.get_running_loop().run_in_executor(None, self._score, texts)
+
+	async def close(self):
+		pass
+
+
+async def run(name: str, engine: SentimentEngine, callers: int, texts_per_call: int) -> None:
+	latencies = []
+
+	async def call(i: int) -> None:
+		start = time.perf_counter()
+		await engine.analyze([f"$AAPL post {i}-{j} looks strong" for j in range(texts_per_call)])
+		latencies.append((time.perf_counter() - start) * 1000)
+
+	start = time.perf_counter()
+	await asyncio.gather(*(call(i) for i in range(callers)))
+	elapsed = time.perf_counter() - start
+	stats = engine.stats()
+	print(
+		f"{name:>22}: {callers * texts_per_call / elapsed:8.1f} texts/s  "
+		f"p50={percentile(latencies, 50):7.1f}ms p99={percentile(latencies, 99):7.1f}ms  "
+		f"batches={stats['batches']} avg_batch={stats['avg_batch_size']}"
+	)
+	# Stop only the batcher: the backend is shared with the next run
+	await engine.batcher.close()
+
+
+async def main() -> None:
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--model", default=None)
+	parser.add_argument("--onnx", action="store_true")
+	parser.add_argument("--callers", type=int, default=100)
+	parser.add_argument("--texts", type=int, default=5)
+	parser.add_argument("--batch", type=int, default=32)
+	parser.add_argument("--wait-ms", type=float, default=10.0)
+	args = parser.parse_args()
+
+	if args.model:
+		backend = LocalSentimentBackend(args.model, onnx=args.onnx, workers=1)
+		# One backend for both runs, loaded (model and tokenizer) up front so neither run pays the cold start
+		await backend.predict(["warm up"])
+	else:
+		print("no --model given: using the synthetic CPU scorer")
+		backend = SyntheticBackend()
+
+	try:
+		await run("no batching", SentimentEngine(backend, max_batch_size=1, max_wait=0), args.callers, args.texts)
+		await run(
+			f"micro-batch {args.batch}/{args.wait_ms:g}ms",
+			SentimentEngine(backend, max_batch_size=args.batch, max_wait=args.wait_ms / 1000),
+			args.callers,
+			args.texts,
+		)
+	finally:
+		await backend.close()
+
+
+if __name__ == "__main__":
+	asyncio.run(main())
@@ -0,0 +1,128 @@
+"""Worker spawn cost: import time and time to first response, in fresh interpreters.
+
+Every run starts a new Python process, the way an autoscaled worker does:
+
+- import: `python -X importtime -c "import app.main"`. Self time is summed
+  per top-level package, so a new eager import shows up under its own name.
+- first response: spawns `uvicorn app.main:app`, then polls /health/live
+  and /health/ready until each returns 200. Times are measured from the
+  spawn.
+
+Background workers and the remote symbol load are switched off, so the
+numbers measure the app and not the network.
+
+	cd backend && python tests/benchmarks/bench_startup.py [runs] [top]
+"""
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND))
+
+import tests.conftest  # noqa: E402,F401  (Settings env defaults)
+
+from stub_server import percentile  # noqa: E402
+
+
+WORKERS_OFF = {
+	"TWITTER_INGEST_ENABLED": "false",
+	"REDDIT_INGEST_ENABLED": "false",
+	"OHLCV_INGEST_ENABLED": "false",
+	"ALERTS_SCHEDULER_ENABLED": "false",
+	"INFLUENCER_ENGINE_ENABLED": "false",
+	"SYMBOL_REGISTRY_REMOTE": "false",
+}
+STARTUP_TIMEOUT = 30.0
+
+
+def child_env() -> Dict[str, str]:
+	return {**os.environ, **WORKERS_OFF, "PYTHONDONTWRITEBYTECODE": "1"}
+
+
+def import_profile() -> Tuple[float, Dict[str, float]]:
+	"""Cumulative ms for `import app.main` and self ms per top-level package."""
+	result = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", "import app.main"],
+		cwd=BACKEND, env=child_env(), capture_output=True, text=True, check=True,
+	)
+	total, packages = 0.0, defaultdict(float)
+	for line in result.stderr.splitlines():
+		if not line.startswith("import time:") or "self [us]" in line:
+			continue
+		_, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+		packages[name.split(".")[0]] += int(self_us) / 1000
+		if name == "app.main":
+			total = int(cumulative_us) / 1000
+	return total, packages
+
+
+def free_port() -> int:
+	with socket.socket() as sock:
+		sock.bind(("127.0.0.1", 0))
+		return sock.getsockname()[1]
+
+
+def status(port: int, path: str) -> int:
+	conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+	try:
+		conn.request("GET", path)
+		return conn.getresponse().status
+	except OSError:
+		return 0
+	finally:
+		conn.close()
+
+
+def first_responses() -> Tuple[float, float]:
+	"""Milliseconds from spawning uvicorn to the first 200 on /health/live and on /health/ready."""
+	port = free_port()
+	start = time.perf_counter()
+	server = subprocess.Popen(
+		[sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+		cwd=BACKEND, env=child_env(),
+	)
+	try:
+		times = []
+		for path in ("/health/live", "/health/ready"):
+			while status(port, path) != 200:
+				if server.poll() is not None or time.perf_counter() - start > STARTUP_TIMEOUT:
+					raise RuntimeError(f"uvicorn never answered {path}")
+				time.sleep(0.002)
+			times.append((time.perf_counter() - start) * 1000)
+		return times[0], times[1]
+	finally:
+		server.terminate()
+		server.wait()
+
+
+def main(runs: int, top: int) -> None:
+	imports: List[float] = []
+	packages: Dict[str, List[float]] = defaultdict(list)
+	for _ in range(runs):
+		total, by_package = import_profile()
+		imports.append(total)
+		for name, ms in by_package.items():
+			packages[name].append(ms)
+	print(f"-- {runs} fresh interpreters, {sys.version.split()[0]}")
+	print(f"import app.main: p50={percentile(imports, 50):6.0f}ms  max={max(imports):6.0f}ms")
+	ranked = sorted(packages.items(), key=lambda item: -percentile(item[1], 50))
+	for name, samples in ranked[:top]:
+		print(f"  {name:<24} {percentile(samples, 50):6.1f}ms self")
+
+	live, ready = zip(*(first_responses() for _ in range(runs)))
+	print(f"spawn -> /health/live 200:  p50={percentile(live, 50):6.0f}ms  max={max(live):6.0f}ms")
+	print(f"spawn -> /health/ready 200: p50={percentile(ready, 50):6.0f}ms  max={max(ready):6.0f}ms")
+
+
+if __name__ == "__main__":
+	main(
+		int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+		int(sys.argv[2]) if len(sys.argv) > 2 else 12,
+	)
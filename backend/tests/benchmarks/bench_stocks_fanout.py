@@ -0,0 +1,88 @@
+"""Latency of a 20-symbol /market/stocks page against a stub provider with injected delays.
+
+Compares the old sequential per-symbol loop with the bounded concurrent
+fan-out of `MarketDataService.get_quotes`, per symbol and batched. One
+symbol in ten is made slow so the deadline / partial-result path shows up.
+
+	cd backend && python tests/benchmarks/bench_stocks_fanout.py [rounds]
+"""
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import tests.conftest  # noqa: E402,F401  (Settings env defaults)
+
+import httpx  # noqa: E402
+
+from stub_server import percentile  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.http import http_clients  # noqa: E402
+from app.services.market_data_service import MarketDataService  # noqa: E402
+from app.services.quote_cache import MemoryQuoteBackend, quote_cache  # noqa: E402
+
+
+PAGE = [f"SYM{i}" for i in range(20)]
+SLOW = {"SYM7", "SYM17"}
+BASE_DELAY = 0.08
+SLOW_DELAY = 30.0  # never answers within a run
+
+
+slow_symbols: set = set()
+
+
+async def provider(request: httpx.Request) -> httpx.Response:
+	symbols = request.url.path.rsplit("/", 1)[-1].split(",")
+	delay = SLOW_DELAY if slow_symbols & set(symbols) else BASE_DELAY * random.uniform(0.5, 1.5)
+	await asyncio.sleep(delay)
+	return httpx.Response(200, json=[{"symbol": s, "price": 1.0} for s in symbols])
+
+
+async def sequential(service: MarketDataService) -> int:
+	found = 0
+	for symbol in PAGE:
+		try:
+			quote = await asyncio.wait_for(service._fetch_stock_quotes([symbol]), timeout=settings.quote_deadline_seconds)
+			found += bool(quote.get(symbol))
+		except asyncio.TimeoutError:
+			pass
+	return found
+
+
+async def fanout(service: MarketDataService) -> int:
+	quotes = await service.get_quotes(PAGE, deadline=settings.quote_deadline_seconds)
+	return sum(1 for q in quotes.values() if q)
+
+
+async def run(name: str, runner, batch_size: int, rounds: int) -> None:
+	settings.quote_batch_size = batch_size
+	latencies, found = [], 0
+	for _ in range(rounds):
+		quote_cache.backend = MemoryQuoteBackend(1000)
+		service = MarketDataService()
+		start = time.perf_counter()
+		found += await runner(service)
+		latencies.append((time.perf_counter() - start) * 1000)
+	print(
+		f"{name:>28}: p50={percentile(latencies, 50):8.1f}ms p99={percentile(latencies, 99):8.1f}ms "
+		f"quotes/page={found / rounds:.1f}/{len(PAGE)}"
+	)
+
+
+async def main(rounds: int) -> None:
+	http_clients.set_transport_factory(lambda origin: httpx.MockTransport(provider))
+	settings.quote_deadline_seconds = 1.0
+	for label, slow in (("healthy provider", set()), (f"{len(SLOW)} symbols never answer", SLOW)):
+		print(f"-- {label}, deadline {settings.quote_deadline_seconds}s")
+		slow_symbols.clear()
+		slow_symbols.update(slow)
+		await run("sequential (before)", sequential, 1, max(1, rounds // 5))
+		await run("bounded fan-out, per symbol", fanout, 1, rounds)
+		await run("bounded fan-out, batch of 5", fanout, 5, rounds)
+
+
+if __name__ == "__main__":
+	asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10))
@@ -0,0 +1,79 @@
+"""Mention extraction throughput of the symbol registry trie on synthetic social posts.
+
+Builds a universe the size of the US-listed stock list plus the top coins and
+scans 100k posts of 20-40 words with a few cashtag, ticker and name mentions
+each. The baseline is the naive approach of one word-boundary regex per
+symbol, timed on a sample and extrapolated.
+
+	cd backend && python tests/benchmarks/bench_symbol_registry.py [posts] [stocks]
+"""
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import tests.conftest  # noqa: E402,F401  (Settings env defaults)
+
+from app.services.symbol_registry import SymbolRegistry  # noqa: E402
+
+
+WORDS = (
+	"the stock is going up today i think we should buy more before earnings call it a dip "
+	"market looks weak volume guidance beat miss calls puts long short hold sell rally dump"
+).split()
+
+
+def universe(size: int, rng: random.Random) -> dict:
+	stocks = {}
+	while len(stocks) < size:
+		symbol = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(2, 5)))
+		stocks[symbol] = symbol
+	return stocks
+
+
+def posts(count: int, symbols: list, names: list, rng: random.Random) -> list:
+	out = []
+	for _ in range(count):
+		words = rng.choices(WORDS, k=rng.randint(20, 40))
+		for _ in range(rng.randint(0, 3)):
+			mention = rng.choice((f"${rng.choice(symbols).lower()}", rng.choice(symbols), rng.choice(names)))
+			words.insert(rng.randrange(len(words)), mention)
+		out.append(" ".join(words))
+	return out
+
+
+def main() -> None:
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+	size = int(sys.argv[2]) if len(sys.argv) > 2 else 6_000
+	rng = random.Random(7)
+
+	start = time.perf_counter()
+	registry = SymbolRegistry()
+	registry.add_stocks(universe(size, rng))
+	registry.add_crypto((f"C{i}", f"coin-{i}", f"coin{i} token") for i in range(250))
+	build = time.perf_counter() - start
+	symbols = list(registry.stocks)
+	corpus = posts(count, symbols, [*registry.names], rng)
+	print(f"universe={len(registry.stocks) + len(registry.crypto_ids)} symbols  build={build * 1000:.0f}ms  posts={count}")
+
+	start = time.perf_counter()
+	mentions = registry.extract_many(corpus)
+	elapsed = time.perf_counter() - start
+	total = sum(len(m) for m in mentions)
+	print(f"{'trie':>10}: {elapsed:7.2f}s  {count / elapsed:9.0f} posts/s  mentions={total}")
+
+	sample = corpus[:200]
+	patterns = [re.compile(rf"(?<![\w$])\$?{re.escape(s)}(?!\w)", re.IGNORECASE) for s in registry.stocks]
+	start = time.perf_counter()
+	for text in sample:
+		[p.pattern for p in patterns if p.search(text)]
+	per_post = (time.perf_counter() - start) / len(sample)
+	print(f"{'regex/sym':>10}: {per_post * count:7.2f}s  {1 / per_post:9.0f} posts/s  (extrapolated from {len(sample)} posts)")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,80 @@
+"""Cost and effect of engagement-weighted sentiment with near-duplicate suppression.
+
+Builds `posts` synthetic tweets for one symbol: distinct authors writing
+mildly positive posts with a long-tailed engagement distribution, plus a bot
+wave (a quarter of the posts) pasting one negative template with varied
+links, mentions and numbers. Times the full weighting path (SimHash, banded
+near-duplicate clustering, weights, weighted mean) per batch size, on new
+posts and again on the same posts (fingerprints cached), and
+compares the result with the flat mean `/recommendations` used to report.
+An all-pairs popcount over the same fingerprints is the clustering baseline.
+
+	cd backend && python tests/benchmarks/bench_weighted_sentiment.py [posts]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import tests.conftest  # noqa: E402,F401  (Settings env defaults)
+
+import numpy as np  # noqa: E402
+
+from app.services.weighted_sentiment import near_duplicate_clusters, popcount, simhash, weighted_mean  # noqa: E402
+
+
+WORDS = (
+	"earnings guidance margin revenue growth product launch demand supply chain buyback dividend valuation "
+	"multiple analyst upgrade downgrade quarter call beat miss outlook cloud ai chips retail flows short "
+	"interest options volume breakout support resistance trend momentum hold position adding trimming"
+).split()
+
+
+def make_posts(count: int, rng: random.Random):
+	posts, scores = [], []
+	bots = count // 4
+	for i in range(count - bots):
+		text = "$XYZ " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20)))
+		likes = int(rng.paretovariate(1.2)) - 1
+		posts.append({"text": text, "author_id": f"user{rng.randint(0, count // 2)}", "like_count": likes, "retweet_count": likes // 10})
+		scores.append(rng.uniform(0.1, 0.7))
+	for i in range(bots):
+		text = f"$XYZ is collapsing, {rng.randint(2, 99)}% drop incoming, sell now https://t.co/{rng.getrandbits(32):x} @user{i}"
+		posts.append({"text": text, "author_id": f"bot{i}"})
+		scores.append(-0.95)
+	return posts, np.array(scores)
+
+
+def main() -> None:
+	sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [500, 2000, 5000, 20000]
+	rng = random.Random(7)
+	for size in sizes:
+		posts, scores = make_posts(size, rng)
+		start = time.perf_counter()
+		weighted_mean(scores, posts)
+		cold = (time.perf_counter() - start) * 1000
+		runs = 5
+		start = time.perf_counter()
+		for _ in range(runs):
+			result = weighted_mean(scores, posts)
+		elapsed = (time.perf_counter() - start) / runs * 1000
+		print(
+			f"{size:>6} posts: first {cold:6.1f}ms, repeat {elapsed:5.1f}ms  flat mean={scores.mean():+.2f} weighted={result['sentiment']:+.2f}  "
+			f"unique={result['unique_posts']} effective={result['effective_posts']:.0f}"
+		)
+		if size <= 5000:
+			fingerprints = simhash([post["text"] for post in posts])
+			start = time.perf_counter()
+			near_duplicate_clusters(fingerprints)
+			banded = (time.perf_counter() - start) * 1000
+			start = time.perf_counter()
+			for i in range(len(fingerprints)):
+				popcount(fingerprints[i] ^ fingerprints[i + 1:])
+			pairwise = (time.perf_counter() - start) * 1000
+			print(f"{'':>13}clustering: banded {banded:6.1f}ms vs all-pairs {pairwise:8.1f}ms")
+
+
+if __name__ == "__main__":
+	main()
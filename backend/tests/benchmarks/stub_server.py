@@ -0,0 +1,82 @@
+"""Minimal keep-alive HTTP/1.1 stub server used by the benchmarks.
+
+It speaks just enough HTTP for httpx, counts accepted TCP connections (each one
+is a handshake a real provider would charge us for) and lets a benchmark inject
+per-request latency.
+"""
+import asyncio
+import json
+from typing import Any, Callable, Optional
+
+
+Handler = Callable[[str, str], Any]
+
+
+class StubServer:
+	def __init__(self, handler: Optional[Handler] = None, delay: float = 0.0):
+		self.handler = handler or (lambda method, target: {"ok": True})
+		self.delay = delay
+		self.connections = 0
+		self.requests = 0
+		self._server: Optional[asyncio.base_events.Server] = None
+
+	@property
+	def url(self) -> str:
+		host, port = self._server.sockets[0].getsockname()[:2]
+		return f"http://{host}:{port}"
+
+	async def __aenter__(self) -> "StubServer":
+		self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+		return self
+
+	async def __aexit__(self, *exc) -> None:
+		self._server.close()
+		await self._server.wait_closed()
+
+	def reset(self) -> None:
+		self.connections = 0
+		self.requests = 0
+
+	async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		self.connections += 1
+		try:
+			while True:
+				request_line = await reader.readline()
+				if not request_line:
+					break
+				method, target, _ = request_line.decode().split(" ", 2)
+				length = 0
+				while True:
+					header = await reader.readline()
+					if header in (b"\r\n", b"\n", b""):
+						break
+					name, _, value = header.decode().partition(":")
+					if name.lower() == "content-length":
+						length = int(value.strip())
+				if length:
+					await reader.readexactly(length)
+				self.requests += 1
+				result = self.handler(method, target)
+				if asyncio.iscoroutine(result):
+					result = await result
+				if self.delay:
+					await asyncio.sleep(self.delay)
+				body = json.dumps(result).encode()
+				writer.write(
+					b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+					+ f"Content-Length: {len(body)}\r\n\r\n".encode()
+					+ body
+				)
+				await writer.drain()
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+
+
+def percentile(samples: list, pct: float) -> float:
+	ordered = sorted(samples)
+	if not ordered:
+		return 0.0
+	index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+	return ordered[index]
@@ -0,0 +1,56 @@
+import os
+import tempfile
+
+import pytest
+
+
+# Settings() requires these; tests never talk to the real providers.
+for _name, _value in {
+	"DATABASE_URL": "sqlite:///" + os.path.join(tempfile.gettempdir(), "oryntal_test.db"),
+	"DATABASE_AUTO_MIGRATE": "true",
+	"OHLCV_DATA_DIR": os.path.join(tempfile.gettempdir(), "oryntal_test_ohlcv"),
+	"REDIS_URL": "",
+	"ALPHA_VANTAGE_API_KEY": "test",
+	"FINANCIAL_MODELING_PREP_API_KEY": "test",
+	"COINGECKO_API_KEY": "",
+	"TWITTER_BEARER_TOKEN": "test",
+	"FMP_API_KEY": "test",
+	"EMAIL_HOST": "localhost",
+	"EMAIL_PORT": "25",
+	"EMAIL_HOST_USER": "test@example.com",
+	"EMAIL_HOST_PASSWORD": "test",
+	"SECRET_KEY": "test-secret",
+	# Keep the lifespan hermetic: no ingestors, schedulers or remote registry calls behind the tests' backs
+	"TWITTER_INGEST_ENABLED": "false",
+	"REDDIT_INGEST_ENABLED": "false",
+	"OHLCV_INGEST_ENABLED": "false",
+	"ALERTS_SCHEDULER_ENABLED": "false",
+	"INFLUENCER_ENGINE_ENABLED": "false",
+	"SYMBOL_REGISTRY_REMOTE": "false",
+}.items():
+	os.environ.setdefault(_name, _value)
+
+
+@pytest.fixture(autouse=True)
+def rate_limits(monkeypatch):
+	"""A fresh RateLimitManager per test, so no test waits on (or depends on the order of) buckets drained by another."""
+	from app.api import deps
+	from app.core.config import settings
+	from app.core.rate_limit import RateLimitManager
+	from app.services import market_data_service, twitter_service
+
+	manager = RateLimitManager(settings.provider_rate_limits, recovery=settings.rate_limit_recovery_seconds)
+	for module in (deps, market_data_service, twitter_service):
+		monkeypatch.setattr(module, "rate_limits", manager)
+	return manager
+
+
+@pytest.fixture(autouse=True)
+def smtp(monkeypatch):
+	"""Mail the app sends (outbox or one-off) lands on an in-process FakeSmtp instead of localhost:25."""
+	from app.services.email_service import email_service
+	from tests.smtp_stub import FakeSmtp
+
+	fake = FakeSmtp()
+	monkeypatch.setattr(email_service, "connect", fake.connect)
+	return fake
@@ -0,0 +1,105 @@
+"""SMTP stand-ins for the email outbox tests and benchmark.
+
+`SmtpStub` is a minimal local SMTP server: it speaks just enough ESMTP for
+smtplib (EHLO, AUTH PLAIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT), counts
+connections and delivered messages, and lets a caller inject per-message
+latency or temporary failures. `FakeSmtp` skips the socket altogether, for
+tests that only need to see what the app sent.
+"""
+import asyncio
+from email.message import Message
+from typing import List, Optional
+
+
+class SmtpStub:
+	def __init__(self, delay: float = 0.0, fail_first: int = 0):
+		self.delay = delay
+		# Answer the first `fail_first` DATA commands with a temporary 451
+		self.fail_first = fail_first
+		self.connections = 0
+		self.messages: List[str] = []
+		self._server: Optional[asyncio.base_events.Server] = None
+
+	@property
+	def port(self) -> int:
+		return self._server.sockets[0].getsockname()[1]
+
+	async def __aenter__(self) -> "SmtpStub":
+		self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+		return self
+
+	async def __aexit__(self, *exc) -> None:
+		self._server.close()
+		await self._server.wait_closed()
+
+	async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		self.connections += 1
+
+		async def reply(line: str) -> None:
+			writer.write(f"{line}\r\n".encode())
+			await writer.drain()
+
+		try:
+			await reply("220 stub ESMTP")
+			while True:
+				line = await reader.readline()
+				if not line:
+					break
+				command = line.decode().strip().upper()
+				if command.startswith(("EHLO", "HELO")):
+					writer.write(b"250-stub\r\n250-AUTH PLAIN\r\n")
+					await reply("250 8BITMIME")
+				elif command.startswith("AUTH"):
+					await reply("235 authenticated")
+				elif command == "DATA":
+					await reply("354 end with .")
+					body = []
+					while True:
+						data = await reader.readline()
+						if data in (b".\r\n", b".\n", b""):
+							break
+						body.append(data.decode())
+					if self.delay:
+						await asyncio.sleep(self.delay)
+					if self.fail_first > 0:
+						self.fail_first -= 1
+						await reply("451 try again later")
+					else:
+						self.messages.append("".join(body))
+						await reply("250 queued")
+				elif command == "QUIT":
+					await reply("221 bye")
+					break
+				else:
+					await reply("250 ok")
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+
+
+class FakeSmtp:
+	"""In-process SMTP connection; patch `fake.connect` over `EmailService.connect` to record messages."""
+
+	def __init__(self):
+		self.connections = 0
+		self.messages: List[Message] = []
+
+	def connect(self) -> "FakeSmtp":
+		self.connections += 1
+		return self
+
+	def send_message(self, message: Message) -> None:
+		self.messages.append(message)
+
+	def quit(self) -> None:
+		pass
+
+	def close(self) -> None:
+		pass
+
+	def __enter__(self) -> "FakeSmtp":
+		return self
+
+	def __exit__(self, *exc) -> None:
+		pass
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+
+from app.api.routes import stream_alerts
+from app.core.config import settings
+from app.services.alerts_feed import AlertsFeed
+from app.services.alerts_service import AlertsService
+
+
+def alert(alert_id: str, severity: str = "medium") -> dict:
+	return {"id": alert_id, "type": "price_alert", "severity": severity, "symbol": "AAPL", "timestamp": "now", "read": False}
+
+
+def test_identical_runs_produce_no_delta():
+	feed = AlertsFeed(history_size=10)
+	first = feed.apply([alert("price-AAPL")])
+	assert first["added"][0]["id"] == "price-AAPL" and first["version"] == 1
+	assert feed.apply([alert("price-AAPL")]) is None
+	assert feed.version == 1 and len(feed.snapshot()["alerts"]) == 1
+
+
+def test_delta_reports_updates_and_removals():
+	feed = AlertsFeed(history_size=10)
+	feed.apply([alert("price-AAPL"), alert("price-TSLA")])
+	delta = feed.apply([alert("price-AAPL", severity="high")])
+	assert [a["id"] for a in delta["updated"]] == ["price-AAPL"]
+	assert delta["removed"] == ["price-TSLA"] and delta["added"] == []
+
+
+def test_alerts_carry_a_real_utc_time_that_stays_put():
+	generated = AlertsService._price_alert("AAPL", {"change_percent": 4.2}, "2026-01-02T03:04:05Z")
+	assert generated["timestamp"] == "2026-01-02T03:04:05Z"
+	feed = AlertsFeed(history_size=10)
+	stamped = feed.apply([alert("price-AAPL")])["added"][0]["timestamp"]
+	assert datetime.strptime(stamped, "%Y-%m-%dT%H:%M:%SZ")
+	# An unchanged alert keeps the time it was first seen
+	feed.apply([alert("price-AAPL"), alert("price-TSLA")])
+	assert feed.snapshot()["alerts"][0]["timestamp"] == stamped
+
+
+def test_subscribers_receive_deltas_and_history_replays():
+	feed = AlertsFeed(history_size=2)
+	queue = feed.subscribe()
+	for severity in ("low", "medium", "high"):
+		feed.apply([alert("price-AAPL", severity=severity)])
+	assert queue.qsize() == 3
+	assert [d["version"] for d in feed.deltas_since(1)] == [2, 3]
+	assert feed.deltas_since(0) is None
+	assert feed.deltas_since(3) == []
+
+
+class ConnectedRequest:
+	async def is_disconnected(self):
+		return False
+
+
+@pytest.mark.asyncio
+async def test_stream_subscribes_only_while_the_body_is_streamed():
+	feed = AlertsFeed(history_size=10)
+	feed.apply([alert("price-AAPL")])
+	response = await stream_alerts(ConnectedRequest(), "0", alerts_feed=feed, settings=settings)
+	# A client that disconnects before the body starts never registers a queue
+	assert not feed._subscribers
+	body = response.body_iterator
+	assert (await body.__anext__()).startswith("id: 1\nevent: delta")
+	assert len(feed._subscribers) == 1
+	await body.aclose()
+	assert not feed._subscribers
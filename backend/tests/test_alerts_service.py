@@ -0,0 +1,79 @@
+import pytest
+
+from app.core.config import settings
+from app.services import alerts_service as alerts_module
+from app.services.alerts_service import AlertsService
+from app.services.market_data_service import market_data_service
+
+
+class StubHistory:
+	def __init__(self, volume_ratios):
+		self.volume_ratios = volume_ratios
+
+	def features(self, symbol):
+		return {"momentum_5d": None, "momentum_20d": None, "volatility_20d": None, "volume_ratio": self.volume_ratios.get(symbol)}
+
+
+class StubAggregates:
+	def __init__(self, zscores):
+		self.zscores = zscores
+
+	def zscore(self, symbol):
+		z = self.zscores.get(symbol)
+		if z is None:
+			return None
+		return {"z": z, "recent": {"mean": 0.1 * z, "count": 10}, "baseline": {"mean": 0.0, "count": 50}}
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+	"""Stub quotes, OHLCV features and sentiment z-scores for the alerts pipeline."""
+	inputs = {"quotes": {}, "volume_ratios": {}, "zscores": {}, "deadlines": []}
+
+	async def get_quotes(symbols, deadline=None):
+		inputs["deadlines"].append(deadline)
+		return {symbol: inputs["quotes"][symbol] for symbol in symbols if symbol in inputs["quotes"]}
+
+	monkeypatch.setattr(market_data_service, "get_quotes", get_quotes)
+	monkeypatch.setattr(alerts_module, "ohlcv_store", StubHistory(inputs["volume_ratios"]))
+	monkeypatch.setattr(alerts_module, "sentiment_aggregates", StubAggregates(inputs["zscores"]))
+	return inputs
+
+
+def by_id(alerts):
+	return {alert["id"]: alert for alert in alerts}
+
+
+@pytest.mark.asyncio
+async def test_price_alerts_fire_at_their_thresholds(pipeline):
+	pipeline["quotes"].update({
+		"AAA": {"change_percent": 2.99},
+		"BBB": {"change_percent": -3.0},
+		"CCC": {"change_percent": 5.5},
+		"DDD": None,
+	})
+	alerts = by_id(await AlertsService(["AAA", "BBB", "CCC", "DDD"]).generate())
+	assert set(alerts) == {"price-BBB", "price-CCC"}
+	assert alerts["price-BBB"]["severity"] == "medium" and alerts["price-CCC"]["severity"] == "high"
+	assert pipeline["deadlines"] == [settings.alerts_quote_timeout]
+
+
+@pytest.mark.asyncio
+async def test_volume_and_sentiment_alerts_fire_at_their_thresholds(pipeline):
+	ratio, z = settings.alerts_volume_ratio, settings.alerts_spike_zscore
+	pipeline["volume_ratios"].update({"AAA": ratio * 0.99, "BBB": ratio, "CCC": ratio * 2})
+	pipeline["zscores"].update({"AAA": z * 0.99, "BBB": -z, "CCC": z * 2})
+	alerts = by_id(await AlertsService(["AAA", "BBB", "CCC", "DDD"]).generate())
+	assert set(alerts) == {"volume-BBB", "volume-CCC", "sentiment-BBB", "sentiment-CCC"}
+	assert alerts["volume-BBB"]["severity"] == "medium" and alerts["volume-CCC"]["severity"] == "high"
+	assert alerts["sentiment-BBB"]["zScore"] == round(-z, 1) and alerts["sentiment-CCC"]["severity"] == "high"
+
+
+@pytest.mark.asyncio
+async def test_a_symbol_past_the_quote_deadline_keeps_its_other_alerts(pipeline):
+	# TSLA's quote chunk missed the deadline, so get_quotes left it out
+	pipeline["quotes"]["AAPL"] = {"change_percent": 4.0}
+	pipeline["volume_ratios"]["TSLA"] = settings.alerts_volume_ratio * 3
+	pipeline["zscores"]["TSLA"] = settings.alerts_spike_zscore + 1
+	alerts = by_id(await AlertsService(["AAPL", "TSLA"]).generate())
+	assert set(alerts) == {"price-AAPL", "volume-TSLA", "sentiment-TSLA"}
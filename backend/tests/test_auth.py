@@ -0,0 +1,66 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.lazy import is_loaded
+from app.db import SessionLocal, async_url
+from app.main import app
+from app.services.alerts_feed import alerts_feed
+from app.services.auth_service import create_user, verify_password
+from app.services.email_outbox import email_outbox
+from app.services.influencer_engine import influencer_engine
+from app.services.ohlcv_ingestor import ohlcv_ingestor
+from app.services.reddit_ingestor import reddit_ingestor
+from app.services.twitter_ingestor import twitter_ingestor
+
+
+@pytest.fixture
+def client(monkeypatch):
+	sent = []
+	accepting = [True]
+	monkeypatch.setattr(email_outbox, "send_otp", lambda to, otp, name="User": sent.append(to) or accepting[0])
+	with TestClient(app) as client:
+		# conftest switches the background workers off: the auth flow runs without ingestors or schedulers
+		workers = (twitter_ingestor, reddit_ingestor, ohlcv_ingestor, alerts_feed, influencer_engine)
+		assert not [worker for worker in workers if is_loaded(worker) and worker._task is not None]
+		client.sent, client.accepting = sent, accepting
+		yield client
+
+
+def test_register_then_login_on_the_async_engine(client):
+	email = f"user-{uuid.uuid4().hex[:8]}@Example.com"
+	response = client.post("/auth/register", json={"email": email, "password": "s3cret", "firstName": "Ada"})
+	assert response.status_code == 200
+	assert response.json()["email"] == email.lower()
+	assert len(client.sent) == 1
+
+	assert client.post("/auth/register", json={"email": email.lower(), "password": "other"}).status_code == 400
+	login = client.post("/auth/login", json={"email": email, "password": "s3cret"})
+	assert login.status_code == 200 and login.json()["token_type"] == "bearer"
+	assert client.post("/auth/login", json={"email": email, "password": "wrong"}).status_code == 401
+	assert client.post("/auth/login", json={"email": "nobody@example.com", "password": "s3cret"}).status_code == 401
+
+
+def test_register_reports_a_verification_email_that_was_not_queued(client):
+	email = f"user-{uuid.uuid4().hex[:8]}@example.com"
+	client.accepting[0] = False
+	response = client.post("/auth/register", json={"email": email, "password": "s3cret"})
+	assert response.status_code == 503 and "request a new code" in response.json()["detail"]
+	# The account was created; only the email is missing
+	assert client.post("/auth/login", json={"email": email, "password": "s3cret"}).status_code == 200
+
+
+def test_create_user_still_hashes_a_plain_password():
+	email = f"user-{uuid.uuid4().hex[:8]}@example.com"
+	with SessionLocal() as db:
+		user = create_user(db, email=email, password="s3cret", first_name="Ada")
+		assert user.password_hash != "s3cret" and verify_password("s3cret", user.password_hash)
+		with pytest.raises(TypeError):
+			create_user(db, email=f"other-{email}")
+
+
+def test_async_url_picks_the_async_driver():
+	assert async_url("sqlite:///./oryntal.db") == "sqlite+aiosqlite:///./oryntal.db"
+	assert async_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+	assert async_url("postgresql+psycopg2://u:p@db/app?sslmode=require") == "postgresql+asyncpg://u:p@db/app"
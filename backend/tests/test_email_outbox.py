@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.services.auth_service import hash_password_async, verify_password_async
+from app.services.email_outbox import EmailOutbox
+from app.services.email_service import EmailService
+from tests.smtp_stub import SmtpStub
+
+
+def make_outbox(port: int, workers: int = 1, **kwargs) -> EmailOutbox:
+	service = EmailService()
+	service.smtp_server, service.smtp_port, service.use_tls = "127.0.0.1", port, False
+	options = {"max_queue": 100, "max_attempts": 3, "backoff": 0.01, "idle_timeout": 5.0, **kwargs}
+	return EmailOutbox(service, workers=workers, **options)
+
+
+@pytest.mark.asyncio
+async def test_outbox_reuses_one_connection_per_worker():
+	async with SmtpStub() as smtp:
+		outbox = make_outbox(smtp.port)
+		for i in range(5):
+			assert outbox.send_otp(f"user{i}@example.com", f"{i:06d}")
+		await asyncio.wait_for(outbox.drain(), 5)
+		await outbox.stop()
+	assert len(smtp.messages) == 5
+	assert smtp.connections == 1
+	assert outbox.stats()["sent"] == 5
+
+
+@pytest.mark.asyncio
+async def test_temporary_failures_are_retried_with_backoff():
+	async with SmtpStub(fail_first=2) as smtp:
+		outbox = make_outbox(smtp.port)
+		assert outbox.submit("user@example.com", "Hi", "<p>hi</p>")
+		await asyncio.wait_for(outbox.drain(), 5)
+		await outbox.stop()
+	assert len(smtp.messages) == 1
+	assert outbox.retries == 2 and outbox.failed == 0
+
+
+@pytest.mark.asyncio
+async def test_full_outbox_rejects_and_unreachable_server_gives_up():
+	outbox = make_outbox(1, max_queue=1, max_attempts=2)
+	assert outbox.submit("a@example.com", "Hi", "x")
+	assert not outbox.submit("b@example.com", "Hi", "x")
+	await asyncio.wait_for(outbox.drain(), 5)
+	await outbox.stop()
+	assert outbox.rejected == 1 and outbox.failed == 1 and outbox.sent == 0
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_off_the_event_loop():
+	ticks = 0
+
+	async def ticker():
+		nonlocal ticks
+		while True:
+			ticks += 1
+			await asyncio.sleep(0.001)
+
+	task = asyncio.create_task(ticker())
+	password_hash = await hash_password_async("s3cret")
+	assert await verify_password_async("s3cret", password_hash)
+	assert not await verify_password_async("wrong", password_hash)
+	task.cancel()
+	await asyncio.gather(task, return_exceptions=True)
+	# The loop kept running while bcrypt worked
+	assert ticks > 3
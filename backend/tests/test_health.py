@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 
+from app.core.readiness import readiness
 from app.main import app
 
 
@@ -12,3 +13,27 @@ def test_health():
 	assert response.json()["status"] == "ok"
 
 
+def test_liveness_does_not_wait_for_startup_but_readiness_does():
+	# Without the lifespan (no `with`) the app is live but still starting
+	assert client.get("/health/live").status_code == 200
+	response = client.get("/health/ready")
+	assert response.status_code == 503
+	assert response.json()["status"] == "starting"
+
+	with TestClient(app) as started:
+		response = started.get("/health/ready")
+		assert response.status_code == 200
+		assert response.json()["checks"]["database"] == {"ok": True}
+	assert client.get("/health/ready").status_code == 503
+
+
+def test_readiness_reports_the_failing_check(monkeypatch):
+	async def redis_down():
+		raise ConnectionError("redis unreachable")
+
+	monkeypatch.setattr(readiness, "started", True)
+	monkeypatch.setitem(readiness._checks, "redis", redis_down)
+	response = client.get("/health/ready")
+	assert response.status_code == 503
+	assert response.json()["checks"]["redis"] == {"ok": False, "error": "redis unreachable"}
+	assert response.json()["checks"]["database"]["ok"]
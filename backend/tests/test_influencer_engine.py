@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.influencer_engine import InfluencerEngine
+from app.services.ohlcv_store import OhlcvStore
+
+
+DAY = 86400
+T0 = 1_700_006_400  # a midnight UTC
+
+
+def make_engine(tmp_path, **kwargs) -> InfluencerEngine:
+	store = OhlcvStore(str(tmp_path))
+	# AAA rises every day for ten days
+	store.append("AAA", [{"ts": T0 + i * DAY, "close": 100.0 + i} for i in range(10)])
+	options = {
+		"call_threshold": 0.5,
+		"horizon_days": 1,
+		"max_pending_calls": 50,
+		"accuracy_prior": 2.0,
+		"min_posts": 1,
+		"retention_days": 30,
+		"max_authors": 1000,
+		**kwargs,
+	}
+	return InfluencerEngine(store=store, **options)
+
+
+def test_calls_are_judged_against_later_closes(tmp_path):
+	engine = make_engine(tmp_path)
+	for day in range(5):
+		ts = T0 + day * DAY + 3600
+		engine.observe("twitter", "bull", "aaa", 0.9, ts, engagement=50, followers=10000, name="bull")
+		engine.observe("twitter", "bear", "AAA", -0.9, ts, engagement=50, followers=10000, name="bear")
+		engine.observe("twitter", "neutral", "AAA", 0.1, ts, engagement=50, followers=10000)
+	# Calls from the last day have not matured yet
+	engine.observe("twitter", "bull", "AAA", 0.9, T0 + 9 * DAY + 60)
+	engine.rescore(now=T0 + 10 * DAY)
+
+	board = engine.leaderboard()
+	assert [row["id"] for row in board["items"]] == ["bull", "neutral", "bear"]
+	bull = board["items"][0]
+	assert bull["calls"] == 5 and bull["accuracy"] > 0.5 and bull["followers"] == 10000
+	assert board["items"][2]["accuracy"] < 0.5
+	assert engine.stats()["pending_calls"] == 1
+
+
+def test_leaderboard_is_paginated_filtered_and_stable_between_rescores(tmp_path):
+	engine = make_engine(tmp_path, min_posts=2)
+	for i in range(30):
+		platform = "twitter" if i % 2 else "reddit"
+		for _ in range(2):
+			engine.observe(platform, f"user{i}", "AAA", 0.0, T0, followers=i * 100 if platform == "twitter" else None)
+	engine.observe("twitter", "once", "AAA", 0.0, T0)
+	engine.rescore(now=T0 + DAY)
+
+	first = engine.leaderboard(sort="followers", page=1, page_size=10)
+	second = engine.leaderboard(sort="followers", page=2, page_size=10)
+	assert first["total"] == 30
+	assert [row["followers"] for row in first["items"]] == sorted((i * 100 for i in range(1, 30, 2)), reverse=True)[:10]
+	assert not {row["id"] for row in first["items"]} & {row["id"] for row in second["items"]}
+	reddit = engine.leaderboard(platform="reddit", page_size=100)
+	assert reddit["total"] == 15 and all(row["platform"] == "reddit" for row in reddit["items"])
+
+	# New posts only show up after the next batch rescore
+	for _ in range(2):
+		engine.observe("twitter", "newcomer", "AAA", 0.0, T0 + DAY, followers=10**7)
+	assert engine.leaderboard(sort="followers")["items"][0]["id"] != "newcomer"
+	engine.rescore(now=T0 + DAY)
+	assert engine.leaderboard(sort="followers")["items"][0]["id"] == "newcomer"
+
+
+def test_inactive_authors_are_evicted(tmp_path):
+	engine = make_engine(tmp_path, retention_days=5, max_authors=2)
+	engine.observe("reddit", "old", "AAA", 0.9, T0)
+	for name in ("a", "b", "c"):
+		engine.observe("reddit", name, "AAA", 0.0, T0 + 9 * DAY)
+	engine.observe("reddit", "[deleted]", "AAA", 0.9, T0 + 9 * DAY)
+	engine.rescore(now=T0 + 10 * DAY)
+	assert engine.stats()["authors"] == 2
+	assert "old" not in {row["id"] for row in engine.leaderboard()["items"]}
+
+
+def test_background_rescore_runs_off_the_loop_and_keeps_new_posts(tmp_path):
+	engine = make_engine(tmp_path)
+	reads, release = [], threading.Event()
+	store_range = engine.store.range
+
+	def blocking_range(symbol, *args, **kwargs):
+		reads.append(threading.get_ident())
+		release.wait(5)
+		return store_range(symbol, *args, **kwargs)
+
+	engine.store.range = blocking_range
+	engine.observe("twitter", "bull", "AAA", 0.9, T0 + 3600)
+
+	async def scenario():
+		rescore = asyncio.create_task(engine.rescore_async(now=T0 + 10 * DAY))
+		while not reads:
+			await asyncio.sleep(0.01)
+		# The loop stays free while the worker reads closes; this post lands mid-rescore
+		engine.observe("twitter", "bull", "AAA", 0.9, T0 + 9 * DAY + 60)
+		release.set()
+		return await rescore
+
+	assert asyncio.run(scenario()) == 1
+	assert reads[0] != threading.get_ident()
+	assert engine.leaderboard()["items"][0]["calls"] == 1
+	assert engine.stats()["pending_calls"] == 1
+
+
+def test_start_rescores_immediately(tmp_path):
+	engine = make_engine(tmp_path)
+	engine.observe("reddit", "early", "AAA", 0.0, time.time())
+
+	async def scenario():
+		await engine.start()
+		for _ in range(100):
+			if engine.rescores:
+				break
+			await asyncio.sleep(0.01)
+		await engine.stop()
+
+	asyncio.run(scenario())
+	assert engine.rescores == 1
+	assert [row["id"] for row in engine.leaderboard()["items"]] == ["early"]
+
+
+def test_influencers_route_validates_sort():
+	with TestClient(app) as client:
+		assert client.get("/influencers", params={"sort": "name"}).status_code == 400
+		response = client.get("/influencers", params={"platform": "reddit", "page_size": 5})
+		assert response.status_code == 200
+		assert response.json()["page_size"] == 5
@@ -0,0 +1,101 @@
+import time
+
+import httpx
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.core.http import http_clients
+from app.services import ohlcv_ingestor as ingestor_module
+from app.services.market_data_service import market_data_service
+from app.services.ohlcv_ingestor import OhlcvIngestor
+from app.services.ohlcv_store import OhlcvStore
+
+
+DAY = 86400
+
+
+def bars(days, start=0, close=100.0, volume=1000.0):
+	return [
+		{"ts": (start + d) * DAY, "open": close + d, "high": close + d + 1, "low": close + d - 1, "close": close + d, "volume": volume}
+		for d in days
+	]
+
+
+def test_append_keeps_order_and_updates_the_last_bar(tmp_path):
+	store = OhlcvStore(str(tmp_path))
+	assert store.append("aapl", bars(range(5))) == 5
+	# Older bars are skipped, the last bar is overwritten in place, new bars are appended
+	update = bars([2, 4, 5, 6])
+	update[1]["close"] = 999.0
+	assert store.append("AAPL", update) == 3
+	columns = store.range("AAPL")
+	assert columns["ts"].tolist() == [d * DAY for d in range(7)]
+	assert columns["close"][4] == 999.0
+	assert store.symbols() == ["AAPL"]
+
+
+def test_range_queries_are_views_into_the_mapped_files(tmp_path):
+	store = OhlcvStore(str(tmp_path))
+	store.append("BTC", bars(range(100)))
+	columns = store.range("BTC", start=10 * DAY, end=19 * DAY)
+	assert columns["ts"][0] == 10 * DAY and len(columns["close"]) == 10
+	assert isinstance(columns["close"].base, np.memmap) or isinstance(columns["close"], np.memmap)
+	assert not columns["close"].flags.owndata and not columns["close"].flags.writeable
+	assert len(store.range("BTC", start=500 * DAY)["ts"]) == 0
+	assert len(store.range("NOPE")["ts"]) == 0
+
+
+def test_features_from_stored_history(tmp_path):
+	store = OhlcvStore(str(tmp_path))
+	history = bars(range(21))
+	history[-1]["volume"] = 5000.0
+	store.append("TSLA", history)
+	features = store.features("TSLA")
+	assert features["momentum_5d"] == pytest.approx(120 / 115 - 1)
+	assert features["momentum_20d"] == pytest.approx(120 / 100 - 1)
+	assert features["volume_ratio"] == pytest.approx(5.0)
+	assert store.features("NOPE")["momentum_5d"] is None
+
+
+@pytest.mark.asyncio
+async def test_ingestor_backfills_then_requests_from_the_last_bar(tmp_path, monkeypatch):
+	store = OhlcvStore(str(tmp_path))
+	calls = []
+
+	async def get_daily_bars(symbol, since=None):
+		calls.append((symbol, since))
+		return bars(range(3)) if since is None else bars([2, 3])
+
+	monkeypatch.setattr(ingestor_module, "ohlcv_store", store)
+	monkeypatch.setattr(ingestor_module.market_data_service, "get_daily_bars", get_daily_bars)
+	ingestor = OhlcvIngestor(["ETH"])
+	assert await ingestor.run_once() == {"ETH": 3}
+	assert await ingestor.run_once() == {"ETH": 2}
+	assert calls == [("ETH", None), ("ETH", 2 * DAY)]
+	assert store.last_ts("ETH") == 3 * DAY
+
+
+@pytest.mark.asyncio
+async def test_crypto_backfill_has_one_bar_per_utc_day(monkeypatch):
+	# 40 days of 6-hourly samples: past 30 days CoinGecko's /ohlc would return 4-day candles
+	start = (int(time.time()) // DAY - 40) * DAY
+	samples = [((start + i * 6 * 3600) * 1000, float(i)) for i in range(160)]
+	requests = []
+
+	def handler(request: httpx.Request) -> httpx.Response:
+		requests.append(request.url)
+		return httpx.Response(200, json={
+			"prices": [[ts, price] for ts, price in samples],
+			"total_volumes": [[ts, 10 * price] for ts, price in samples],
+		})
+
+	monkeypatch.setattr(settings, "ohlcv_history_days", 40)
+	http_clients.set_transport_factory(lambda origin: httpx.MockTransport(handler))
+	try:
+		daily = await market_data_service.get_daily_bars("BTC")
+	finally:
+		http_clients.set_transport_factory(None)
+	assert requests[0].path.endswith("/market_chart/range") and int(requests[0].params["from"]) == start
+	assert [bar["ts"] for bar in daily] == [start + d * DAY for d in range(40)]
+	assert daily[1] == {"ts": start + DAY, "open": 4.0, "high": 7.0, "low": 4.0, "close": 7.0, "volume": 70.0}
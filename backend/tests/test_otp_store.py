@@ -0,0 +1,80 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_otp_store
+from app.core.config import settings
+from app.main import app
+from app.services.otp_store import InMemoryOtpStore
+
+
+@pytest.mark.asyncio
+async def test_codes_are_one_shot_and_burn_after_max_attempts():
+	store = InMemoryOtpStore(max_attempts=2)
+	await store.set_code("User@Example.com", "123456")
+	assert await store.verify_code("user@example.com", "123456")
+	assert not await store.verify_code("user@example.com", "123456")
+
+	await store.set_code("user@example.com", "654321")
+	assert not await store.verify_code("user@example.com", "000000")
+	assert not await store.verify_code("user@example.com", "000000")
+	# Burned: even the right code fails now
+	assert not await store.verify_code("user@example.com", "654321")
+
+
+@pytest.mark.asyncio
+async def test_sweeper_drops_expired_codes_of_emails_that_never_return():
+	store = InMemoryOtpStore()
+	for i in range(100):
+		await store.set_code(f"gone{i}@example.com", "111111", ttl_seconds=0)
+	await store.set_code("fresh@example.com", "222222")
+	assert store.stats()["size"] == 1
+	assert store.stats()["expired"] == 100
+	assert await store.verify_code("fresh@example.com", "222222")
+
+
+@pytest.mark.asyncio
+async def test_size_cap_evicts_the_soonest_expiring_entries():
+	store = InMemoryOtpStore(max_entries=10)
+	for i in range(20):
+		await store.set_code(f"user{i}@example.com", "123456", ttl_seconds=600 + i)
+	assert store.stats()["size"] == 10
+	assert store.stats()["evicted"] == 10
+	assert not await store.verify_code("user0@example.com", "123456")
+	assert await store.verify_code("user19@example.com", "123456")
+
+
+@pytest.mark.asyncio
+async def test_issuance_is_limited_per_email_and_ip():
+	store = InMemoryOtpStore(issue_limit_per_email=2, issue_limit_per_ip=3)
+	assert await store.allow_issue("a@example.com", "10.0.0.1")
+	assert await store.allow_issue("a@example.com", "10.0.0.1")
+	assert not await store.allow_issue("a@example.com", "10.0.0.1")
+	# A different email from the same IP hits the IP limit
+	assert not await store.allow_issue("b@example.com", "10.0.0.1")
+	assert await store.allow_issue("b@example.com", "10.0.0.2")
+
+
+@pytest.mark.asyncio
+async def test_code_churn_never_evicts_issuance_counters():
+	store = InMemoryOtpStore(max_entries=10, max_counters=10, issue_limit_per_email=1, issue_limit_per_ip=5)
+	assert await store.allow_issue("victim@example.com")
+	for i in range(100):
+		await store.set_code(f"junk{i}@example.com", "123456")
+	assert store.stats()["evicted"] == 90 and store.stats()["counters_evicted"] == 0
+	assert not await store.allow_issue("victim@example.com")
+	# An IP over its limit opens no counters for the emails it sprays
+	for i in range(50):
+		await store.allow_issue(f"spray{i}@example.com", "10.0.0.9")
+	assert store.stats()["counters"] == 7 and not await store.allow_issue("victim@example.com")
+
+
+def test_send_otp_is_rate_limited(monkeypatch, smtp):
+	store = InMemoryOtpStore(issue_limit_per_email=1)
+	monkeypatch.setitem(app.dependency_overrides, get_otp_store, lambda: store)
+	monkeypatch.setattr(settings, "email_outbox_max_queue", 100)
+	with TestClient(app) as client:
+		payload = {"email": "limited@example.com", "name": "Test"}
+		assert client.post("/auth/send-otp", json=payload).status_code == 200
+		assert client.post("/auth/send-otp", json=payload).status_code == 429
+	# Queued by the first request and delivered by the outbox before shutdown finished
+	assert [message["To"] for message in smtp.messages] == ["limited@example.com"]
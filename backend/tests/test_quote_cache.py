@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.market_data_service import MarketDataService
+from app.services.quote_cache import MemoryQuoteBackend, QuoteCache, quote_cache
+
+
+def make_cache(max_entries: int = 10) -> QuoteCache:
+	return QuoteCache(MemoryQuoteBackend(max_entries), stale_ttl=60, negative_ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit_skips_fetch():
+	cache = make_cache()
+	calls = []
+
+	async def fetch():
+		calls.append(1)
+		return {"symbol": "AAPL", "price": 1.0}
+
+	assert await cache.get_or_fetch("stock:AAPL", fetch, ttl=60) == {"symbol": "AAPL", "price": 1.0}
+	assert await cache.get_or_fetch("stock:AAPL", fetch, ttl=60) == {"symbol": "AAPL", "price": 1.0}
+	assert len(calls) == 1
+	assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_revalidating():
+	cache = make_cache()
+	prices = iter([1.0, 2.0])
+
+	async def fetch():
+		return {"symbol": "BTC", "price": next(prices)}
+
+	await cache.get_or_fetch("crypto:BTC", fetch, ttl=0)
+	stale = await cache.get_or_fetch("crypto:BTC", fetch, ttl=0)
+	assert stale == {"symbol": "BTC", "price": 1.0, "stale": True}
+	await asyncio.sleep(0)
+	await asyncio.sleep(0)
+	entry = await cache.backend.get("crypto:BTC")
+	assert entry[0] == {"symbol": "BTC", "price": 2.0}
+	assert cache.stats()["stale"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_symbol_is_negatively_cached_and_errors_are_not():
+	cache = make_cache()
+	calls = []
+
+	async def unknown():
+		calls.append(1)
+		return None
+
+	assert await cache.get_or_fetch("stock:NOPE", unknown, ttl=60) is None
+	assert await cache.get_or_fetch("stock:NOPE", unknown, ttl=60) is None
+	assert len(calls) == 1
+
+	async def failing():
+		raise RuntimeError("rate limited")
+
+	with pytest.raises(RuntimeError):
+		await cache.get_or_fetch("stock:MSFT", failing, ttl=60)
+	assert await cache.backend.get("stock:MSFT") is None
+
+
+@pytest.mark.asyncio
+async def test_batch_caches_only_symbols_the_fetch_resolved():
+	cache = make_cache()
+	requested = []
+
+	async def fetch_many(symbols):
+		requested.append(symbols)
+		# MSFT was left out (no provider answered for it); NOPE was rejected
+		return {"AAPL": {"symbol": "AAPL", "price": 1.0}, "NOPE": None}
+
+	result = await cache.get_many_or_fetch("stock", ["AAPL", "MSFT", "NOPE"], fetch_many, ttl=60)
+	assert result == {"AAPL": {"symbol": "AAPL", "price": 1.0}, "MSFT": None, "NOPE": None}
+	await cache.get_many_or_fetch("stock", ["AAPL", "MSFT", "NOPE"], fetch_many, ttl=60)
+	assert requested == [["AAPL", "MSFT", "NOPE"], ["MSFT"]]
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_bounds_size():
+	cache = make_cache(max_entries=2)
+
+	async def fetch():
+		return {"price": 1.0}
+
+	for key in ("a", "b", "a", "c"):
+		await cache.get_or_fetch(key, fetch, ttl=60)
+	assert await cache.backend.get("b") is None
+	assert await cache.backend.get("a") is not None
+	assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_quotes_past_the_deadline_are_missing_and_finish_in_the_background(monkeypatch, capsys):
+	monkeypatch.setattr(quote_cache, "backend", MemoryQuoteBackend(100))
+	monkeypatch.setattr(settings, "quote_batch_size", 1)
+	monkeypatch.setattr(settings, "quote_deadline_seconds", 0.1)
+	service = MarketDataService()
+	delays = {"AAPL": 0.0, "MSFT": 0.0, "NVDA": 0.5}
+
+	async def slow_provider(symbols):
+		await asyncio.sleep(max(delays[s] for s in symbols))
+		return {s: {"symbol": s, "price": 1.0} for s in symbols}
+
+	async def actives(provider, url, params, **kwargs):
+		return [{"ticker": symbol} for symbol in delays]
+
+	monkeypatch.setattr(service, "_fetch_stock_quotes", slow_provider)
+	monkeypatch.setattr(service, "_get_json", actives)
+	page = await service.get_stocks()
+	assert page["items"] == [
+		{"symbol": "AAPL", "price": 1.0},
+		{"symbol": "MSFT", "price": 1.0},
+		{"symbol": "NVDA", "missing": True},
+	]
+
+	# The late chunk keeps running, warms the cache and ends cleanly
+	assert len(service._background) == 1
+	await asyncio.gather(*service._background)
+	assert not service._background and "Error" not in capsys.readouterr().out
+	assert (await quote_cache.backend.get("stock:NVDA"))[0] == {"symbol": "NVDA", "price": 1.0}
+	delays["NVDA"] = 10.0
+	assert (await service.get_quotes(["NVDA"], deadline=0.1))["NVDA"]["price"] == 1.0
@@ -0,0 +1,180 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limit import RateLimited
+from app.services.quote_providers import (
+	AlphaVantageQuotes,
+	CoinGeckoQuotes,
+	FmpQuotes,
+	QuoteProvider,
+	QuoteRouter,
+	make_quote,
+)
+
+
+class StubProvider(QuoteProvider):
+	"""Local quote source with injected latency and failures."""
+
+	max_symbols = 100
+
+	def __init__(self, name: str, delay: float = 0.0, fail: Exception = None, omit=()):
+		super().__init__(None)
+		self.name = name
+		self.delay = delay
+		self.fail = fail
+		# Symbols this source answers with None, like a batch response that leaves them out
+		self.omit = set(omit)
+		self.calls = 0
+		self.requested = []
+
+	async def fetch(self, symbols):
+		self.calls += 1
+		self.requested.append(list(symbols))
+		await asyncio.sleep(self.delay)
+		if self.fail is not None:
+			raise self.fail
+		return {s: None if s in self.omit else make_quote(s, "stock", self.name, price=1.0) for s in symbols}
+
+
+@pytest.fixture
+def fast_hedge(monkeypatch):
+	monkeypatch.setattr(settings, "quote_hedge_min_samples", 3)
+	monkeypatch.setattr(settings, "quote_hedge_default_delay", 0.05)
+	monkeypatch.setattr(settings, "quote_hedge_min_delay", 0.01)
+
+
+@pytest.mark.asyncio
+async def test_routes_to_the_fastest_healthy_provider(fast_hedge):
+	slow, fast = StubProvider("slow", delay=0.03), StubProvider("fast", delay=0.001)
+	router = QuoteRouter([slow, fast], order={"stock": ["slow", "fast"]})
+	for _ in range(5):
+		await router.fetch("stock", ["AAPL"])
+	assert [p.name for p in router.rank("stock")] == ["fast", "slow"]
+	result = await router.fetch("stock", ["AAPL"])
+	assert result["AAPL"]["provider"] == "fast"
+
+
+@pytest.mark.asyncio
+async def test_hedges_a_slow_primary_after_its_p95(fast_hedge):
+	primary, backup = StubProvider("primary", delay=0.01), StubProvider("backup", delay=0.03)
+	router = QuoteRouter([primary, backup], order={"stock": ["primary", "backup"]})
+	for _ in range(6):
+		await router.fetch("stock", ["AAPL"])
+	assert router.rank("stock")[0] is primary
+	backup.calls = 0
+	# The primary stalls; the backup is asked after ~p95 (10ms) and answers first
+	primary.delay, backup.delay = 1.0, 0.01
+	start = time.perf_counter()
+	result = await router.fetch("stock", ["AAPL"])
+	assert time.perf_counter() - start < 0.5
+	assert result["AAPL"]["provider"] == "backup"
+	assert router.hedges == 1 and backup.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_fail_over_and_take_the_provider_down(fast_hedge, monkeypatch):
+	monkeypatch.setattr(settings, "quote_provider_failure_threshold", 2)
+	broken, backup = StubProvider("broken", fail=RuntimeError("502")), StubProvider("backup")
+	router = QuoteRouter([broken, backup], order={"stock": ["broken", "backup"]})
+	for _ in range(2):
+		assert (await router.fetch("stock", ["AAPL"]))["AAPL"]["provider"] == "backup"
+	assert router.failovers == 2
+	assert not router.health["stock:broken"].healthy()
+	assert [p.name for p in router.rank("stock")] == ["backup", "broken"]
+
+
+@pytest.mark.asyncio
+async def test_throttle_is_reported_when_every_provider_fails(fast_hedge):
+	router = QuoteRouter(
+		[StubProvider("a", fail=RuntimeError("boom")), StubProvider("b", fail=RateLimited("b", 30))],
+		order={"stock": ["a", "b"]},
+	)
+	with pytest.raises(RateLimited):
+		await router.fetch("stock", ["AAPL"])
+	assert router.health["stock:b"].stats()["down_for"] > 20
+
+
+@pytest.mark.asyncio
+async def test_providers_normalize_to_one_schema():
+	payloads = {
+		"alpha_vantage": {"Global Quote": {"01. symbol": "AAPL", "05. price": "190.5", "09. change": "1.5", "10. change percent": "0.79%", "06. volume": "1000"}},
+		"fmp": [{"symbol": "BTCUSD", "price": 60000, "change": 600, "changesPercentage": 1.0, "volume": 5}],
+		"coingecko": {"bitcoin": {"usd": 60600, "usd_24h_change": 1.0, "usd_24h_vol": 5, "usd_market_cap": 1}},
+	}
+
+	async def get_json(provider, url, params, headers=None):
+		return payloads[provider]
+
+	quotes = [
+		(await AlphaVantageQuotes(get_json).fetch(["AAPL"]))["AAPL"],
+		(await FmpQuotes(get_json, asset_type="crypto").fetch(["BTC"]))["BTC"],
+		(await CoinGeckoQuotes(get_json).fetch(["BTC"]))["BTC"],
+	]
+	stock_keys = set(quotes[0])
+	assert all(stock_keys <= set(q) for q in quotes)
+	assert quotes[0]["change_percent"] == pytest.approx(0.79)
+	assert quotes[1]["symbol"] == quotes[2]["symbol"] == "BTC"
+	assert quotes[2]["change"] == pytest.approx(600)
+
+
+def single_symbol(name: str, max_calls: int = 5, **kwargs) -> StubProvider:
+	provider = StubProvider(name, **kwargs)
+	provider.max_symbols, provider.max_calls = 1, max_calls
+	return provider
+
+
+@pytest.mark.asyncio
+async def test_batches_fail_over_to_single_symbol_calls(fast_hedge, monkeypatch):
+	monkeypatch.setattr(settings, "quote_provider_failure_threshold", 1)
+	batch, single = StubProvider("batch", fail=RuntimeError("502")), single_symbol("single")
+	router = QuoteRouter([batch, single], order={"stock": ["batch", "single"]})
+	symbols = ["AAPL", "MSFT", "NVDA"]
+	# The batch provider ranks first while healthy; its failure splits the batch into one call per symbol
+	assert router.rank("stock", 3) == [batch, single]
+	result = await router.fetch("stock", symbols)
+	assert {s: q["provider"] for s, q in result.items()} == dict.fromkeys(symbols, "single")
+	assert single.calls == 3 and router.failovers == 1 and router.splits == 1
+	# Down, the batch provider goes last; batches beyond the split budget still have no fallback
+	assert router.rank("stock", 3) == [single, batch]
+	assert router.rank("stock", 6) == [batch]
+
+
+@pytest.mark.asyncio
+async def test_slow_batches_are_hedged_with_single_symbol_calls(fast_hedge):
+	batch, single = StubProvider("batch", delay=0.3), single_symbol("single", delay=0.01)
+	router = QuoteRouter([batch, single], order={"stock": ["batch", "single"]})
+	start = time.perf_counter()
+	result = await router.fetch("stock", ["AAPL", "MSFT"])
+	assert time.perf_counter() - start < 0.2
+	assert {q["provider"] for q in result.values()} == {"single"}
+	assert router.hedges == 1 and single.calls == 2
+	# The losing batch call still finishes and is measured
+	await asyncio.sleep(0.3)
+	assert len(router.health["stock:batch"].latencies) == 1
+
+
+@pytest.mark.asyncio
+async def test_symbols_left_out_of_a_batch_are_rerouted():
+	primary, backup = StubProvider("primary", omit={"MSFT", "NOPE"}), StubProvider("backup", omit={"NOPE"})
+	router = QuoteRouter([primary, backup], order={"stock": ["primary", "backup"]})
+	result = await router.fetch("stock", ["AAPL", "MSFT", "NOPE"])
+	assert result["AAPL"]["provider"] == "primary" and result["MSFT"]["provider"] == "backup"
+	# Only a symbol every candidate rejected is reported unknown
+	assert result["NOPE"] is None
+	assert backup.requested == [["MSFT", "NOPE"]] and router.reroutes == 1
+
+
+@pytest.mark.asyncio
+async def test_a_failed_reroute_leaves_symbols_unresolved():
+	def make_router() -> QuoteRouter:
+		primary, backup = StubProvider("primary", omit={"MSFT"}), StubProvider("backup", fail=RuntimeError("502"))
+		return QuoteRouter([primary, backup], order={"stock": ["primary", "backup"]})
+
+	result = await make_router().fetch("stock", ["AAPL", "MSFT"])
+	assert result["AAPL"]["provider"] == "primary" and "MSFT" not in result
+	# With nothing resolved the error surfaces instead of an "unknown symbol"
+	with pytest.raises(RuntimeError):
+		await make_router().fetch("stock", ["MSFT"])
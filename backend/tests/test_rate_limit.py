@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import app.services.market_data_service as market_data_module
+from app.core.http import http_clients
+from app.core.rate_limit import BACKGROUND, RateLimitManager, RateLimited, TokenBucket, priority, retry_after
+from app.services.market_data_service import market_data_service
+
+
+@pytest.mark.asyncio
+async def test_interactive_callers_overtake_queued_background_callers():
+	bucket = TokenBucket(rate=50, capacity=1)
+	await bucket.acquire()
+	order = []
+
+	async def call(name, level):
+		with priority(level):
+			await bucket.acquire()
+		order.append(name)
+
+	background = [asyncio.create_task(call(f"bg{i}", BACKGROUND)) for i in range(3)]
+	await asyncio.sleep(0)
+	await call("interactive", 0)
+	await asyncio.gather(*background)
+	assert order[0] == "interactive"
+	assert order[1:] == ["bg0", "bg1", "bg2"]
+
+
+@pytest.mark.asyncio
+async def test_throttle_pauses_and_halves_the_rate_until_it_recovers():
+	bucket = TokenBucket(rate=100, capacity=5, recovery=0.2)
+	await bucket.throttled(retry_after=0.05)
+	assert bucket.rate == pytest.approx(50, rel=0.1)
+	start = time.monotonic()
+	await bucket.acquire()
+	assert time.monotonic() - start >= 0.045
+	await asyncio.sleep(0.2)
+	assert bucket.rate == 100
+	assert bucket.stats()["throttles"] == 1
+
+
+def test_retry_after_headers():
+	assert retry_after(httpx.Headers({"Retry-After": "12"})) == 12
+	assert retry_after(httpx.Headers({"x-rate-limit-reset": str(int(time.time()) + 30)})) == pytest.approx(30, abs=1.5)
+	assert retry_after(httpx.Headers({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+	assert retry_after(httpx.Headers({})) is None
+
+
+def test_buckets_are_kept_per_api_key():
+	manager = RateLimitManager({"fmp": [1.0, 1]})
+	assert manager.bucket("fmp", "key-a") is manager.bucket("fmp", "key-a")
+	assert manager.bucket("fmp", "key-a") is not manager.bucket("fmp", "key-b")
+	assert manager.bucket("unknown") is None
+	assert "key-a" not in str(manager.stats())
+
+
+@pytest.mark.asyncio
+async def test_alpha_vantage_note_raises_rate_limited_and_backs_off(monkeypatch):
+	manager = RateLimitManager({"alpha_vantage": [100.0, 5]})
+	monkeypatch.setattr(market_data_module, "rate_limits", manager)
+
+	def handler(request: httpx.Request) -> httpx.Response:
+		return httpx.Response(200, json={"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute."})
+
+	http_clients.set_transport_factory(lambda origin: httpx.MockTransport(handler))
+	try:
+		with pytest.raises(RateLimited):
+			await market_data_service._fetch_stock_quote("RLTEST")
+	finally:
+		http_clients.set_transport_factory(None)
+	bucket = manager.bucket("alpha_vantage", market_data_service.alpha_vantage_key)
+	assert bucket.throttles == 1
+	assert bucket.rate < 100
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from app.services import recommendation_service as module
+from app.services.recommendation_service import RecommendationService
+from app.services.sentiment_aggregates import SentimentAggregates
+
+
+def scalar_rules(sentiment: float, change: float):
+	action = "hold"
+	if sentiment > 0.2 and change >= 0:
+		action = "buy"
+	elif sentiment < -0.2 and change <= 0:
+		action = "sell"
+	return action, max(0.5, min(0.95, abs(sentiment) + (0.1 if change else 0)))
+
+
+def test_vectorized_rules_match_the_scalar_rules():
+	sentiment, change = (a.ravel() for a in np.meshgrid(np.linspace(-1, 1, 41), np.linspace(-3, 3, 13)))
+	actions, confidence = RecommendationService.score(sentiment, change)
+	for s, c, action, conf in zip(sentiment, change, actions, confidence):
+		assert (action, pytest.approx(conf)) == scalar_rules(s, c)
+
+
+@pytest.mark.asyncio
+async def test_batch_ranks_signals_first(monkeypatch):
+	aggregates = SentimentAggregates(max_symbols=10)
+	for _ in range(5):
+		aggregates.add("NVDA", 0.9)
+		aggregates.add("TSLA", -0.4)
+
+	async def get_quotes(symbols, deadline=None):
+		return {"NVDA": {"price": 100, "change": 2.0}, "TSLA": {"price": 200, "change": -1.0}, "AAPL": {"price": 150, "change": 0.5}}
+
+	monkeypatch.setattr(module, "sentiment_aggregates", aggregates)
+	monkeypatch.setattr(module.market_data_service, "get_quotes", get_quotes)
+	results = await RecommendationService().recommend_batch(["aapl", "TSLA", "NVDA"])
+	assert [(r["symbol"], r["action"]) for r in results] == [("NVDA", "buy"), ("TSLA", "sell"), ("AAPL", "hold")]
+	assert results[0]["confidence"] == 0.95 and results[0]["mentions"] == 5
@@ -0,0 +1,149 @@
+import asyncio
+import time
+import uuid
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.http import http_clients
+from app.core.rate_limit import TokenBucket
+from app.db import Base, engine as db_engine
+from app.models.social import IngestionCursor, RedditItem, RedditMention
+from app.services.influencer_engine import influencer_engine
+from app.services.ingestion_cursors import cursor_store
+from app.services.reddit_ingestor import RedditIngestor
+from app.services.reddit_service import reddit_service
+from app.services.sentiment_aggregates import sentiment_aggregates
+from app.services.sentiment_engine import SentimentEngine
+
+
+class NeutralBackend:
+	model = "neutral"
+
+	async def predict(self, texts):
+		return [[{"label": "neutral", "score": 1.0}] for _ in texts]
+
+	async def close(self):
+		pass
+
+
+class StubReddit:
+	"""Local JSON stand-in for /r/{sub}/new.json and /r/{sub}/comments.json with `before` paging."""
+
+	def __init__(self):
+		self.items = {}
+		self.posted = {}
+		self.requests = []
+
+	def post(self, subreddit: str, kind: str, texts) -> None:
+		listing = self.items.setdefault((subreddit, kind), [])
+		prefix = "t3" if kind == "new" else "t1"
+		for text in texts:
+			# Numbered by post count, so a deleted item's fullname is never reused
+			n = self.posted[(subreddit, kind)] = self.posted.get((subreddit, kind), -1) + 1
+			item = {"name": f"{prefix}_{subreddit}{n}", "subreddit": subreddit, "created_utc": time.time() + n, "author": "u"}
+			item.update({"title": text, "selftext": ""} if kind == "new" else {"body": text, "parent_id": "t3_x"})
+			listing.append(item)
+
+	def handler(self, request: httpx.Request) -> httpx.Response:
+		_, _, subreddit, kind = request.url.path.removesuffix(".json").split("/")
+		params = request.url.params
+		self.requests.append((subreddit, kind, params.get("before")))
+		listing = self.items.get((subreddit, kind), [])
+		limit = int(params["limit"])
+		names = [i["name"] for i in listing]
+		if params.get("before") not in (None, *names):
+			# Like Reddit: nothing is "before" a deleted or removed item
+			page = []
+		elif params.get("before"):
+			start = names.index(params["before"]) + 1
+			page = listing[start:start + limit]
+		else:
+			page = listing[-limit:]
+		children = [{"kind": i["name"][:2], "data": i} for i in reversed(page)]
+		return httpx.Response(200, json={"kind": "Listing", "data": {"children": children}})
+
+
+@pytest_asyncio.fixture
+async def stub(monkeypatch):
+	Base.metadata.create_all(
+		bind=db_engine,
+		tables=[RedditItem.__table__, RedditMention.__table__, IngestionCursor.__table__],
+	)
+	server = StubReddit()
+	monkeypatch.setattr(settings, "reddit_page_size", 2)
+	monkeypatch.setattr(reddit_service, "limiter", TokenBucket(rate=1000, capacity=1000))
+	engine = SentimentEngine(NeutralBackend(), max_batch_size=64, max_wait=0)
+	monkeypatch.setattr(sentiment_aggregates, "engine", engine)
+	http_clients.set_transport_factory(lambda origin: httpx.MockTransport(server.handler))
+	yield server
+	http_clients.set_transport_factory(None)
+	await engine.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_polls_are_incremental_and_persist_mentions(stub):
+	sub = f"s{uuid.uuid4().hex[:8]}"
+	stub.post(sub, "new", ["old news", "$TSLA to the moon"])
+	stub.post(sub, "comments", ["AAPL calls"])
+	ingestor = RedditIngestor([sub])
+	assert await ingestor.run_once() == {f"{sub}/posts": 2, f"{sub}/comments": 1}
+
+	stub.post(sub, "new", ["NVDA earnings", "nothing", "$btc dip"])
+	stub.requests.clear()
+	assert await ingestor.run_once() == {f"{sub}/posts": 3, f"{sub}/comments": 0}
+	# Only items newer than the cursor are requested, page by page
+	assert [r[2] for r in stub.requests if r[1] == "new"] == [f"t3_{sub}1", f"t3_{sub}3"]
+
+	with db_engine.connect() as conn:
+		mentions = conn.execute(
+			select(RedditMention.symbol).join(RedditItem, RedditItem.id == RedditMention.item_id).where(RedditItem.subreddit == sub)
+		).scalars().all()
+	assert sorted(mentions) == ["AAPL", "BTC", "NVDA", "TSLA"]
+	assert sentiment_aggregates.window("NVDA", "1h")["count"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_refetched_items_are_stored_and_scored_once(stub, monkeypatch):
+	sub = f"s{uuid.uuid4().hex[:8]}"
+	stub.post(sub, "new", ["$TSLA breakout", "TSLA recall"])
+	observed = []
+	monkeypatch.setattr(influencer_engine, "observe", lambda *args, **kwargs: observed.append(args[2]))
+	ingestor = RedditIngestor([sub])
+	assert (await ingestor.run_once())[f"{sub}/posts"] == 2
+	count = sentiment_aggregates.window("TSLA", "1h")["count"]
+
+	# A crash between storing a page and saving its cursor: the same page comes back
+	await cursor_store.save(ingestor.source, f"{sub}/posts", since_id=None)
+	assert (await ingestor.run_once())[f"{sub}/posts"] == 0
+	assert sentiment_aggregates.window("TSLA", "1h")["count"] == count
+	assert observed == ["TSLA", "TSLA"]
+
+
+@pytest.mark.asyncio
+async def test_a_deleted_cursor_item_does_not_stall_its_listing(stub):
+	sub = f"s{uuid.uuid4().hex[:8]}"
+	stub.post(sub, "new", ["first", "second"])
+	ingestor = RedditIngestor([sub])
+	assert (await ingestor.run_once())[f"{sub}/posts"] == 2
+	assert (await cursor_store.get(ingestor.source, f"{sub}/posts"))["since_id"] == f"t3_{sub}1"
+
+	# The cursor post is removed; newer posts must still be picked up
+	del stub.items[(sub, "new")][1]
+	stub.post(sub, "new", ["third"])
+	assert (await ingestor.run_once())[f"{sub}/posts"] == 1
+	assert (await cursor_store.get(ingestor.source, f"{sub}/posts"))["since_id"] == f"t3_{sub}2"
+	stub.post(sub, "new", ["fourth"])
+	assert (await ingestor.run_once())[f"{sub}/posts"] == 1
+	assert (await ingestor.run_once())[f"{sub}/posts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_concurrent_callers():
+	bucket = TokenBucket(rate=100, capacity=1)
+	start = time.monotonic()
+	await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+	assert time.monotonic() - start >= 0.045
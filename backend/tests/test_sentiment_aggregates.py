@@ -0,0 +1,45 @@
+import random
+import statistics
+
+from app.services.sentiment_aggregates import RollingWindow, SentimentAggregates
+
+
+def test_window_matches_a_brute_force_recount():
+	rng = random.Random(3)
+	window = RollingWindow(span=60, bins=12)
+	events = []
+	now = 1_000_000.0
+	for _ in range(2000):
+		now += rng.uniform(0, 0.5)
+		value = rng.uniform(-1, 1)
+		window.add(value, now)
+		events.append((now, value))
+	# Bins are 5s wide: the window holds everything from the oldest live bin on
+	start = (int(now // 5) - 11) * 5
+	live = [v for t, v in events if t >= start]
+	stats = window.stats(now)
+	assert stats["count"] == len(live)
+	assert abs(stats["mean"] - statistics.fmean(live)) < 1e-9
+	assert abs(stats["variance"] - statistics.pvariance(live)) < 1e-9
+
+
+def test_window_expires_after_its_span():
+	window = RollingWindow(span=60, bins=12)
+	window.add(0.5, 100.0)
+	assert window.stats(150.0)["count"] == 1
+	assert window.stats(200.0)["count"] == 0
+	assert window.stats(200.0)["ewma"] == 0.5
+
+
+def test_spike_is_a_zscore_against_the_baseline():
+	aggregates = SentimentAggregates(max_symbols=10)
+	rng = random.Random(5)
+	now = 2_000_000.0
+	# A day of mildly positive chatter, then a burst of negative posts
+	for i in range(200):
+		aggregates.add("tsla", rng.gauss(0.1, 0.2), now - 86000 + i * 400)
+	assert aggregates.zscore("TSLA", now) is None or abs(aggregates.zscore("TSLA", now)["z"]) < 2.5
+	for i in range(10):
+		aggregates.add("TSLA", rng.gauss(-0.6, 0.1), now - 60 + i)
+	spike = aggregates.zscore("TSLA", now)
+	assert spike["z"] < -2.5 and spike["recent"]["count"] >= 10
@@ -0,0 +1,104 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.db import Base, engine as db_engine
+from app.models.sentiment import SentimentScore
+from app.services.sentiment_cache import SentimentCache
+from app.services.sentiment_engine import SentimentEngine
+
+
+class RecordingBackend:
+	"""Deterministic in-process scorer that records the batch sizes it receives."""
+
+	model = "recording"
+
+	def __init__(self):
+		self.batch_sizes = []
+
+	async def predict(self, texts):
+		self.batch_sizes.append(len(texts))
+		await asyncio.sleep(0.005)
+		return [[{"label": "positive" if "up" in t else "negative", "score": 0.9}] for t in texts]
+
+	async def close(self):
+		pass
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_merged_into_batches():
+	backend = RecordingBackend()
+	engine = SentimentEngine(backend, max_batch_size=16, max_wait=0.02)
+	requests = [[f"stock up {i}", f"stock down {i}"] for i in range(20)]
+	results = await asyncio.gather(*(engine.analyze(texts) for texts in requests))
+	# Every caller gets exactly its own results back, in order
+	for texts, labels in zip(requests, results):
+		assert [l[0]["label"] for l in labels] == ["positive", "negative"]
+	assert sum(backend.batch_sizes) == 40
+	assert max(backend.batch_sizes) <= 16 and len(backend.batch_sizes) < len(requests)
+	await engine.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_is_propagated_to_every_caller():
+	class FailingBackend(RecordingBackend):
+		async def predict(self, texts):
+			raise RuntimeError("model unavailable")
+
+	engine = SentimentEngine(FailingBackend(), max_batch_size=8, max_wait=0.01)
+	results = await asyncio.gather(engine.analyze(["a"]), engine.analyze(["b"]), return_exceptions=True)
+	assert all(isinstance(r, RuntimeError) for r in results)
+	await engine.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_only_unseen_texts_reach_the_model():
+	backend = RecordingBackend()
+	engine = SentimentEngine(backend, max_batch_size=16, max_wait=0, cache=SentimentCache(max_entries=100))
+	await engine.analyze(["stock up", "stock down"])
+	labels = await engine.analyze(["stock  up ", "stock down", "new up", "new up"])
+	assert [l[0]["label"] for l in labels] == ["positive", "negative", "positive", "positive"]
+	assert backend.batch_sizes == [2, 1]
+	assert engine.cache.stats()["hits"] == 2
+	await engine.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_persistent_layer_survives_a_cold_memory_cache():
+	Base.metadata.create_all(bind=db_engine, tables=[SentimentScore.__table__])
+	texts = [f"persisted {uuid.uuid4()} up"]
+	warm = SentimentEngine(RecordingBackend(), max_batch_size=8, max_wait=0, cache=SentimentCache(100, persist=True))
+	await warm.analyze(texts)
+	await warm.shutdown()
+
+	backend = RecordingBackend()
+	cold = SentimentEngine(backend, max_batch_size=8, max_wait=0, cache=SentimentCache(100, persist=True))
+	assert (await cold.analyze(texts))[0][0]["label"] == "positive"
+	assert backend.batch_sizes == []
+	assert cold.cache.stats()["persistent_hits"] == 1
+	await cold.shutdown()
+
+
+def test_analyzer_endpoint_streams_one_row_per_text(monkeypatch):
+	import json
+
+	from fastapi.testclient import TestClient
+
+	from app.api.deps import get_sentiment_engine
+	from app.main import app
+
+	backend = RecordingBackend()
+	engine = SentimentEngine(backend, max_batch_size=16, max_wait=0)
+	monkeypatch.setitem(app.dependency_overrides, get_sentiment_engine, lambda: engine)
+	texts = ["stock up", "https://t.co/x", "stock  down", "stock up"] + [f"more up {i}" for i in range(100)]
+	response = TestClient(app).post("/analyzer/sentiment", json={"texts": texts})
+	assert response.headers["content-type"].startswith("application/x-ndjson")
+	lines = [json.loads(line) for line in response.text.splitlines()]
+	# Rows arrive strictly in input order, skipped texts and duplicates included
+	assert [row["index"] for row in lines] == list(range(len(texts)))
+	rows = {row["index"]: row for row in lines}
+	assert rows[1] == {"index": 1, "skipped": True}
+	assert rows[0]["label"] == rows[3]["label"] == "positive" and rows[2]["label"] == "negative"
+	# Duplicates inside the batch are scored once
+	assert sum(backend.batch_sizes) == len(texts) - 2
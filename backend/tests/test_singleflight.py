@@ -0,0 +1,70 @@
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+
+from app.core.http import http_clients
+from app.services.market_data_service import MarketDataService, market_data_service
+from app.services.quote_cache import MemoryQuoteBackend, quote_cache
+from app.services.twitter_service import twitter_service
+
+
+CALLERS = 50
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+	"""Counting stub transport: every provider request is recorded, answered after a short delay."""
+	calls: Counter = Counter()
+
+	async def handler(request: httpx.Request) -> httpx.Response:
+		calls[(request.url.host, request.url.path, request.url.params.get("symbol") or request.url.params.get("ids"))] += 1
+		await asyncio.sleep(0.01)
+		if request.url.host == "www.alphavantage.co":
+			return httpx.Response(200, json={"Global Quote": {"01. symbol": request.url.params["symbol"], "05. price": "1"}})
+		if "/api/v3/quote/" in request.url.path:
+			symbols = request.url.path.rsplit("/", 1)[-1].split(",")
+			return httpx.Response(200, json=[{"symbol": s, "price": 1} for s in symbols])
+		if request.url.path.endswith("/simple/price"):
+			return httpx.Response(200, json={i: {"usd": 1} for i in request.url.params["ids"].split(",")})
+		if request.url.path.endswith("/coins/markets"):
+			return httpx.Response(200, json=[{"symbol": "btc", "name": "Bitcoin", "current_price": 1}])
+		return httpx.Response(200, json={"data": [{"id": "1", "text": "hello"}]})
+
+	monkeypatch.setattr(quote_cache, "backend", MemoryQuoteBackend(100))
+	# Fresh provider health: lifespans in earlier tests, without network, mark the providers down
+	monkeypatch.setattr(market_data_service, "quote_router", MarketDataService().quote_router)
+	http_clients.set_transport_factory(lambda origin: httpx.MockTransport(handler))
+	yield calls
+	http_clients.set_transport_factory(None)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_trending_crypto_makes_one_upstream_call(upstream):
+	results = await asyncio.gather(*[market_data_service.get_trending_crypto() for _ in range(CALLERS)])
+	assert all(r == results[0] for r in results)
+	assert sum(upstream.values()) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_overview_costs_one_batch_call_per_provider(upstream):
+	overviews = await asyncio.gather(*[market_data_service.get_market_overview() for _ in range(CALLERS)])
+	assert overviews[0]["total_stocks"] == 8 and overviews[0]["total_cryptos"] == 4
+	assert sum(upstream.values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_twitter_search_is_coalesced(upstream):
+	await asyncio.gather(*[twitter_service.search_recent("$AAPL") for _ in range(CALLERS)])
+	assert sum(upstream.values()) == 1
+
+
+def test_provider_slots_are_rebuilt_for_each_event_loop(upstream):
+	# Every app lifetime (TestClient, reload) runs on a new loop; more callers than slots makes them wait
+	async def fan_out():
+		await asyncio.gather(*(market_data_service._get_json("stub", "https://stub.example/", {"page": i}) for i in range(10)))
+
+	asyncio.run(fan_out())
+	asyncio.run(fan_out())
+	assert sum(upstream.values()) == 20
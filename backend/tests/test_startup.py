@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect
+
+from app.core.lazy import Lazy, is_loaded
+from app.migrate import main, migrate, missing_tables
+
+
+def test_migrate_creates_the_schema_once(tmp_path):
+	engine = create_engine(f"sqlite:///{os.path.join(tmp_path, 'fresh.db')}")
+	assert "users" in missing_tables(engine)
+	created = migrate(engine)
+	assert {"users", "tweets", "ingestion_cursors", "sentiment_scores"} <= set(created)
+	assert set(created) == set(inspect(engine).get_table_names())
+	assert migrate(engine) == [] and missing_tables(engine) == []
+
+
+def test_migrate_check_exits_clean_on_the_test_database():
+	main([])
+	assert main(["--check"]) == 0
+
+
+def test_lazy_builds_once_on_first_use(monkeypatch):
+	built = []
+
+	class Service:
+		def ping(self):
+			return "pong"
+
+	service = Lazy(lambda: built.append(1) or Service())
+	assert not is_loaded(service) and built == []
+	assert service.ping() == "pong" and service.ping() == "pong"
+	assert built == [1] and is_loaded(service)
+
+	monkeypatch.setattr(service, "ping", lambda: "patched")
+	assert service.ping() == "patched"
+	monkeypatch.undo()
+	assert service.ping() == "pong"
+
+
+IMPORT_PROBE = """
+import json, sys
+import app.main
+from app.core.config import settings
+from app.core.lazy import is_loaded
+from app.db import engine
+from app.services.market_data_service import market_data_service
+from app.services.email_service import email_service
+from app.services.sentiment_engine import sentiment_engine
+print(json.dumps({
+	"built": [name for name, service in [("settings", settings), ("engine", engine), ("market_data_service", market_data_service),
+		("email_service", email_service), ("sentiment_engine", sentiment_engine)] if is_loaded(service)],
+	"modules": [name for name in ("httpx", "jose", "redis", "transformers") if name in sys.modules],
+}))
+"""
+
+
+def test_importing_the_app_needs_no_configuration_and_builds_nothing():
+	# A fresh worker with an empty environment: Settings() would fail, so nothing may read it at import
+	result = subprocess.run(
+		[sys.executable, "-c", IMPORT_PROBE],
+		cwd=Path(__file__).resolve().parents[1],
+		env={"PATH": os.environ.get("PATH", "")},
+		capture_output=True,
+		text=True,
+		timeout=120,
+	)
+	assert result.returncode == 0, result.stderr
+	assert json.loads(result.stdout.splitlines()[-1]) == {"built": [], "modules": []}
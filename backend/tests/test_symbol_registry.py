@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_market_data_service
+from app.main import app
+from app.services.symbol_registry import SymbolRegistry
+
+
+def test_extracts_cashtags_tickers_and_names_in_one_pass():
+	registry = SymbolRegistry()
+	text = "$tsla and AAPL; link is down but LINK and $BTC pump, Bitcoin Cash? ethereum too, $5 fee"
+	assert registry.extract(text) == ["TSLA", "AAPL", "LINK", "BTC", "ETH"]
+
+
+def test_false_positive_rules():
+	registry = SymbolRegistry()
+	# Common words, single letters and lower-case tickers are not mentions; cashtags are
+	assert registry.extract("IT is ON, a V shape. I like nvda and F") == []
+	assert registry.extract("Holding $F and $V") == ["F", "V"]
+	# Ordinary-word names need a capital, shouted posts only count cashtags
+	assert registry.extract("a cosmos of options") == []
+	assert registry.extract("Cosmos staking") == ["ATOM"]
+	assert registry.extract("TSLA AND NVDA ARE GOING TO THE MOON $AMD") == ["AMD"]
+
+
+def test_remote_lists_extend_universe_and_routing():
+	registry = SymbolRegistry()
+	registry.add_stocks({"HIMS": "Hims & Hers Health"})
+	registry.add_crypto([("doge", "dogecoin", "Dogecoin"), ("aapl", "fake-apple", "Apple Token"), ("shib", "shiba-inu", "Shiba Inu")])
+	assert registry.extract("HIMS and dogecoin, shiba inu") == ["HIMS", "DOGE", "SHIB"]
+	# A coin cannot take over a symbol that already routes to the stock provider
+	assert registry.asset_type("AAPL") == "stock" and registry.asset_type("DOGE") == "crypto"
+	assert registry.coingecko_id("DOGE") == "dogecoin"
+	assert registry.resolve("bitcoin") == "BTC" and registry.resolve("$hims") == "HIMS" and registry.resolve("zzzz") is None
+
+
+def test_batch_prices_resolve_cashtags_and_names(monkeypatch):
+	requested = []
+
+	class StubMarketData:
+		async def get_quotes(self, symbols, deadline=None):
+			requested.extend(symbols)
+			return {s: {"symbol": s, "price": 1.0} for s in symbols if s != "ZZZZ"}
+
+	monkeypatch.setitem(app.dependency_overrides, get_market_data_service, lambda: StubMarketData())
+	response = TestClient(app).get("/market/prices/batch", params={"symbols": "$tsla, bitcoin,TSLA,zzzz,$"})
+	assert response.status_code == 200
+	assert requested == ["TSLA", "BTC", "ZZZZ"]
+	body = response.json()
+	assert [(item["symbol"], item["type"]) for item in body["items"]] == [("TSLA", "stock"), ("BTC", "crypto")]
+	assert body["missing"] == ["ZZZZ"]
@@ -0,0 +1,132 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.core.config import settings
+from app.core.http import http_clients
+from app.db import Base, engine as db_engine
+from app.models.social import IngestionCursor, Tweet
+from app.services.ingestion_cursors import cursor_store
+from app.services.sentiment_aggregates import sentiment_aggregates
+from app.services.sentiment_engine import SentimentEngine
+from app.services.tweet_store import tweet_store
+from app.services.twitter_ingestor import TwitterIngestor
+
+
+class KeywordBackend:
+	model = "keyword"
+
+	async def predict(self, texts):
+		return [[{"label": "positive", "score": 1.0}] for _ in texts]
+
+	async def close(self):
+		pass
+
+
+class StubTwitter:
+	"""Local stand-in for GET /2/tweets/search/recent with since_id and next_token paging."""
+
+	def __init__(self):
+		self.tweets = []
+		self.requests = []
+		self.fail_on_token = None
+		self.fail_status = 503
+
+	def post(self, count: int) -> None:
+		start = len(self.tweets)
+		now = datetime.now(timezone.utc)
+		for i in range(start, start + count):
+			created = (now - timedelta(minutes=count - i)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+			self.tweets.append({"id": str(1000 + i), "text": f"tweet {i}", "created_at": created})
+
+	def handler(self, request: httpx.Request) -> httpx.Response:
+		params = request.url.params
+		self.requests.append(dict(params))
+		token = params.get("next_token")
+		if token is not None and token == self.fail_on_token:
+			return httpx.Response(self.fail_status)
+		since = int(params.get("since_id", 0))
+		matching = sorted((t for t in self.tweets if int(t["id"]) > since), key=lambda t: -int(t["id"]))
+		offset, size = int(token or 0), int(params["max_results"])
+		page = matching[offset:offset + size]
+		meta = {"result_count": len(page)}
+		if page:
+			meta.update(newest_id=page[0]["id"], oldest_id=page[-1]["id"])
+		if offset + size < len(matching):
+			meta["next_token"] = str(offset + size)
+		return httpx.Response(200, json={"data": page, "meta": meta} if page else {"meta": meta})
+
+
+@pytest_asyncio.fixture
+async def stub(monkeypatch):
+	Base.metadata.create_all(bind=db_engine, tables=[Tweet.__table__, IngestionCursor.__table__])
+	server = StubTwitter()
+	monkeypatch.setattr(settings, "twitter_ingest_page_size", 10)
+	monkeypatch.setattr(settings, "twitter_ingest_max_pages", 5)
+	engine = SentimentEngine(KeywordBackend(), max_batch_size=64, max_wait=0)
+	monkeypatch.setattr(sentiment_aggregates, "engine", engine)
+	http_clients.set_transport_factory(lambda origin: httpx.MockTransport(server.handler))
+	yield server
+	http_clients.set_transport_factory(None)
+	await engine.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sweeps_page_through_and_then_only_fetch_new_tweets(stub):
+	sym = f"T{uuid.uuid4().hex[:8]}".upper()
+	ingestor = TwitterIngestor([sym])
+	stub.post(25)
+	assert (await ingestor.run_once()) == {sym: 25}
+	assert len(stub.requests) == 3
+	assert (await cursor_store.get("twitter", sym))["since_id"] == "1024"
+
+	stub.post(3)
+	stub.requests.clear()
+	assert (await ingestor.run_once()) == {sym: 3}
+	assert [r.get("since_id") for r in stub.requests] == ["1024"]
+
+	texts = await tweet_store.recent_texts([sym.lower()], limit=5)
+	assert texts == {sym: ["tweet 27", "tweet 26", "tweet 25", "tweet 24", "tweet 23"]}
+	# Every ingested tweet was scored into the rolling windows
+	assert sentiment_aggregates.window(sym, "1h")["count"] == 28
+
+
+@pytest.mark.asyncio
+async def test_interrupted_sweep_resumes_from_the_page_checkpoint(stub):
+	sym = f"T{uuid.uuid4().hex[:8]}".upper()
+	ingestor = TwitterIngestor([sym])
+	stub.post(25)
+	stub.fail_on_token = "20"
+	# The two pages stored before the failure are reported
+	assert (await ingestor.run_once()) == {sym: 20}
+	assert ingestor.errors[sym]
+	cursor = await cursor_store.get("twitter", sym)
+	assert cursor == {"since_id": None, "next_token": "20", "pending_since_id": "1024"}
+
+	stub.fail_on_token = None
+	stub.requests.clear()
+	assert (await ingestor.run_once()) == {sym: 5}
+	assert [r.get("next_token") for r in stub.requests] == ["20"]
+	assert (await cursor_store.get("twitter", sym))["since_id"] == "1024"
+	assert len((await tweet_store.recent_texts([sym], limit=100))[sym]) == 25
+	assert sentiment_aggregates.window(sym, "1h")["count"] == 25
+
+
+@pytest.mark.asyncio
+async def test_restarted_sweep_scores_refetched_tweets_only_once(stub):
+	sym = f"T{uuid.uuid4().hex[:8]}".upper()
+	ingestor = TwitterIngestor([sym])
+	stub.post(25)
+	# An expired page token restarts the sweep from the top, re-fetching the stored pages
+	stub.fail_on_token, stub.fail_status = "20", 400
+	assert (await ingestor.run_once()) == {sym: 20}
+	assert (await cursor_store.get("twitter", sym))["next_token"] is None
+
+	stub.fail_on_token = None
+	stub.requests.clear()
+	assert (await ingestor.run_once()) == {sym: 5}
+	assert [r.get("next_token") for r in stub.requests] == [None, "10", "20"]
+	assert sentiment_aggregates.window(sym, "1h")["count"] == 25
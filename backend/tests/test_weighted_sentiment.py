@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from app.services import recommendation_service as module
+from app.services.recommendation_service import RecommendationService
+from app.services.weighted_sentiment import near_duplicate_clusters, popcount, post_weights, simhash, weighted_mean
+
+
+def test_simhash_clusters_templated_spam_but_not_distinct_posts():
+	texts = [
+		"$GME to the moon!!! Buy now before it's too late https://t.co/abc123 @bot1",
+		"$GME to the moon!!! Buy now before it's too late https://t.co/zzz999 @bot2",
+		"$GME to the moon!!! Buy 500 shares now before it's too late",
+		"Earnings call was weak, guidance cut for next quarter, I'm trimming my $GME position",
+		"Interesting read on retail flows into meme stocks this week",
+	]
+	clusters = near_duplicate_clusters(simhash(texts)).tolist()
+	assert clusters[0] == clusters[1] == clusters[2]
+	assert len({clusters[0], clusters[3], clusters[4]}) == 3
+
+
+def test_popcount_matches_python():
+	values = np.array([0, 1, 2**64 - 1, 0x8000000000000001, 123456789], dtype=np.uint64)
+	assert popcount(values).tolist() == [bin(int(v)).count("1") for v in values]
+
+
+def test_a_bot_wave_cannot_outvote_distinct_authors():
+	bots = [{"text": f"$XYZ is a scam, sell everything #{i}", "author_id": f"bot{i}"} for i in range(500)]
+	people = [
+		{"text": "Strong quarter for $XYZ, margins expanding", "author_id": "a", "like_count": 120, "retweet_count": 30},
+		{"text": "Just added to my $XYZ position after the product launch", "author_id": "b", "like_count": 15},
+		{"text": "$XYZ guidance raised again, impressive execution", "author_id": "c", "like_count": 40, "followers": 50000},
+	]
+	posts = bots + people
+	scores = np.array([-1.0] * len(bots) + [0.8, 0.6, 0.9])
+	result = weighted_mean(scores, posts)
+	assert result["sentiment"] > 0.3
+	assert result["posts"] == 503 and result["unique_posts"] == 4
+	# The flat mean the endpoint used to compute is swamped by the wave
+	assert scores.mean() < -0.9
+
+
+def test_engagement_reach_and_repeat_authors_shape_the_weights():
+	posts = [
+		{"text": "viral take on the quarter", "author_id": "a", "like_count": 5000, "retweet_count": 800, "followers": 2_000_000},
+		{"text": "quiet take nobody read", "author_id": "b"},
+		{"text": "first of many posts", "author_id": "c"},
+		{"text": "second totally different post", "author_id": "c"},
+	]
+	weights = post_weights(posts)
+	assert weights[0] > 5 * weights[1]
+	assert weights[2] == pytest.approx(weights[1] / 2)
+
+
+@pytest.mark.asyncio
+async def test_recommend_uses_weighted_post_sentiment(monkeypatch):
+	async def analyze(texts):
+		return [[{"label": "negative" if "scam" in text else "positive", "score": 1.0}] for text in texts]
+
+	async def get_quotes(symbols, deadline=None):
+		return {"XYZ": {"price": 10, "change": 0.5}}
+
+	service = RecommendationService()
+	monkeypatch.setattr(service, "_analyze_sentences", analyze)
+	monkeypatch.setattr(module.market_data_service, "get_quotes", get_quotes)
+	posts = [{"text": f"$XYZ scam alert, dump it {i}", "author_id": f"bot{i}"} for i in range(50)]
+	posts.append({"text": "$XYZ beat estimates with record revenue", "author_id": "analyst", "like_count": 300})
+	result = await service.recommend("xyz", posts)
+	assert result["action"] == "buy"
+	assert result["weighting"]["posts"] == 51 and result["weighting"]["unique_posts"] == 2
@@ -44,8 +44,16 @@ export const apiEndpoints = {
   scrapeTwitter: () => api.get('/scrapers/twitter'),
   analyzeSentiment: (payload: any) => api.post('/analyzer/sentiment', payload),
   getRecommendations: (symbol?: string) => api.get(`/recommendations${symbol ? `?symbol=${symbol}` : ''}`),
+  getRecommendationsBatch: (symbols?: string[]) =>
+    api.get('/recommendations/batch', { params: symbols?.length ? { symbols: symbols.join(',') } : {} }),
+
+  // Alerts
+  getAlerts: () => api.get('/alerts'),
 };
 
+// Live alert deltas (Server-Sent Events)
+export const alertsStreamUrl = `${API_BASE_URL}/alerts/stream`;
+
 // Types
 export interface SentimentData {
   symbol: string;
@@ -71,6 +79,8 @@ export interface Recommendation {
   reasoning: string;
   sentiment: number;
   priceTarget?: number;
+  price?: number;
+  mentions?: number;
   timestamp: string;
 }
 
@@ -9,6 +9,7 @@ import {
   Clock
 } from 'lucide-react';
 import { formatCurrency, formatPercent, getSentimentColor } from '../lib/utils';
+import { alertsStreamUrl } from '../lib/api';
 
 interface Alert {
   id: string;
@@ -25,64 +26,25 @@ interface Alert {
   read: boolean;
 }
 
-// Mock data
-const mockAlerts: Alert[] = [
-  {
-    id: '1',
-    type: 'sentiment_spike',
-    severity: 'high',
-    title: 'Sentiment Spike Detected',
-    description: 'AAPL sentiment jumped 45% in the last hour with 2,340 new mentions',
-    symbol: 'AAPL',
-    sentiment: 0.45,
-    timestamp: '2024-01-15T14:30:00Z',
-    read: false,
-  },
-  {
-    id: '2',
-    type: 'price_alert',
-    severity: 'medium',
-    title: 'Price Movement Alert',
-    description: 'TSLA dropped 5.2% in the last 30 minutes',
-    symbol: 'TSLA',
-    price: 248.87,
-    change: -13.45,
-    changePercent: -5.2,
-    timestamp: '2024-01-15T14:15:00Z',
-    read: false,
-  },
-  {
-    id: '3',
-    type: 'influencer_mention',
-    severity: 'critical',
-    title: 'Elon Musk Mention',
-    description: 'Elon Musk tweeted about DOGE, causing 15,000+ mentions in 10 minutes',
-    symbol: 'DOGE',
-    timestamp: '2024-01-15T13:45:00Z',
-    read: true,
-  },
-  {
-    id: '4',
-    type: 'volume_spike',
-    severity: 'medium',
-    title: 'Volume Spike',
-    description: 'NVDA trading volume increased 300% above average',
-    symbol: 'NVDA',
-    timestamp: '2024-01-15T13:20:00Z',
-    read: true,
-  },
-  {
-    id: '5',
-    type: 'sentiment_spike',
-    severity: 'low',
-    title: 'Sentiment Change',
-    description: 'BTC sentiment improved by 12% in the last hour',
-    symbol: 'BTC',
-    sentiment: 0.12,
-    timestamp: '2024-01-15T12:55:00Z',
-    read: true,
-  },
-];
+interface AlertsDelta {
+  version: number;
+  added: Alert[];
+  updated: Alert[];
+  removed: string[];
+}
+
+// Merge a server delta into the current list, keeping the client-side read state
+function applyDelta(current: Alert[], delta: AlertsDelta): Alert[] {
+  const readIds = new Set(current.filter(alert => alert.read).map(alert => alert.id));
+  const changed = new Map<string, Alert>([...delta.added, ...delta.updated].map(alert => [alert.id, alert] as [string, Alert]));
+  const removed = new Set(delta.removed);
+  const kept = current
+    .filter(alert => !removed.has(alert.id))
+    .map(alert => changed.get(alert.id) ?? alert);
+  const keptIds = new Set(kept.map(alert => alert.id));
+  const added = delta.added.filter(alert => !keptIds.has(alert.id));
+  return [...added, ...kept].map(alert => ({ ...alert, read: readIds.has(alert.id) }));
+}
 
 export default function Alerts() {
   const [alerts, setAlerts] = useState<Alert[]>([]);
@@ -90,12 +52,18 @@ export default function Alerts() {
   const [filter, setFilter] = useState<'all' | 'unread' | 'critical'>('all');
 
   useEffect(() => {
-    // Simulate API call
-    const timer = setTimeout(() => {
-      setAlerts(mockAlerts);
+    // Server-Sent Events: a full snapshot first, then only the changes
+    const source = new EventSource(alertsStreamUrl);
+    source.addEventListener('snapshot', (event) => {
+      setAlerts(JSON.parse((event as MessageEvent).data).alerts);
       setLoading(false);
-    }, 1000);
-    return () => clearTimeout(timer);
+    });
+    source.addEventListener('delta', (event) => {
+      const delta: AlertsDelta = JSON.parse((event as MessageEvent).data);
+      setAlerts(current => applyDelta(current, delta));
+    });
+    source.onerror = () => setLoading(false);
+    return () => source.close();
   }, []);
 
   const filteredAlerts = alerts.filter(alert => {
@@ -9,56 +9,9 @@ import {
   Filter,
   Search
 } from 'lucide-react';
-import { type Recommendation } from '../lib/api';
+import { apiEndpoints, type Recommendation } from '../lib/api';
 import { formatCurrency, formatPercent, getActionColor, getSentimentColor, getSentimentLabel } from '../lib/utils';
 
-// Mock data
-const mockRecommendations: Recommendation[] = [
-  {
-    symbol: 'NVDA',
-    action: 'buy',
-    confidence: 0.85,
-    reasoning: 'Strong AI narrative momentum with 40% positive sentiment spike. Technical indicators show bullish breakout pattern.',
-    sentiment: 0.4,
-    priceTarget: 500.00,
-    timestamp: '2024-01-15T14:30:00Z',
-  },
-  {
-    symbol: 'TSLA',
-    action: 'sell',
-    confidence: 0.72,
-    reasoning: 'Negative sentiment trend (-25% in 24h) with increased bearish mentions. Price action suggests downward pressure.',
-    sentiment: -0.25,
-    priceTarget: 220.00,
-    timestamp: '2024-01-15T14:15:00Z',
-  },
-  {
-    symbol: 'AAPL',
-    action: 'hold',
-    confidence: 0.68,
-    reasoning: 'Mixed signals with neutral sentiment. Wait for clearer direction from upcoming earnings or market catalysts.',
-    sentiment: 0.05,
-    timestamp: '2024-01-15T14:00:00Z',
-  },
-  {
-    symbol: 'BTC',
-    action: 'buy',
-    confidence: 0.78,
-    reasoning: 'Institutional adoption narrative gaining traction. Sentiment improving with 15% positive shift in crypto community.',
-    sentiment: 0.15,
-    priceTarget: 50000.00,
-    timestamp: '2024-01-15T13:45:00Z',
-  },
-  {
-    symbol: 'MSFT',
-    action: 'hold',
-    confidence: 0.61,
-    reasoning: 'Stable sentiment with moderate AI-related mentions. No significant catalysts in near term.',
-    sentiment: 0.08,
-    timestamp: '2024-01-15T13:30:00Z',
-  },
-];
-
 export default function Recommendations() {
   const [recommendations, setRecommendations] = useState<Recommendation[]>([]);
   const [loading, setLoading] = useState(true);
@@ -66,12 +19,21 @@ export default function Recommendations() {
   const [searchTerm, setSearchTerm] = useState('');
 
   useEffect(() => {
-    // Simulate API call
-    const timer = setTimeout(() => {
-      setRecommendations(mockRecommendations);
-      setLoading(false);
-    }, 1000);
-    return () => clearTimeout(timer);
+    // The whole watchlist, ranked server-side, in one request
+    let cancelled = false;
+    apiEndpoints.getRecommendationsBatch()
+      .then(response => {
+        if (!cancelled) setRecommendations(response.data.items);
+      })
+      .catch(() => {
+        if (!cancelled) setRecommendations([]);
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+    return () => {
+      cancelled = true;
+    };
   }, []);
 
   const filteredRecommendations = recommendations.filter(rec => {
@@ -105,7 +67,9 @@ export default function Recommendations() {
     buy: recommendations.filter(r => r.action === 'buy').length,
     sell: recommendations.filter(r => r.action === 'sell').length,
     hold: recommendations.filter(r => r.action === 'hold').length,
-    avgConfidence: recommendations.reduce((acc, r) => acc + r.confidence, 0) / recommendations.length,
+    avgConfidence: recommendations.length
+      ? recommendations.reduce((acc, r) => acc + r.confidence, 0) / recommendations.length
+      : 0,
   };
 
   if (loading) {